@@ -0,0 +1,310 @@
+"""
+Benchmarks for the search, extraction and rendering hot paths.
+
+Each case runs against synthetic GraphQL payloads of increasing size, and
+end-to-end searches run against a local stub of the GraphQL endpoint.
+Best-of timings are compared with `benchmarks/baselines.json`, a case more
+than `--tolerance` times slower than its baseline fails the run.
+
+    $ python benchmarks/hot_paths.py
+    $ python benchmarks/hot_paths.py --sizes 10 1000 --save
+"""
+
+import argparse
+import bisect
+import datetime
+import json
+import os
+import re
+import sys
+import threading
+import timeit
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List, Tuple
+
+from click.testing import CliRunner
+from tabulate import tabulate
+
+from good_first_issues.graphql import rank, services
+from good_first_issues.main import cli
+from good_first_issues.utils import web
+
+SIZES: Tuple[int, ...] = (10, 100, 1_000, 10_000, 100_000)
+
+# Timings are the best of this many repeats.
+REPEAT: int = 3
+
+# How much slower than its baseline a case may run.
+TOLERANCE: float = 1.5
+
+# Synthetic issues are created a minute apart from this moment on.
+EPOCH: datetime.datetime = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+baselines_file: str = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+rate_limit: Dict = {
+    "limit": 5000,
+    "cost": 1,
+    "remaining": 4999,
+    "resetAt": "2099-01-01T00:00:00Z",
+}
+
+
+def issue_node(number: int) -> Dict:
+    owner = f"owner{number % 50}"
+    return {
+        "title": f"Improve the error message shown for invalid option number {number}",
+        "url": f"https://github.com/{owner}/repo{number % 7}/issues/{number}",
+        "createdAt": created_at(number),
+        "author": {"login": "octocat"},
+        "repository": {"name": f"repo{number % 7}", "owner": {"login": owner}},
+        "labels": {"nodes": [{"name": "good first issue"}, {"name": "docs"}]},
+        "number": number,
+        "state": "OPEN",
+    }
+
+
+def created_at(number: int) -> str:
+    moment = EPOCH + datetime.timedelta(minutes=number)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def org_payload(nodes: List[Dict], has_next_page: bool = False) -> Dict:
+    """
+    `core_query` response holding `nodes`.
+    """
+    return {
+        "data": {
+            "rateLimit": rate_limit,
+            "search": {
+                "issueCount": len(nodes),
+                "pageInfo": {"hasNextPage": has_next_page, "endCursor": None},
+                "nodes": nodes,
+            },
+        }
+    }
+
+
+def repository_payload(size: int, issues_per_repo: int = 2) -> Dict:
+    """
+    `search_query` response with `size` issues across repositories.
+    """
+    edges = [
+        {
+            "node": {
+                "issues": {
+                    "edges": [
+                        {"node": issue_node(number)}
+                        for number in range(start, min(size, start + issues_per_repo))
+                    ]
+                }
+            }
+        }
+        for start in range(0, size, issues_per_repo)
+    ]
+    return {
+        "data": {
+            "rateLimit": rate_limit,
+            "search": {
+                "repositoryCount": len(edges),
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "edges": edges,
+            },
+        }
+    }
+
+
+class StubEndpoint:
+    """
+    Local GraphQL endpoint paginating `core_query` responses over `nodes`.
+
+    Like GitHub, `created:` windows are honored and no more than 1000
+    results are returned for a search.
+    """
+
+    cap: int = 1000
+
+    def __init__(self):
+        self.nodes: List[Dict] = []
+        self.created: List[str] = []
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                variables = json.loads(self.rfile.read(length))["variables"]
+
+                low, high = stub.window(variables["searchQuery"])
+                matched = stub.nodes[low:high]
+                available = min(len(matched), stub.cap)
+
+                start = int(variables.get("after") or 0)
+                end = min(available, start + variables["limit"])
+                payload = org_payload(matched[start:end], end < available)
+                payload["data"]["search"]["issueCount"] = len(matched)
+                payload["data"]["search"]["pageInfo"]["endCursor"] = str(end)
+
+                body = json.dumps(payload).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def load(self, nodes: List[Dict]):
+        """
+        Serve `nodes`, which are sorted by creation time.
+        """
+        self.nodes = nodes
+        self.created = [node["createdAt"] for node in nodes]
+
+    def window(self, search: str) -> Tuple[int, int]:
+        """
+        Slice of `nodes` matching the `created:` window of a search.
+        """
+        since = re.search(r"created:>=(\S+)", search)
+        if since:
+            return bisect.bisect_left(self.created, since.group(1)), len(self.nodes)
+
+        match = re.search(r"created:(\S+)\.\.(\S+)", search)
+        if not match:
+            return 0, len(self.nodes)
+
+        return (
+            bisect.bisect_left(self.created, match.group(1)),
+            bisect.bisect_right(self.created, match.group(2)),
+        )
+
+
+def end_to_end(stub: StubEndpoint, size: int) -> Callable[[], None]:
+    """
+    `gfi search <org> --all --format jsonl` answered by the stub.
+
+    jsonl skips the spinner, whose frames would add a fixed delay. Past
+    1000 issues, the search is split into `created:` windows.
+    """
+    stub.load([issue_node(number) for number in range(size)])
+    runner = CliRunner()
+
+    def run():
+        services.scheduler = services.RateLimitScheduler()
+        result = runner.invoke(
+            cli,
+            [
+                "search",
+                "owner",
+                "--all",
+                "--no-cache",
+                "--format",
+                "jsonl",
+            ],
+        )
+        assert result.exit_code == 0, result.output
+
+    return run
+
+
+def cases(size: int, stub: StubEndpoint) -> Dict[str, Callable[[], object]]:
+    """
+    Hot paths to time for payloads of `size` issues.
+    """
+    org = org_payload([issue_node(number) for number in range(size)])
+    repositories = repository_payload(size)
+    issues, _ = services.org_user_pipeline(org, "org")
+    rows = [(issue.title, issue.url) for issue in issues]
+    html_table = tabulate(rows, ["Title", "Issue URL"], tablefmt="html")
+
+    return {
+        "identify_mode": lambda: services.identify_mode(
+            "owner", None, False, False, "2024-01-01T00:00:00Z", size
+        ),
+        "org_user_pipeline": lambda: services.org_user_pipeline(org, "org"),
+        "extract_search_results": lambda: services.extract_search_results(repositories),
+        "table": lambda: tabulate(
+            rows, ["Title", "Issue URL"], tablefmt="fancy_grid", showindex=True
+        ),
+        "add_anchor_tag": lambda: web.add_anchor_tag(html_table),
+        "render_page": lambda: web.render_page(issues),
+        "render_report": lambda: web.render_report(issues),
+        "top_k": lambda: next(
+            rank.top_k([(issues, None)], 20, rank.rank_key("recent"))
+        ),
+        "search": end_to_end(stub, size),
+    }
+
+
+def best_time(func: Callable[[], object]) -> float:
+    """
+    Best time of a call to `func`, in seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(REPEAT, number)) / number
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--save", action="store_true", help="Store the timings as the new baselines."
+    )
+    args = parser.parse_args()
+
+    try:
+        with open(baselines_file) as file:
+            baselines: Dict[str, float] = json.load(file)
+    except OSError:
+        baselines = {}
+
+    # Searches run against the stub, without touching the cache.
+    os.environ["GFITOKEN"] = "benchmark"
+    stub = StubEndpoint()
+    services.transport = services.Transport(url=stub.url)
+
+    timings: Dict[str, float] = {}
+    regressions: List[str] = []
+
+    for size in args.sizes:
+        for name, func in cases(size, stub).items():
+            key = f"{name}[{size}]"
+            timings[key] = elapsed = best_time(func)
+
+            baseline = baselines.get(key)
+            if baseline is None:
+                status = "new"
+            elif elapsed > baseline * args.tolerance:
+                status = f"SLOWER ({elapsed / baseline:.2f}x)"
+                regressions.append(key)
+            else:
+                status = f"ok ({elapsed / baseline:.2f}x)"
+
+            print(f"{key:<32} {elapsed * 1e6:14.1f} µs  {status}", flush=True)
+
+    if args.save:
+        with open(baselines_file, "w") as file:
+            json.dump({**baselines, **timings}, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baselines saved to {baselines_file}")
+
+    elif regressions:
+        print(f"Slower than baseline: {', '.join(regressions)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
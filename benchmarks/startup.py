@@ -0,0 +1,69 @@
+"""
+Cold-start benchmark for the `gfi` entry point.
+
+Runs each subcommand in a fresh interpreter and compares the median time
+it adds on top of a bare interpreter against its budget.
+
+    $ python benchmarks/startup.py
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+# Milliseconds a subcommand may add on top of starting the interpreter.
+BUDGETS: Dict[str, int] = {
+    "version": 100,
+    "config --help": 150,
+    "cache stats": 150,
+    "rate-limit --help": 250,
+    "search --help": 350,
+    "index --help": 350,
+    "watch --help": 350,
+    "serve --help": 350,
+}
+
+RUNS: int = 11
+
+entry_point: List[str] = ["-c", "from good_first_issues.main import cli; cli()"]
+
+
+def measure(args: List[str]) -> float:
+    """
+    Median wall time, in milliseconds, of running the interpreter with `args`.
+    """
+    timings: List[float] = []
+
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True, check=True)
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return statistics.median(timings)
+
+
+def main() -> int:
+    baseline = measure(["-c", "pass"])
+    print(f"{'interpreter':<20} {baseline:7.1f} ms")
+
+    over_budget: List[str] = []
+
+    for command, budget in BUDGETS.items():
+        overhead = measure([*entry_point, *command.split()]) - baseline
+        status = "ok" if overhead <= budget else "OVER"
+        print(f"{command:<20} {overhead:+7.1f} ms (budget {budget} ms) {status}")
+
+        if overhead > budget:
+            over_budget.append(command)
+
+    if over_budget:
+        print(f"Over budget: {', '.join(over_budget)}", file=sys.stderr)
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,28 @@
-# flake8: noqa
-from .config import config
-from .rate_limit import rate_limit
-from .search import search
-from .version import show_version
+"""CLI commands, imported lazily so a command only loads its own dependencies"""
+
+import importlib
+
+# Exported command: module defining it.
+_commands = {
+    "cache": "cache",
+    "config": "config",
+    "index": "index",
+    "rate_limit": "rate_limit",
+    "search": "search",
+    "serve": "serve",
+    "show_version": "version",
+    "watch": "watch",
+}
+
+__all__ = list(_commands)
+
+
+def __getattr__(name: str):
+    if name not in _commands:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f".{_commands[name]}", __name__)
+
+    # Importing `.search` binds the module to `search`, rebind the command.
+    command = globals()[name] = getattr(module, name)
+    return command
@@ -0,0 +1,40 @@
+import click
+
+from good_first_issues.graphql.cache import CACHE_TTL, ResponseCache, cache_dir
+
+
+@click.group()
+def cache():
+    """
+    Manage the local cache of GitHub API responses.
+
+    Cached responses are stored in ~/.gfi/cache.
+    """
+    pass
+
+
+@cache.command()
+def stats():
+    """
+    Display the number of cached responses and their size on disk.
+    """
+    cache_stats = ResponseCache(ttl=0).stats()
+
+    # Plain click output, rich takes longer to import than the stats to count.
+    click.echo(f"Cache directory: {click.style(cache_dir, fg='blue', bold=True)}")
+    click.echo(f"Entries: {cache_stats.entries} ({cache_stats.expired} expired)")
+    click.echo(f"Size: {cache_stats.size / 1024:.1f} KiB")
+    click.echo(
+        "TTL: "
+        + ", ".join(f"{mode} {ttl // 60} mins" for mode, ttl in CACHE_TTL.items())
+    )
+
+
+@cache.command()
+def clear():
+    """
+    Remove all cached responses.
+    """
+    removed = ResponseCache(ttl=0).clear()
+
+    click.secho(f"Removed {removed} cached responses.🗑️", fg="green", bold=True)
@@ -0,0 +1,131 @@
+from typing import List, Tuple, Union
+
+import click
+from halo import Halo
+from rich.console import Console
+
+from good_first_issues import utils
+from good_first_issues.graphql import services, sync
+from good_first_issues.graphql.index import (
+    HACKTOBERFEST_TARGET,
+    IssueIndex,
+    index_file,
+)
+from good_first_issues.graphql.models import Issue
+
+console = Console(color_system="auto")
+
+# Hacktoberfest issues indexed by `gfi index sync --hacktoberfest`.
+HACKTOBERFEST_INDEX_LIMIT: int = 500
+
+
+@click.group()
+def index():
+    """
+    Manage the local index used by `gfi search --offline`.
+
+    The index is stored in ~/.gfi/index.db.
+    """
+    pass
+
+
+@index.command("sync")
+@click.option(
+    "--repo",
+    "-r",
+    help="Index a specific repo of user or organization",
+    type=str,
+)
+@click.option(
+    "--user",
+    "-u",
+    help="Specify if it's a user repository",
+    is_flag=True,
+)
+@click.option(
+    "--hacktoberfest",
+    "-hf",
+    help="Index repositories with topic hacktoberfest",
+    is_flag=True,
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    help="Maximum number of names synced at once. Defaults to 4",
+    type=click.IntRange(min=1),
+    default=services.DEFAULT_CONCURRENCY,
+)
+@click.argument("names", nargs=-1)
+def sync_index(
+    names: Tuple[str, ...],
+    repo: str,
+    user: bool,
+    hacktoberfest: bool,
+    concurrency: int,
+):
+    """
+    Store good first issues of organizations or users in the index.
+
+    Only issues updated since the previous sync are fetched.
+
+        gfi index sync "rust-lang" "facebook"
+
+        gfi index sync "yankeexe" --user
+
+        gfi index sync --hacktoberfest
+    """
+    if not names and not hacktoberfest:
+        utils.print_help_msg(sync_index)
+        return
+
+    token: Union[str, bool] = services.use_tokens(utils.check_credentials())
+    issue_index = IssueIndex()
+
+    spinner = Halo(text="Syncing issues...", spinner="dots")
+    spinner.start()
+
+    indexed: List[Tuple[str, int]] = []
+    rate_limit: int = 0
+
+    if hacktoberfest:
+        query, variables, _ = services.identify_mode(
+            None, None, False, True, None, services.PAGE_SIZE
+        )
+        issues: List[Issue] = []
+        pages = services.paginate_repositories(
+            token, query, variables, HACKTOBERFEST_INDEX_LIMIT
+        )
+        for page_issues, rate_limit in pages:
+            issues.extend(page_issues)
+        stored = issue_index.replace_target(HACKTOBERFEST_TARGET, issues)
+        indexed.append((HACKTOBERFEST_TARGET, stored))
+
+    targets = [services.identify_target(name, repo, user)[0] for name in names]
+    synced = services.fan_out(
+        lambda target: sync.sync_target(token, target),
+        targets,
+        concurrency=concurrency,
+    )
+
+    for target, (issues, rate_limit) in zip(targets, synced):
+        indexed.append((target, issue_index.replace_target(target, issues)))
+        spinner.text = f"Indexed {target}..."
+
+    spinner.succeed("Issues indexed.")
+
+    for target, count in indexed:
+        console.print(f"{target}: {count} issues", emoji=False, markup=False)
+
+    console.print(f"Remaining requests:dash:: {rate_limit}", style="bold green")
+
+
+@index.command()
+def stats():
+    """
+    Display the number of indexed issues and the index size.
+    """
+    index_stats = IssueIndex().stats()
+
+    console.print(f"Index: [bold blue]{index_file}[/bold blue]")
+    console.print(f"Issues: {index_stats.issues} from {index_stats.targets} targets")
+    console.print(f"Size: {index_stats.size / 1024:.1f} KiB")
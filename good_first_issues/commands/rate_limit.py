@@ -1,10 +1,7 @@
 import click
-from rich.console import Console
 
 from good_first_issues import utils
 
-console = Console(color_system="auto")
-
 
 @click.command("rate-limit")
 def rate_limit():
@@ -13,4 +10,6 @@ def rate_limit():
     """
     rate_limit = utils.gql_rate_limit()
 
-    console.print(f"Remaining requests:dash:: {rate_limit}", style="bold green")
+    utils.get_console().print(
+        f"Remaining requests:dash:: {rate_limit}", style="bold green"
+    )
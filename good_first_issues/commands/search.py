@@ -1,17 +1,58 @@
+import math
 import sys
-from typing import Iterable, List, Optional, Union
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 import click
 from halo import Halo
 from rich.console import Console
 from tabulate import tabulate
 
-from good_first_issues import utils
-from good_first_issues.graphql import services
-from good_first_issues.utils import ParsedDuration, parse_period
+from good_first_issues import trace, utils
+from good_first_issues.graphql import partition, rank, services, sync
+from good_first_issues.graphql.cache import CACHE_TTL, ResponseCache
+from good_first_issues.graphql.checkpoint import Checkpoint
+from good_first_issues.graphql.index import IssueIndex
+from good_first_issues.graphql.models import Issue
+from good_first_issues.utils import period_since
+from good_first_issues.utils.stream import writers
 
 console = Console(color_system="auto")
 
+# Columns each output shows, and so fetches, unless `--columns` is given.
+# `None` fetches every column.
+default_columns: Dict[str, Optional[Tuple[str, ...]]] = {
+    "table": ("title", "url"),
+    "web": ("title", "url"),
+    "web-export": ("title", "url", "repo", "owner", "labels", "created_at"),
+    "jsonl": None,
+    "json": None,
+    "csv": None,
+}
+
+# Table headers of the columns, the others are titled from their name.
+column_headers: Dict[str, str] = {"title": "Title", "url": "Issue URL"}
+
+
+def parse_columns(
+    ctx: click.Context, param: click.Parameter, value: Optional[str]
+) -> Optional[Tuple[str, ...]]:
+    """
+    Split `--columns` and check every name is a column of `Issue`.
+    """
+    if value is None:
+        return None
+
+    columns = tuple(column.strip() for column in value.split(",") if column.strip())
+    unknown = [column for column in columns if column not in Issue._fields]
+
+    if unknown or not columns:
+        raise click.BadParameter(
+            f"choose from {', '.join(Issue._fields)}", ctx=ctx, param=param
+        )
+
+    return columns
+
 
 period_help_msg = """
 Specify a time range for filtering data.
@@ -53,10 +94,16 @@ $ gfi search "yankeexe" --user --repo "good-first-issues" -p "600 days"
     help="Search repositories with topic hacktoberfest",
     is_flag=True,
 )
+@click.option(
+    "--issues-per-repo",
+    help="Good first issues to fetch from each repository with --hacktoberfest. Defaults to 2",
+    type=click.IntRange(min=1, max=100),
+    default=services.DEFAULT_ISSUES_PER_REPO,
+)
 @click.option(
     "--limit",
     "-l",
-    help="Limit the number of issues to display. Defaults to 10",
+    help="Limit the number of issues to display. Defaults to 10. Fetched in pages of 100.",
     type=int,
     default=10,
 )
@@ -71,23 +118,130 @@ $ gfi search "yankeexe" --user --repo "good-first-issues" -p "600 days"
     help="Display issues on browser",
     is_flag=True,
 )
+@click.option(
+    "--web-export",
+    help="Write the issues to a standalone HTML report with sorting and filtering.",
+    type=click.Path(dir_okay=False, writable=True),
+)
+@click.option(
+    "--stream",
+    "-s",
+    help="Print issues as they are fetched, with fixed column widths.",
+    is_flag=True,
+)
+@click.option(
+    "--format",
+    "output_format",
+    help="Output format. jsonl, csv and json write every field of each issue as it is fetched.",
+    type=click.Choice(list(writers)),
+    default="table",
+)
+@click.option(
+    "--columns",
+    help=(
+        "Comma separated columns to fetch and show, from "
+        f"{','.join(Issue._fields)}. Defaults to what the output needs."
+    ),
+    callback=parse_columns,
+)
 @click.option(
     "--all",
     "-a",
     help="View all the issues found without limits.",
     is_flag=True,
 )
+@click.option(
+    "--concurrency",
+    "-c",
+    help="Maximum number of requests in flight when searching many names. Defaults to 4",
+    type=click.IntRange(min=1),
+    default=services.DEFAULT_CONCURRENCY,
+)
+@click.option(
+    "--no-cache",
+    help="Skip the local response cache, neither read nor write it.",
+    is_flag=True,
+)
+@click.option(
+    "--refresh",
+    help="Ignore cached responses and refresh the cache with new ones.",
+    is_flag=True,
+)
+@click.option(
+    "--incremental",
+    "-i",
+    help="Only fetch issues updated since the previous incremental run and merge them into its results.",
+    is_flag=True,
+)
+@click.option(
+    "--wait-for-reset",
+    help="Wait for the rate limit to reset when it runs out, instead of stopping.",
+    is_flag=True,
+)
+@click.option(
+    "--offline",
+    help="Answer from the local index built by `gfi index sync`, without network calls.",
+    is_flag=True,
+)
+@click.option(
+    "--title",
+    "-t",
+    help="With --offline, only show issues with these words in the title.",
+    type=str,
+)
+@click.option(
+    "--label",
+    help="With --offline, only show issues with these words in their labels. With --sort labels, rank them first.",
+    type=str,
+)
+@click.option(
+    "--sort",
+    help="Rank the issues found across every name and keep the best --limit: newest, best label match or by repo.",
+    type=click.Choice(list(rank.sorts)),
+)
+@click.option(
+    "--timings",
+    help="Print where the time went and the GraphQL cost to stderr.",
+    is_flag=True,
+)
+@click.option(
+    "--trace-json",
+    help="Write phase timings, pages, bytes and GraphQL cost to a JSON file.",
+    type=click.Path(dir_okay=False, writable=True),
+)
+@click.option(
+    "--targets-file",
+    help="Also search the orgs, users and repos listed in a file, one per line. Resumes an interrupted run.",
+    type=click.Path(exists=True, dir_okay=False),
+)
 @click.option("--period", "-p", help=period_help_msg)
-@click.argument("name", required=False)
+@click.argument("names", nargs=-1)
 def search(
-    name: str,
+    names: Tuple[str, ...],
     repo: str,
     user: bool,
     web: bool,
-    limit: int,
+    web_export: Optional[str],
+    stream: bool,
+    output_format: str,
+    columns: Optional[Tuple[str, ...]],
+    limit: Optional[int],
     all: bool,
     hacktoberfest: bool,
+    issues_per_repo: int,
     period: str,
+    concurrency: int,
+    no_cache: bool,
+    refresh: bool,
+    incremental: bool,
+    wait_for_reset: bool,
+    offline: bool,
+    title: Optional[str],
+    label: Optional[str],
+    sort: Optional[str],
+    timings: bool,
+    trace_json: Optional[str],
+    targets_file: Optional[str],
 ):
     """Search for good first issues in organizations or user repositories.
 
@@ -109,75 +263,430 @@ def search(
 
         gfi search "ollama" --repo "ollama-python"
 
+    ➡️ many orgs or users at once
+
+        gfi search "ollama" "rust-lang" "facebook"
+
+    ➡️ from the local index, see `gfi index sync`
+
+        gfi search "rust-lang" --offline --title "docs" --label "help wanted"
+
+    ➡️ every org, user or repo listed in a file
+
+        gfi search --targets-file orgs.txt
+
     """
 
-    if name is None and hacktoberfest is False:
+    if not names and hacktoberfest is False and not offline and not targets_file:
         utils.print_help_msg(search)
         sys.exit()
 
-    issues: Optional[Iterable] = None
-    rate_limit: int = 0
+    if timings or trace_json:
+        tracer = trace.enable()
+        click.get_current_context().call_on_close(
+            lambda: report_trace(tracer, timings, trace_json)
+        )
+
+    name: Optional[str] = names[0] if names else None
+
+    issues: Optional[List[Issue]] = None
+    rate_limit: Optional[int] = 0
 
-    # Check for GitHub Token.
-    token: Union[str, bool] = utils.check_credential()
+    # Checkpoints are keyed on the option, the timestamp moves between runs.
+    period_option: Optional[str] = period
 
     if period:
-        period: ParsedDuration = parse_period(period)
-        period = period.utc_date_time.strftime("%Y-%m-%dT%H:%M:%SZ")
+        period = period_since(period)
+
+    # `--all` lifts the limit, pages are walked until GitHub runs out of results.
+    if all:
+        limit = None
+
+    # Anything but the default table is written as it is fetched.
+    stream = stream or output_format != "table"
+
+    if stream and (web or web_export):
+        raise click.UsageError("--stream and --format print to stdout, drop --web")
+
+    if targets_file and (offline or incremental or hacktoberfest):
+        raise click.UsageError(
+            "--targets-file is not supported with --offline, --incremental or --hacktoberfest"
+        )
+
+    # Only the columns the output shows are fetched.
+    if columns is None:
+        output = "web-export" if web_export else "web" if web else output_format
+        columns = default_columns[output]
+
+    # Along with the ones issues are ranked by, which aren't shown.
+    fetch_columns: Optional[Tuple[str, ...]] = columns
+    if sort and columns is not None:
+        fetch_columns = columns + tuple(
+            column for column in rank.sort_columns[sort] if column not in columns
+        )
+
+    rank_key: Optional[rank.RankKey] = None
+    if sort:
+        rank_key = rank.rank_key(sort, label.split() if label else ())
+
+    # Issues fetched a name, the best `limit` of them are kept when sorting.
+    candidates: Optional[int] = partition.candidate_limit(sort, limit)
+
+    if offline:
+        with trace.phase("index"):
+            issues = IssueIndex().search(
+                owners=names,
+                repo=repo,
+                title=title,
+                label=label,
+                since=period,
+                limit=candidates,
+                hacktoberfest=hacktoberfest,
+            )
+        if sort:
+            issues, _ = next(rank.top_k([(issues, None)], limit, rank_key))
+        if stream:
+            return display_stream([(issues, None)], output_format, columns)
+        return display(issues, web, None, web_export, columns)
+
+    # Check for GitHub Tokens.
+    with trace.phase("credentials"):
+        tokens: List[str] = utils.check_credentials()
 
     # Identify the flags passed.
     query, variables, mode = services.identify_mode(
-        name, repo, user, hacktoberfest, period, limit
+        name, repo, user, hacktoberfest, period, candidates, fetch_columns, sort
     )
 
+    if incremental and mode == "search":
+        raise click.UsageError("--incremental is not supported with --hacktoberfest")
+
+    # Pause for as long as the reset takes, rather than stopping the search.
+    if wait_for_reset:
+        services.scheduler.max_wait = math.inf
+
+    # Several tokens share the work, each within its own rate limit.
+    token: Union[str, bool] = services.use_tokens(tokens)
+
+    # Repeated searches are answered from `~/.gfi/cache` while fresh.
+    if not no_cache:
+        services.response_cache = ResponseCache(ttl=CACHE_TTL[mode], refresh=refresh)
+
+    # API Call + Data Filtering
+    if targets_file:
+        targets = [services.identify_target(name, repo, user)[0] for name in names]
+        targets.extend(read_targets(targets_file, repo, user))
+        checkpoint = Checkpoint(
+            targets,
+            {
+                "period": period_option,
+                "limit": candidates,
+                "columns": fetch_columns,
+                "sort": sort,
+            },
+        )
+        pages = fetch_targets(
+            token,
+            targets,
+            period,
+            candidates,
+            concurrency,
+            fetch_columns,
+            checkpoint,
+            sort,
+        )
+    else:
+        pages = fetch_pages(
+            token,
+            names,
+            repo,
+            user,
+            period,
+            candidates,
+            mode,
+            query,
+            variables,
+            issues_per_repo,
+            concurrency,
+            incremental,
+            fetch_columns,
+            sort,
+        )
+
+    # Ranked issues are held back until every page is in. The others are
+    # only deduplicated when several names can return the same issue.
+    if sort:
+        pages = rank.top_k(pages, limit, rank_key)
+    elif targets_file or (len(names) > 1 and mode != "search"):
+        pages = rank.unique(pages)
+
+    if stream:
+        return display_stream(pages, output_format, columns)
+
     # Spinner
     spinner = Halo(text="Fetching repos...", spinner="dots")
     spinner.start()
 
-    # API Call
-    response = services.caller(token, query, variables)
+    issues = []
+    with trace.phase("fetch"):
+        for page_issues, rate_limit in pages:
+            issues.extend(page_issues)
+            spinner.text = f"Fetched {len(issues)} issues..."
+
+    spinner.succeed("Repos synced." if incremental else "Repos fetched.")
+
+    display(issues, web, rate_limit, web_export, columns)
+
+
+def fetch_pages(
+    token: Union[str, bool],
+    names: Tuple[str, ...],
+    repo: Optional[str],
+    user: bool,
+    period: Optional[str],
+    limit: Optional[int],
+    mode: str,
+    query: str,
+    variables: Dict,
+    issues_per_repo: int,
+    concurrency: int,
+    incremental: bool,
+    columns: Optional[Tuple[str, ...]] = None,
+    sort: Optional[str] = None,
+) -> Iterator[Tuple[List[Issue], int]]:
+    """
+    Issues of a search, a page at a time, with the remaining rate limit.
 
-    spinner.succeed("Repos fetched.")
+    Pages are fetched as they are iterated, so callers can show the first
+    page before the last one is requested. Incremental searches store
+    every column, the others only fetch `columns`.
+    """
+    if incremental:
+        # Stored results are brought up to date, `--period` filters them locally.
+        targets = [services.identify_target(name, repo, user)[0] for name in names]
+        synced = services.fan_out(
+            lambda target: sync.sync_target(token, target),
+            targets,
+            concurrency=concurrency,
+        )
+        for synced_issues, rate_limit in synced:
+            recent = (
+                issue
+                for issue in synced_issues
+                if not period or (issue.created_at or "") >= period
+            )
+            yield list(islice(recent, limit)), rate_limit
+
+    elif len(names) > 1 and mode != "search":
+        # Many targets: aliased searches batched into a few documents.
+        documents, mode = services.identify_batch_mode(
+            names, repo, user, period, limit, columns, sort
+        )
+        batches = services.fan_out(
+            lambda document: services.fetch_batch(
+                token, document, mode, limit, columns
+            ),
+            documents,
+            concurrency=concurrency,
+        )
+        for results, rate_limit in batches:
+            for target_issues in results:
+                yield target_issues, rate_limit
+
+    elif mode == "org" or mode == "user" or mode == "repo":
+        # Split into `created:` windows when GitHub caps the results.
+        yield from partition.paginate_windows(
+            token, query, variables, limit, mode, period, concurrency
+        )
+
+    elif mode == "search":
+        yield from services.paginate_repositories(
+            token, query, variables, limit, issues_per_repo
+        )
+
+
+def read_targets(path: str, repo: Optional[str], user: bool) -> List[str]:
+    """
+    Search qualifiers of a `--targets-file`, skipping blanks, `#` comments
+    and repeated entries.
+    """
+    targets: Dict[str, None] = {}
+
+    with open(path) as file:
+        for line in file:
+            entry = line.split("#", 1)[0].strip()
+            if entry:
+                targets[services.parse_target(entry, repo, user)] = None
+
+    return list(targets)
+
+
+def fetch_targets(
+    token: Union[str, bool],
+    targets: List[str],
+    period: Optional[str],
+    limit: Optional[int],
+    concurrency: int,
+    columns: Optional[Tuple[str, ...]],
+    checkpoint: Checkpoint,
+    sort: Optional[str] = None,
+) -> Iterator[Tuple[List[Issue], Optional[int]]]:
+    """
+    Issues of every target, batched like many names, a target at a time.
+
+    Each batch is recorded in `checkpoint` as it completes. Targets an
+    interrupted run finished are answered from it first, and it is
+    removed once every target is done.
+    """
+    done = checkpoint.load()
+    if done:
+        click.echo(
+            f"Resuming, {len(done)} of {len(targets)} targets already done.", err=True
+        )
+        yield [issue for target in targets for issue in done.get(target, [])], None
+
+    pending = [target for target in targets if target not in done]
+    searches = [services.search_string(target, period, sort) for target in pending]
+    documents = services.batch_documents(searches, limit, columns)
+    batches = services.fan_out(
+        lambda document: services.fetch_batch(token, document, "org", limit, columns),
+        documents,
+        concurrency=concurrency,
+    )
 
-    # Data Filtering
-    if mode == "org" or mode == "user":
-        issues, rate_limit = services.org_user_pipeline(response, mode)
+    try:
+        start: int = 0
+        for (_, _, aliases), (results, rate_limit) in zip(documents, batches):
+            finished = list(zip(pending[start : start + len(aliases)], results))
+            start += len(aliases)
 
-    if mode == "repo":
-        issues, rate_limit = services.org_user_pipeline(response, mode)
+            checkpoint.record(finished)
+            for _, issues in finished:
+                yield issues, rate_limit
+    except (SystemExit, KeyboardInterrupt):
+        click.echo("Progress saved, run the same command to resume.", err=True)
+        raise
 
-    if mode == "search":
-        issues, rate_limit = services.extract_search_results(response)
-        issues = issues[:limit]  # cannot set limit on the search_query directly
+    checkpoint.remove()
 
-    table_headers: List = ["Title", "Issue URL"]
+
+def display_stream(
+    pages: Iterable[Tuple[List[Issue], Optional[int]]],
+    output_format: str = "table",
+    columns: Optional[Tuple[str, ...]] = None,
+):
+    """
+    Write issues as their pages arrive, for `--stream` and `--format`.
+
+    Machine-readable formats are written alone, without any messages, and
+    hold `columns`. The table always shows titles and URLs.
+    Fetching happens while rows are written, its phases are timed apart
+    from `render`.
+    """
+    rate_limit: Optional[int] = 0
+
+    def issues() -> Iterator[Issue]:
+        nonlocal rate_limit
+        for page_issues, rate_limit in pages:
+            yield from page_issues
+
+    with trace.phase("render"):
+        if output_format == "table":
+            count: int = writers["table"](issues())
+        else:
+            count = writers[output_format](issues(), fields=columns)
+
+    if output_format != "table":
+        return
+
+    if not count:
+        return display(None, False, rate_limit)
+
+    if rate_limit is not None:
+        console.print(f"Remaining requests:dash:: {rate_limit}", style="bold green")
+    console.print("Happy Hacking :tada::zap::rocket:", style="bold blue")
+
+
+def display(
+    issues: Optional[List[Issue]],
+    web: bool,
+    rate_limit: Optional[int],
+    web_export: Optional[str] = None,
+    columns: Optional[Tuple[str, ...]] = None,
+):
+    """
+    Print the issues as a table, serve them on the browser or export them.
+
+    `rate_limit` is `None` for offline searches, which spend none. The
+    table shows `columns`, titles and URLs by default.
+    """
+    columns = columns or default_columns["table"]
+    table_headers: List = [
+        column_headers.get(column, column.replace("_", " ").title())
+        for column in columns
+    ]
 
     # No good first issues found.
     if not issues:
-        console.print(
-            f"Remaining requests:dash:: {rate_limit}",
-            style="bold green",
-        )
+        if rate_limit is not None:
+            console.print(
+                f"Remaining requests:dash:: {rate_limit}",
+                style="bold green",
+            )
 
         return console.print(
             "No good first issues found!:mask:",
             style="bold red",
         )
 
+    # Standalone report, opened from disk without a server.
+    if web_export:
+        with trace.phase("render"), open(web_export, "w", encoding="utf-8") as file:
+            file.write(utils.render_report(issues))
+
+        return console.print(
+            f"{len(issues)} issues exported to [bold blue]{web_export}[/bold blue]",
+            style="bold green",
+        )
+
     # Handle displaying issues on browser.
     if web:
-        html_data = tabulate(issues, table_headers, tablefmt="html")
-        return utils.web_server(html_data)
-
-    row_ids = list(range(1, len(issues) + 1))
-    print(
-        tabulate(
-            issues,
-            table_headers,
-            tablefmt="fancy_grid",
-            showindex=row_ids,
+        with trace.phase("render"):
+            page = utils.render_page(issues)
+        return utils.web_server(page)
+
+    with trace.phase("render"):
+        rows = [
+            [
+                ", ".join(issue.labels)
+                if column == "labels"
+                else getattr(issue, column)
+                for column in columns
+            ]
+            for issue in issues
+        ]
+
+        row_ids = list(range(1, len(rows) + 1))
+        print(
+            tabulate(
+                rows,
+                table_headers,
+                tablefmt="fancy_grid",
+                showindex=row_ids,
+            )
         )
-    )
 
-    console.print(f"Remaining requests:dash:: {rate_limit}", style="bold green")
+    if rate_limit is not None:
+        console.print(f"Remaining requests:dash:: {rate_limit}", style="bold green")
     console.print("Happy Hacking :tada::zap::rocket:", style="bold blue")
+
+
+def report_trace(tracer: trace.Tracer, timings: bool, trace_json: Optional[str]):
+    """
+    Print or write what `--timings` and `--trace-json` collected.
+    """
+    if timings:
+        tracer.print_summary()
+
+    if trace_json:
+        tracer.write_json(trace_json)
@@ -0,0 +1,80 @@
+import math
+import sys
+from typing import Union
+
+import click
+from rich.console import Console
+
+from good_first_issues import utils
+from good_first_issues.graphql import services
+from good_first_issues.graphql.cache import CACHE_TTL, MemoryCache
+
+console = Console(color_system="auto")
+
+
+@click.command()
+@click.option(
+    "--host",
+    help="Address to listen on. Defaults to 127.0.0.1",
+    type=str,
+    default="127.0.0.1",
+)
+@click.option(
+    "--port",
+    "-p",
+    help="Port to listen on. Defaults to 8000",
+    type=int,
+    default=8000,
+)
+@click.option(
+    "--concurrency",
+    "-c",
+    help="Batches each search fetches in parallel. Defaults to 4",
+    type=click.IntRange(min=1),
+    default=services.DEFAULT_CONCURRENCY,
+)
+@click.option(
+    "--wait-for-reset",
+    help="Wait for the rate limit to reset when it runs out, instead of failing requests.",
+    is_flag=True,
+)
+def serve(host: str, port: int, concurrency: int, wait_for_reset: bool):
+    """
+    Answer searches over HTTP, sharing a cache across requests.
+
+    GET /search returns JSON, GET / a page to search from the browser.
+
+        gfi serve --port 8000
+
+        curl "http://127.0.0.1:8000/search?org=rust-lang&limit=5"
+    """
+    # Imported here, `--help` doesn't need http.server or the page templates.
+    from good_first_issues.utils.server import Server
+
+    # Set before the token pool is made, its schedulers inherit it.
+    if wait_for_reset:
+        services.scheduler.max_wait = math.inf
+
+    token: Union[str, bool] = services.use_tokens(utils.check_credentials())
+    if not token:
+        console.print(
+            "No GitHub Token found. Use `gfi config` to enter your token.:key:",
+            style="bold red",
+        )
+        sys.exit()
+
+    # Shared by every request thread, repeated searches skip the network.
+    services.response_cache = MemoryCache(ttl=CACHE_TTL["org"])
+
+    server = Server((host, port), token, concurrency)
+    console.print(
+        f"Serving on http://{host}:{server.server_port}/, Ctrl+C to stop.:rocket:",
+        style="bold blue",
+    )
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        console.print("\nServer stopped.", style="bold green")
+    finally:
+        server.server_close()
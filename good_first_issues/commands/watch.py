@@ -0,0 +1,94 @@
+import math
+from typing import Tuple, Union
+
+import click
+from rich.console import Console
+
+from good_first_issues import utils
+from good_first_issues.graphql import services
+from good_first_issues.graphql.watch import Watcher
+from good_first_issues.utils import parse_period
+from good_first_issues.utils.stream import writers
+
+console = Console(color_system="auto")
+
+
+@click.command()
+@click.option(
+    "--repo",
+    "-r",
+    help="Watch a specific repo of user or organization",
+    type=str,
+)
+@click.option(
+    "--user",
+    "-u",
+    help="Specify if it's a user repository",
+    is_flag=True,
+)
+@click.option(
+    "--interval",
+    "-n",
+    help="Time between polls of each name, e.g. 5m, 1h. Defaults to 5m",
+    type=str,
+    default="5m",
+)
+@click.option(
+    "--limit",
+    "-l",
+    help="Issues to show from each name on the first poll. Defaults to 10",
+    type=int,
+    default=10,
+)
+@click.option(
+    "--format",
+    "output_format",
+    help="Output format, jsonl and csv write every field of each issue.",
+    type=click.Choice(["table", "jsonl", "csv"]),
+    default="table",
+)
+@click.argument("names", nargs=-1)
+def watch(
+    names: Tuple[str, ...],
+    repo: str,
+    user: bool,
+    interval: str,
+    limit: int,
+    output_format: str,
+):
+    """
+    Keep polling organizations or users and print new good first issues.
+
+    Each poll only fetches issues updated since the previous one.
+
+        gfi watch "rust-lang" "facebook" --interval 10m
+
+        gfi watch "yankeexe" --user --format jsonl
+    """
+    if not names:
+        utils.print_help_msg(watch)
+        return
+
+    seconds: int = parse_period(interval).absolute_period * 60
+    if seconds < 60:
+        raise click.BadParameter("must be at least a minute", param_hint="--interval")
+
+    targets = [services.identify_target(name, repo, user)[0] for name in names]
+
+    # A watch outlives the rate limit window, wait for resets instead of stopping.
+    services.scheduler.max_wait = math.inf
+    token: Union[str, bool] = services.use_tokens(utils.check_credentials())
+
+    watcher = Watcher(token, targets, interval=seconds, first_limit=limit)
+
+    if output_format == "table":
+        console.print(
+            f"Watching {len(targets)} targets every {interval}, Ctrl+C to stop.:eyes:",
+            style="bold blue",
+        )
+
+    try:
+        writers[output_format](watcher.run())
+    except KeyboardInterrupt:
+        if output_format == "table":
+            console.print("\nStopped watching.", style="bold green")
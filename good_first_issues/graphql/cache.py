@@ -0,0 +1,291 @@
+"""On-disk cache for GraphQL responses"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# Global variables
+cache_dir: str = f"{Path.home()}/.gfi/cache"
+
+# Seconds a cached response stays fresh, per search mode.
+CACHE_TTL: Dict[str, int] = {
+    "org": 10 * 60,
+    "user": 10 * 60,
+    "repo": 5 * 60,
+    "search": 30 * 60,
+}
+
+# Size of the cache directory above which least recently used entries go.
+MAX_CACHE_BYTES: int = 50 * 1024 * 1024
+
+# Share of `MAX_CACHE_BYTES` eviction goes down to, so the writes after it
+# don't evict again right away.
+EVICT_TARGET: float = 0.9
+
+# Responses held by `MemoryCache` above which least recently used ones go.
+MAX_MEMORY_ENTRIES: int = 1024
+
+
+class CacheStats(NamedTuple):
+    entries: int
+    expired: int
+    size: int
+
+
+def cache_key(query: str, variables: Dict) -> str:
+    """
+    Hash the whitespace-normalized query along with its variables.
+    """
+    normalized: str = " ".join(query.split())
+    raw: str = json.dumps({"query": normalized, "variables": variables}, sort_keys=True)
+
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class ResponseCache:
+    """
+    GraphQL responses stored as one JSON file per query.
+
+    Entries expire `ttl` seconds after they are written. A file's mtime
+    is bumped on every hit, and the least recently used files are evicted
+    once the directory grows past `max_bytes`. The directory is only
+    listed on the first write and on evictions, the writes in between
+    add up its size.
+
+    `refresh` skips lookups but still stores fresh responses.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        directory: str = cache_dir,
+        max_bytes: int = MAX_CACHE_BYTES,
+        refresh: bool = False,
+    ):
+        self.ttl = ttl
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.refresh = refresh
+
+        # Bytes in the directory, `None` until the first write counts them.
+        self.size: Optional[int] = None
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def _entries(self) -> List[os.DirEntry]:
+        if not os.path.isdir(self.directory):
+            return []
+
+        with os.scandir(self.directory) as entries:
+            return [entry for entry in entries if entry.name.endswith(".json")]
+
+    def get(self, query: str, variables: Dict) -> Optional[Dict]:
+        """
+        Return the cached payload, `None` on a miss or an expired entry.
+        """
+        if self.refresh:
+            return None
+
+        path = self._path(cache_key(query, variables))
+
+        try:
+            with open(path) as file:
+                entry: Dict = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get("expires_at", 0) < time.time():
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+
+        return entry.get("payload")
+
+    def put(self, query: str, variables: Dict, payload: Dict):
+        """
+        Store the payload atomically, then evict once past `max_bytes`.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {"expires_at": time.time() + self.ttl, "payload": payload}
+        path = self._path(cache_key(query, variables))
+
+        try:
+            replaced: int = os.stat(path).st_size
+        except OSError:
+            replaced = 0
+
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(entry, file)
+            written: int = file.tell()
+        os.replace(tmp_path, path)
+
+        if self.size is None:
+            self.evict()
+            return
+
+        self.size += written - replaced
+        if self.size > self.max_bytes:
+            self.evict()
+
+    def release(self, query: str, variables: Dict):
+        """
+        Nothing to release, lookups on disk don't wait on each other.
+        """
+
+    def evict(self):
+        """
+        Remove least recently used entries once over `max_bytes`, down to
+        `EVICT_TARGET` of it, and recount the size of the directory.
+        """
+        entries = []
+        for entry in self._entries():
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        size: int = sum(item[1] for item in entries)
+        target = self.max_bytes * EVICT_TARGET if size > self.max_bytes else size
+
+        for _, entry_size, path in sorted(entries):
+            if size <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entry_size
+
+        self.size = size
+
+    def stats(self) -> CacheStats:
+        """
+        Count entries, expired entries and the bytes they take on disk.
+        """
+        entries = expired = size = 0
+        now = time.time()
+
+        for entry in self._entries():
+            try:
+                size += entry.stat().st_size
+                with open(entry.path) as file:
+                    if json.load(file).get("expires_at", 0) < now:
+                        expired += 1
+            except (OSError, ValueError):
+                continue
+            entries += 1
+
+        return CacheStats(entries=entries, expired=expired, size=size)
+
+    def clear(self) -> int:
+        """
+        Remove every entry, returns the number of entries removed.
+        """
+        removed: int = 0
+
+        for entry in self._entries():
+            try:
+                os.remove(entry.path)
+            except OSError:
+                continue
+            removed += 1
+
+        self.size = None
+
+        return removed
+
+
+class MemoryCache:
+    """
+    GraphQL responses kept in process, shared by the threads of `gfi serve`.
+
+    A drop-in for `ResponseCache`: entries expire `ttl` seconds after
+    they are stored, and the least recently used go once there are more
+    than `max_entries`. Hits hand out the stored payload, don't mutate it.
+
+    Concurrent misses on the same query are fetched once: the first `get`
+    misses, the others wait until it is stored by `put`, or given up by
+    `release`.
+    """
+
+    def __init__(
+        self,
+        ttl: int,
+        max_entries: int = MAX_MEMORY_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+
+        # Queries being fetched: the thread fetching, woken waiters.
+        self.pending: Dict[str, Tuple[int, threading.Event]] = {}
+
+    def get(self, query: str, variables: Dict) -> Optional[Dict]:
+        """
+        Return the cached payload, `None` on a miss or an expired entry.
+
+        A miss leaves the calling thread to fetch the query, which it must
+        `put` or `release`. Until then, other threads missing it wait.
+        """
+        key = cache_key(query, variables)
+
+        while True:
+            with self.lock:
+                entry = self.entries.get(key)
+                if entry is not None:
+                    expires_at, payload = entry
+                    if expires_at >= self.clock():
+                        self.entries.move_to_end(key)
+                        return payload
+                    del self.entries[key]
+
+                fetching = self.pending.get(key)
+                if fetching is None:
+                    self.pending[key] = (threading.get_ident(), threading.Event())
+                    return None
+
+            fetching[1].wait()
+
+    def put(self, query: str, variables: Dict, payload: Dict):
+        """
+        Store the payload, then evict down to `max_entries`.
+        """
+        key = cache_key(query, variables)
+
+        with self.lock:
+            self.entries[key] = (self.clock() + self.ttl, payload)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+        self.release(query, variables)
+
+    def release(self, query: str, variables: Dict):
+        """
+        Let threads waiting on a query this thread missed look it up again.
+        """
+        key = cache_key(query, variables)
+
+        with self.lock:
+            fetching = self.pending.get(key)
+            if fetching is None or fetching[0] != threading.get_ident():
+                return
+            del self.pending[key]
+
+        fetching[1].set()
@@ -0,0 +1,74 @@
+"""Checkpoints letting searches over many targets resume where they stopped"""
+
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from good_first_issues.graphql.models import Issue
+
+# Global variables
+checkpoint_dir: str = f"{Path.home()}/.gfi/checkpoints"
+
+
+class Checkpoint:
+    """
+    Issues of the targets a run has finished, appended to disk as it goes.
+
+    A run with the same targets and options picks up the file left behind
+    by an interrupted one. Every batch is appended as lines and synced to
+    disk, a line cut short by a crash is ignored.
+    """
+
+    def __init__(self, targets: Sequence[str], options: Dict):
+        key = hashlib.sha256(
+            json.dumps([list(targets), options], sort_keys=True).encode()
+        ).hexdigest()
+        self.path: str = os.path.join(checkpoint_dir, f"{key}.jsonl")
+
+    def load(self) -> Dict[str, List[Issue]]:
+        """
+        Issues of every target finished so far.
+        """
+        done: Dict[str, List[Issue]] = {}
+
+        try:
+            with open(self.path) as file:
+                for line in file:
+                    try:
+                        entry: Dict = json.loads(line)
+                        done[entry["target"]] = [
+                            Issue.from_dict(item) for item in entry["issues"]
+                        ]
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except OSError:
+            pass
+
+        return done
+
+    def record(self, finished: Iterable[Tuple[str, List[Issue]]]):
+        """
+        Append finished targets with their issues.
+        """
+        os.makedirs(checkpoint_dir, exist_ok=True)
+
+        with open(self.path, "a") as file:
+            for target, issues in finished:
+                entry = {
+                    "target": target,
+                    "issues": [issue._asdict() for issue in issues],
+                }
+                file.write(json.dumps(entry) + "\n")
+            file.flush()
+            os.fsync(file.fileno())
+
+    def remove(self):
+        """
+        Forget the run once every target is done.
+        """
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,228 @@
+"""Local SQLite index of good first issues"""
+
+import datetime
+import os
+import sqlite3
+from contextlib import closing
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from good_first_issues.graphql.models import Issue
+
+# Global variables
+index_file: str = f"{Path.home()}/.gfi/index.db"
+
+# Target under which `--hacktoberfest` issues are indexed.
+HACKTOBERFEST_TARGET: str = "topic:hacktoberfest"
+
+schema: str = """
+CREATE TABLE IF NOT EXISTS issues (
+    url TEXT PRIMARY KEY,
+    title TEXT NOT NULL,
+    number INTEGER,
+    repo TEXT,
+    owner TEXT,
+    labels TEXT,
+    author TEXT,
+    created_at TEXT,
+    target TEXT NOT NULL,
+    synced_at TEXT NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS issues_owner_created ON issues (owner, created_at);
+CREATE INDEX IF NOT EXISTS issues_target ON issues (target);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS issues_fts USING fts5 (
+    title, labels, repo, content='issues', content_rowid='rowid'
+);
+
+CREATE TRIGGER IF NOT EXISTS issues_ai AFTER INSERT ON issues BEGIN
+    INSERT INTO issues_fts (rowid, title, labels, repo)
+    VALUES (new.rowid, new.title, new.labels, new.repo);
+END;
+
+CREATE TRIGGER IF NOT EXISTS issues_ad AFTER DELETE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, title, labels, repo)
+    VALUES ('delete', old.rowid, old.title, old.labels, old.repo);
+END;
+
+CREATE TRIGGER IF NOT EXISTS issues_au AFTER UPDATE ON issues BEGIN
+    INSERT INTO issues_fts (issues_fts, rowid, title, labels, repo)
+    VALUES ('delete', old.rowid, old.title, old.labels, old.repo);
+    INSERT INTO issues_fts (rowid, title, labels, repo)
+    VALUES (new.rowid, new.title, new.labels, new.repo);
+END;
+"""
+
+
+class IndexStats(NamedTuple):
+    issues: int
+    targets: int
+    size: int
+
+
+# Separates label names in the `labels` column.
+LABEL_SEPARATOR: str = ", "
+
+
+def row_from_issue(issue: Issue, target: str, synced_at: str) -> Tuple:
+    """
+    Flatten an issue into an `issues` row.
+    """
+    return (
+        issue.url,
+        issue.title,
+        issue.number,
+        issue.repo,
+        issue.owner,
+        LABEL_SEPARATOR.join(issue.labels),
+        issue.author,
+        issue.created_at,
+        target,
+        synced_at,
+    )
+
+
+def fts_phrases(column: str, text: str) -> str:
+    """
+    FTS5 expression matching every word of `text` as a prefix in `column`.
+    """
+    words = " ".join('"{}"*'.format(word.replace('"', '""')) for word in text.split())
+    return f"{column} : ({words})"
+
+
+class IssueIndex:
+    """
+    Issues stored in SQLite, with FTS5 over their title, labels and repo.
+    """
+
+    def __init__(self, path: str = index_file):
+        self.path = path
+
+    def connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.executescript(schema)
+        return connection
+
+    def replace_target(self, target: str, issues: Iterable[Issue]) -> int:
+        """
+        Replace the issues indexed for a target, returns the number stored.
+        """
+        synced_at = datetime.datetime.now(datetime.timezone.utc).strftime(
+            "%Y-%m-%dT%H:%M:%SZ"
+        )
+        rows = [row_from_issue(issue, target, synced_at) for issue in issues]
+
+        with closing(self.connect()) as connection, connection:
+            connection.execute("DELETE FROM issues WHERE target = ?", (target,))
+            connection.executemany(
+                """
+                INSERT INTO issues VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) DO UPDATE SET
+                    title = excluded.title,
+                    number = excluded.number,
+                    repo = excluded.repo,
+                    owner = excluded.owner,
+                    labels = excluded.labels,
+                    author = excluded.author,
+                    created_at = excluded.created_at,
+                    target = excluded.target,
+                    synced_at = excluded.synced_at
+                """,
+                rows,
+            )
+
+        return len(rows)
+
+    def search(
+        self,
+        owners: Sequence[str] = (),
+        repo: Optional[str] = None,
+        title: Optional[str] = None,
+        label: Optional[str] = None,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+        hacktoberfest: bool = False,
+    ) -> List[Issue]:
+        """
+        Answer a search from the index, newest issues first.
+
+        `title` and `label` are full-text matches, `since` is a UTC
+        timestamp issues must be created at or after.
+        """
+        sql = """
+            SELECT issues.title, issues.url, issues.number, issues.repo,
+                issues.owner, issues.labels, issues.created_at, issues.author
+            FROM issues
+        """
+        clauses: List[str] = []
+        params: List = []
+
+        match = [
+            fts_phrases(column, text)
+            for column, text in (("title", title), ("labels", label))
+            if text and text.split()
+        ]
+        if match:
+            sql += " JOIN issues_fts ON issues_fts.rowid = issues.rowid"
+            clauses.append("issues_fts MATCH ?")
+            params.append(" AND ".join(match))
+
+        if owners:
+            clauses.append(
+                f"issues.owner COLLATE NOCASE IN ({', '.join('?' * len(owners))})"
+            )
+            params.extend(owners)
+
+        if repo:
+            clauses.append("issues.repo = ? COLLATE NOCASE")
+            params.append(repo)
+
+        if since:
+            clauses.append("issues.created_at >= ?")
+            params.append(since)
+
+        if hacktoberfest:
+            clauses.append("issues.target = ?")
+            params.append(HACKTOBERFEST_TARGET)
+
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+
+        sql += " ORDER BY issues.created_at DESC"
+
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with closing(self.connect()) as connection:
+            rows = connection.execute(sql, params).fetchall()
+
+        return [
+            Issue(
+                title=title,
+                url=url,
+                number=number,
+                repo=repo,
+                owner=owner,
+                labels=tuple(labels.split(LABEL_SEPARATOR)) if labels else (),
+                created_at=created_at,
+                author=author,
+                state="OPEN",
+            )
+            for title, url, number, repo, owner, labels, created_at, author in rows
+        ]
+
+    def stats(self) -> IndexStats:
+        """
+        Count indexed issues and targets, along with the database size.
+        """
+        with closing(self.connect()) as connection:
+            issues, targets = connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT target) FROM issues"
+            ).fetchone()
+
+        return IndexStats(
+            issues=issues, targets=targets, size=os.path.getsize(self.path)
+        )
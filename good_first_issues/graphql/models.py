@@ -0,0 +1,62 @@
+"""Typed records for GraphQL payloads"""
+
+import re
+from typing import Dict, NamedTuple, Optional, Tuple
+
+# Matches the owner, repo and number of an issue URL.
+issue_url_pattern = re.compile(r"github\.com/([^/]+)/([^/]+)/issues/(\d+)")
+
+
+class Issue(NamedTuple):
+    title: str
+    url: str
+    number: Optional[int] = None
+    repo: Optional[str] = None
+    owner: Optional[str] = None
+    labels: Tuple[str, ...] = ()
+    created_at: Optional[str] = None
+    author: Optional[str] = None
+    state: Optional[str] = None
+
+    @classmethod
+    def from_node(cls, node: Dict) -> "Issue":
+        """
+        Build an issue from an `IssueFields` node in one pass.
+
+        Nodes missing `repository` or `number` fall back to the owner,
+        repo and number found in the issue URL.
+        """
+        url: str = node.get("url") or ""
+        repository: Dict = node.get("repository") or {}
+        owner: Optional[str] = (repository.get("owner") or {}).get("login")
+        repo: Optional[str] = repository.get("name")
+        number: Optional[int] = node.get("number")
+
+        if owner is None or repo is None or number is None:
+            match = issue_url_pattern.search(url)
+            if match:
+                owner = owner or match.group(1)
+                repo = repo or match.group(2)
+                number = number or int(match.group(3))
+
+        return cls(
+            title=node.get("title") or "",
+            url=url,
+            number=number,
+            repo=repo,
+            owner=owner,
+            labels=tuple(
+                label.get("name")
+                for label in (node.get("labels") or {}).get("nodes") or ()
+            ),
+            created_at=node.get("createdAt"),
+            author=(node.get("author") or {}).get("login"),
+            state=node.get("state"),
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Issue":
+        """
+        Rebuild an issue stored with `_asdict()`.
+        """
+        return cls(**{**data, "labels": tuple(data.get("labels") or ())})
@@ -0,0 +1,229 @@
+"""Splitting searches into `created:` windows to get past the 1000 result cap"""
+
+import datetime
+import math
+import re
+import time
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
+
+from good_first_issues.graphql import rank, services
+from good_first_issues.graphql.models import Issue
+
+# GitHub search stops returning results past the first 1000 hits.
+SEARCH_CAP: int = 1000
+
+# Dense windows are split into windows expected to hold this many issues,
+# leaving room for issues not being spread evenly over time.
+WINDOW_SIZE: int = 800
+
+# No issue predates GitHub, windows start here unless `--period` is given.
+GITHUB_EPOCH: datetime.datetime = datetime.datetime(
+    2008, 1, 1, tzinfo=datetime.timezone.utc
+)
+
+created_pattern = re.compile(r"\s*created:\S+")
+
+# Inclusive range of creation times, in epoch seconds. An end of `None`
+# leaves the window open, up to the issues created last.
+Window = Tuple[int, Optional[int]]
+
+
+def timestamp(moment: int) -> str:
+    return datetime.datetime.fromtimestamp(moment, datetime.timezone.utc).strftime(
+        "%Y-%m-%dT%H:%M:%SZ"
+    )
+
+
+def window_qualifier(window: Window) -> str:
+    """
+    `created:` qualifier matching the issues created within `window`.
+    """
+    start, end = window
+    if end is None:
+        return f"created:>={timestamp(start)}"
+
+    return f"created:{timestamp(start)}..{timestamp(end)}"
+
+
+def split_window(
+    window: Window, count: int, now: Optional[datetime.datetime] = None
+) -> List[Window]:
+    """
+    Split `window` into spans of time, enough for `count` issues.
+
+    Closed windows are split into equal spans. Open windows are split on
+    multiples of a power of two seconds, up to `now`, and the last span
+    is left open: the windows, and so the cache and replay keys of their
+    queries, stay the same as time passes.
+    """
+    start, end = window
+    if end is None:
+        moment = now or datetime.datetime.now(datetime.timezone.utc)
+        return split_open_window(start, count, int(moment.timestamp()))
+
+    seconds = end - start + 1
+    parts = min(seconds, max(2, math.ceil(count / WINDOW_SIZE)))
+    bounds = [start + seconds * part // parts for part in range(parts + 1)]
+
+    return [(bounds[part], bounds[part + 1] - 1) for part in range(parts)]
+
+
+def split_open_window(start: int, count: int, now: int) -> List[Window]:
+    """
+    Split the window open from `start` on a grid of aligned bounds.
+
+    The step only changes when the span up to `now` doubles, bounds only
+    get added past the last one, closing what was the open window.
+    """
+    seconds = max(1, now - start + 1)
+    parts = max(2, math.ceil(count / WINDOW_SIZE))
+    step = 1 << max(0, math.ceil(math.log2(seconds / parts)))
+    bounds = [start, *range((start // step + 1) * step, now + 1, step)]
+
+    if len(bounds) < 2:
+        return split_window((start, now), count)
+
+    windows: List[Window] = [
+        (bounds[part], bounds[part + 1] - 1) for part in range(len(bounds) - 1)
+    ]
+    windows.append((bounds[-1], None))
+
+    return windows
+
+
+def full_window(period: Optional[str]) -> Window:
+    """
+    Window open from `period`, or GitHub's launch.
+    """
+    start = GITHUB_EPOCH
+    if period:
+        start = datetime.datetime.strptime(period, "%Y-%m-%dT%H:%M:%SZ").replace(
+            tzinfo=datetime.timezone.utc
+        )
+
+    return int(start.timestamp()), None
+
+
+def candidate_limit(sort: Optional[str], limit: Optional[int]) -> Optional[int]:
+    """
+    Issues to fetch a name for the best `limit` by `sort`, `None` for all.
+
+    Only a sort GitHub orders searches by can stop early, and only while
+    a single search returns the first `limit`: windows are walked oldest
+    first, so past `SEARCH_CAP` every issue is a candidate.
+    """
+    if sort is None:
+        return limit
+
+    if rank.sorts[sort] and limit is not None and limit <= SEARCH_CAP:
+        return limit
+
+    return None
+
+
+def fetch_window(
+    token: Union[str, bool],
+    query: str,
+    variables: Dict,
+    mode: str,
+    window: Window,
+) -> Tuple[List[Window], List[Tuple[List[Issue], int]]]:
+    """
+    Fetch the issues created within `window`, a page at a time.
+
+    Returns the smaller windows to fetch instead when GitHub reports more
+    issues than it will return, unless the window is a single second.
+    """
+    start, end = window
+    base = created_pattern.sub("", variables["searchQuery"])
+    window_variables = {
+        **variables,
+        "searchQuery": f"{base} {window_qualifier(window)}",
+    }
+
+    pages = services.paginate(token, query, window_variables, None)
+    first = next(pages)
+    count: int = first["data"]["search"].get("issueCount") or 0
+
+    if count > SEARCH_CAP and start < (time.time() if end is None else end):
+        pages.close()
+        return split_window(window, count), []
+
+    results = [services.org_user_pipeline(first, mode)]
+    results.extend(services.org_user_pipeline(page, mode) for page in pages)
+
+    return [], results
+
+
+def paginate_windows(
+    token: Union[str, bool],
+    query: str,
+    variables: Dict,
+    limit: Optional[int],
+    mode: str,
+    period: Optional[str] = None,
+    concurrency: int = services.DEFAULT_CONCURRENCY,
+) -> Iterator[Tuple[List[Issue], int]]:
+    """
+    `paginate` for searches matching more issues than GitHub returns.
+
+    Searches are walked as usual while they match up to `SEARCH_CAP`
+    issues. Past that, the search is split into `created:` windows, which
+    are fetched concurrently through `fan_out`, and split again while
+    they are too dense. Issues are yielded once, the first time their URL
+    is seen, until `limit` issues are found.
+    """
+    pages = services.paginate(token, query, variables, limit)
+    first: Optional[Dict] = next(pages, None)
+    if first is None:
+        return
+
+    count: int = first["data"]["search"].get("issueCount") or 0
+
+    if count <= SEARCH_CAP or (limit is not None and limit <= SEARCH_CAP):
+        # A single search, its pages can't repeat an issue.
+        yield services.org_user_pipeline(first, mode)
+        for page in pages:
+            yield services.org_user_pipeline(page, mode)
+        return
+
+    # The windows fetch the issues of the first page again.
+    pages.close()
+
+    seen: Set[str] = set()
+    fetched: int = 0
+
+    def fresh(issues: List[Issue]) -> List[Issue]:
+        nonlocal fetched
+
+        unseen: List[Issue] = []
+        for issue in issues:
+            if issue.url not in seen:
+                seen.add(issue.url)
+                unseen.append(issue)
+
+        if limit is not None:
+            unseen = unseen[: limit - fetched]
+        fetched += len(unseen)
+
+        return unseen
+
+    windows = split_window(full_window(period), count)
+
+    while windows and (limit is None or fetched < limit):
+        dense: List[Window] = []
+        results = services.fan_out(
+            lambda window: fetch_window(token, query, variables, mode, window),
+            windows,
+            concurrency=concurrency,
+        )
+
+        for smaller, window_pages in results:
+            dense.extend(smaller)
+            for issues, rate_limit in window_pages:
+                yield fresh(issues), rate_limit
+
+                if limit is not None and fetched >= limit:
+                    return
+
+        windows = dense
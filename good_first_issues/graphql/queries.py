@@ -1,72 +1,181 @@
 """GraphQL queries"""
 
-core_query = """
-query SearchGoodFirstIssues($searchQuery: String!, $limit: Int!) {
+from typing import Dict, Iterable, List, Optional
+
+# Fields selected for every issue node, shared by the issue searches below.
+issue_fragment: str = """
+fragment IssueFields on Issue {
+  title
+  url
+  createdAt
+  author {
+    login
+  }
+  repository {
+    name
+    owner {
+      login
+    }
+  }
+  labels(first: 3) {
+    nodes {
+      name
+    }
+  }
+  number
+  state
+}
+"""
+
+core_query: str = (
+    """
+query SearchGoodFirstIssues($searchQuery: String!, $limit: Int!, $after: String) {
   rateLimit {
     limit
     cost
     remaining
     resetAt
   }
-  search(query: $searchQuery, type: ISSUE, first: $limit) {
+  search(query: $searchQuery, type: ISSUE, first: $limit, after: $after) {
     issueCount
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
     nodes {
-      ... on Issue {
-        title
-        url
-        createdAt
-        author {
-          login
-        }
-        repository {
-          name
-          owner {
-            login
-          }
-        }
-        labels(first: 3) {
-          nodes {
-            name
-          }
-        }
-        number
-        state
-      }
+      ...IssueFields
     }
   }
 }
 """
+    + issue_fragment
+)
+
+# Batched variant of `core_query`: one aliased `search` field per target.
+# `{variables}` and `{fields}` are filled in by `services.build_batch_query`.
+batch_query: str = """
+query BatchSearchGoodFirstIssues({variables}$limit: Int!) {{
+  rateLimit {{
+    limit
+    cost
+    remaining
+    resetAt
+  }}
+{fields}
+}}
+"""
+
+batch_search_field: str = """
+  {alias}: search(query: ${alias}, type: ISSUE, first: $limit) {{
+    issueCount
+    pageInfo {{
+      hasNextPage
+      endCursor
+    }}
+    nodes {{
+      ...IssueFields
+    }}
+  }}"""
 
-# `first: 2` = Fetch only 2 issues from each repos with the topic hacktoberfest
-search_query: str = """
-query search($queryString: String!){
-  search(type: REPOSITORY, query: $queryString, first: 50) {
+# `$limit` repositories per page, `$issueLimit` issues from each of them.
+search_query: str = (
+    """
+query search($queryString: String!, $limit: Int!, $after: String, $issueLimit: Int!){
+  search(type: REPOSITORY, query: $queryString, first: $limit, after: $after) {
+    repositoryCount
+    pageInfo {
+      hasNextPage
+      endCursor
+    }
     edges {
       node {
         ... on Repository {
           url
-          issues(filterBy: { states: OPEN, labels: "good first issue" }, first: 2) {
+          issues(filterBy: { states: OPEN, labels: "good first issue" }, first: $issueLimit) {
             edges {
-            node {
-                  title
-                  url
-                }
+              node {
+                ...IssueFields
               }
+            }
           }
         }
       }
     }
   }
   rateLimit {
-      remaining
-    }
+    limit
+    cost
+    remaining
+    resetAt
+  }
 }
 """
+    + issue_fragment
+)
+
+# Selection of each `Issue` column, in fragment order.
+issue_columns: Dict[str, str] = {
+    "title": "title",
+    "url": "url",
+    "created_at": "createdAt",
+    "author": "author {\n    login\n  }",
+    "repo": "name",
+    "owner": "owner {\n      login\n    }",
+    "labels": "labels(first: 3) {\n    nodes {\n      name\n    }\n  }",
+    "number": "number",
+    "state": "state",
+}
+
+# Columns selected inside the issue's `repository`.
+repository_columns: List[str] = ["repo", "owner"]
+
+# Columns always fetched, issues are told apart by URL.
+required_columns: List[str] = ["title", "url"]
+
+
+def build_issue_fragment(columns: Iterable[str]) -> str:
+    """
+    `IssueFields` fragment selecting only the given `Issue` columns.
+    """
+    wanted = set(columns).union(required_columns)
+    selections: List[str] = []
+    repository: List[str] = []
+
+    for column, selection in issue_columns.items():
+        if column not in wanted:
+            continue
+
+        if column in repository_columns:
+            if repository:
+                continue
+            repository = [
+                issue_columns[name] for name in repository_columns if name in wanted
+            ]
+            selection = "repository {{\n    {}\n  }}".format("\n    ".join(repository))
+
+        selections.append(selection)
+
+    body = "\n  ".join(selections)
+
+    return f"\nfragment IssueFields on Issue {{\n  {body}\n}}\n"
+
+
+def project(query: str, columns: Optional[Iterable[str]]) -> str:
+    """
+    Narrow the `IssueFields` of a query to `columns`, all of them on `None`.
+    """
+    if columns is None:
+        return query
+
+    return query.replace(issue_fragment, build_issue_fragment(columns))
+
 
 rate_limit_query: str = """
 {
   rateLimit {
+    limit
     remaining
+    resetAt
   }
 }
 """
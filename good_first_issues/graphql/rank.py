@@ -0,0 +1,200 @@
+"""Merging, deduplicating and ranking issues from many searches"""
+
+import heapq
+import itertools
+from typing import (
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from good_first_issues.graphql.models import Issue
+
+# Issues yielded a page at a time, with the remaining rate limit.
+Pages = Iterable[Tuple[List[Issue], Optional[int]]]
+
+# Rank of an issue, smaller ranks first.
+RankKey = Callable[[Issue], Tuple]
+
+# Drops the separators of `createdAt`, leaving digits in time order.
+timestamp_digits = str.maketrans("", "", "-T:Z")
+
+# Sorts for `--sort`, mapped to the search qualifier fetching candidates in
+# that order, when GitHub has one.
+sorts: Dict[str, Optional[str]] = {
+    "recent": "sort:created-desc",
+    "labels": None,
+    "repo": None,
+}
+
+# Columns each sort ranks by, fetched along with the ones shown.
+sort_columns: Dict[str, Tuple[str, ...]] = {
+    "recent": ("created_at",),
+    "labels": ("labels", "created_at"),
+    "repo": ("repo", "owner", "number"),
+}
+
+
+def issue_key(issue: Issue) -> Hashable:
+    """
+    Identity of an issue across searches: its repo and number, else its URL.
+    """
+    if issue.owner and issue.repo and issue.number is not None:
+        return issue.owner.lower(), issue.repo.lower(), issue.number
+
+    return issue.url
+
+
+def recency(issue: Issue) -> int:
+    """
+    Newest first, issues without `created_at` last.
+    """
+    if not issue.created_at:
+        return 0
+
+    return -int(issue.created_at.translate(timestamp_digits))
+
+
+def rank_key(sort: str, labels: Sequence[str] = ()) -> RankKey:
+    """
+    Key ranking issues for `--sort`.
+
+    `recent` puts the newest first. `labels` puts first the issues with
+    the most labels containing one of `labels`, or with the most labels
+    when none are given, then the newest. `repo` orders by owner, repo
+    and issue number.
+    """
+    if sort == "recent":
+        return lambda issue: (recency(issue),)
+
+    if sort == "labels":
+        words = [word.lower() for word in labels]
+
+        def label_rank(issue: Issue) -> Tuple:
+            names = [name.lower() for name in issue.labels]
+            if words:
+                matches = sum(any(word in name for word in words) for name in names)
+            else:
+                matches = len(names)
+            return -matches, recency(issue)
+
+        return label_rank
+
+    if sort == "repo":
+        return lambda issue: (
+            (issue.owner or "").lower(),
+            (issue.repo or "").lower(),
+            issue.number or 0,
+        )
+
+    raise ValueError(f"Unknown sort: {sort}")
+
+
+class Worst:
+    """
+    Heap entry ordered in reverse, so a `heapq` keeps the worst rank on top.
+    """
+
+    __slots__ = ("rank", "key", "issue")
+
+    def __init__(self, rank: Tuple, key: Hashable, issue: Issue):
+        self.rank = rank
+        self.key = key
+        self.issue = issue
+
+    def __lt__(self, other: "Worst") -> bool:
+        return self.rank > other.rank
+
+
+class TopK:
+    """
+    Best `k` distinct issues seen so far, by `key`.
+
+    Holds at most `k` issues: a bounded heap with the worst kept issue on
+    top, replaced whenever a better one comes in. Duplicates are dropped
+    while in the heap, the first one seen is kept. Ties go to the issue
+    seen first. `k=None` keeps every distinct issue.
+    """
+
+    def __init__(self, k: Optional[int], key: RankKey):
+        self.k = k
+        self.key = key
+        self.heap: List[Worst] = []
+        self.members: Set[Hashable] = set()
+        self.order = itertools.count()
+
+    def add(self, issue: Issue):
+        if self.k == 0:
+            return
+
+        rank = (*self.key(issue), next(self.order))
+        full = self.k is not None and len(self.heap) >= self.k
+
+        # Most issues rank below the worst kept one once the heap is full.
+        if full and not rank < self.heap[0].rank:
+            return
+
+        identity = issue_key(issue)
+        if identity in self.members:
+            return
+
+        entry = Worst(rank, identity, issue)
+        self.members.add(identity)
+
+        if full:
+            evicted = heapq.heapreplace(self.heap, entry)
+            self.members.discard(evicted.key)
+        else:
+            heapq.heappush(self.heap, entry)
+
+    def extend(self, issues: Iterable[Issue]):
+        for issue in issues:
+            self.add(issue)
+
+    def result(self) -> List[Issue]:
+        """
+        The issues kept, best first.
+        """
+        return [
+            entry.issue for entry in sorted(self.heap, key=lambda entry: entry.rank)
+        ]
+
+
+def top_k(
+    pages: Pages, k: Optional[int], key: RankKey
+) -> Iterator[Tuple[List[Issue], Optional[int]]]:
+    """
+    Merge `pages` into a single page of the best `k` distinct issues.
+
+    Pages are consumed as they arrive, only `k` issues are held at a time.
+    """
+    top = TopK(k, key)
+    rate_limit: Optional[int] = None
+
+    for issues, rate_limit in pages:
+        top.extend(issues)
+
+    yield top.result(), rate_limit
+
+
+def unique(pages: Pages) -> Iterator[Tuple[List[Issue], Optional[int]]]:
+    """
+    `pages` in fetch order, without the issues already yielded.
+    """
+    seen: Set[Hashable] = set()
+
+    for issues, rate_limit in pages:
+        fresh: List[Issue] = []
+        for issue in issues:
+            identity = issue_key(issue)
+            if identity not in seen:
+                seen.add(identity)
+                fresh.append(issue)
+        yield fresh, rate_limit
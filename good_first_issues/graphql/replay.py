@@ -0,0 +1,139 @@
+"""Transports recording GraphQL exchanges to disk and replaying them"""
+
+import calendar
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Tuple
+
+from requests.models import Response
+
+from good_first_issues.graphql.cache import cache_key
+
+# Response headers kept in recordings.
+RECORDED_HEADERS: Tuple[str, ...] = (
+    "Content-Type",
+    "Retry-After",
+    "X-RateLimit-Limit",
+    "X-RateLimit-Remaining",
+    "X-RateLimit-Reset",
+    "X-RateLimit-Used",
+    "X-RateLimit-Resource",
+)
+
+
+class ReplayMiss(Exception):
+    """
+    No recorded response matches a request.
+    """
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self.path = path
+
+
+def recording_path(directory: str, query: str, variables: Dict) -> str:
+    """
+    Path of the exchange recorded for a query and its variables.
+    """
+    return os.path.join(directory, f"{cache_key(query, variables)}.json")
+
+
+class RecordingTransport:
+    """
+    Wrap a transport and save every exchange in `directory`.
+
+    Exchanges are keyed like the response cache, by the whitespace-
+    normalized query and its variables.
+    """
+
+    requires_token: bool = True
+
+    def __init__(self, directory: str, inner):
+        self.directory = directory
+        self.inner = inner
+
+    def post(
+        self, headers: Dict[str, str], query: str, variables: Dict
+    ) -> Tuple[Response, Dict]:
+        response, payload = self.inner.post(headers, query, variables)
+
+        exchange = {
+            "query": query,
+            "variables": variables,
+            "status": response.status_code,
+            "headers": {
+                name: response.headers[name]
+                for name in RECORDED_HEADERS
+                if name in response.headers
+            },
+            "payload": payload,
+        }
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(exchange, file)
+        os.replace(tmp_path, recording_path(self.directory, query, variables))
+
+        return response, payload
+
+
+class ReplayTransport:
+    """
+    Answer requests from exchanges saved by `RecordingTransport`.
+
+    No token or network is needed. Every answer is delayed by `latency`
+    seconds, and rate limit headers missing from a recording are filled
+    in from the `rateLimit` field of its payload.
+    """
+
+    requires_token: bool = False
+
+    def __init__(self, directory: str, latency: float = 0.0):
+        self.directory = directory
+        self.latency = latency
+
+    def post(
+        self, headers: Dict[str, str], query: str, variables: Dict
+    ) -> Tuple[Response, Dict]:
+        path = recording_path(self.directory, query, variables)
+
+        try:
+            with open(path) as file:
+                exchange: Dict = json.load(file)
+        except (OSError, ValueError):
+            raise ReplayMiss(path)
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        payload: Dict = exchange.get("payload") or {}
+
+        response = Response()
+        response.status_code = exchange.get("status", 200)
+        response.url = f"file://{path}"
+        response.headers.update(rate_limit_headers(payload))
+        response.headers.update(exchange.get("headers") or {})
+        response._content = json.dumps(payload).encode()
+
+        return response, payload
+
+
+def rate_limit_headers(payload: Dict) -> Dict[str, str]:
+    """
+    `X-RateLimit-*` headers matching the `rateLimit` field of a payload.
+    """
+    rate_limit: Dict = (payload.get("data") or {}).get("rateLimit") or {}
+    headers: Dict[str, str] = {}
+
+    if rate_limit.get("limit") is not None:
+        headers["X-RateLimit-Limit"] = str(rate_limit["limit"])
+    if rate_limit.get("remaining") is not None:
+        headers["X-RateLimit-Remaining"] = str(rate_limit["remaining"])
+    if rate_limit.get("resetAt"):
+        reset = time.strptime(rate_limit["resetAt"], "%Y-%m-%dT%H:%M:%SZ")
+        headers["X-RateLimit-Reset"] = str(calendar.timegm(reset))
+
+    return headers
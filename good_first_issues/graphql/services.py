@@ -1,7 +1,25 @@
 """Services for GraphQL mode"""
 
+import datetime
+import math
+import os
+import random
 import sys
-from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 import requests
 from halo import Halo
@@ -10,15 +28,109 @@ from requests.models import Response
 from rich.console import Console
 from urllib3.util.retry import Retry
 
-from good_first_issues.graphql.queries import core_query, search_query
+from good_first_issues import trace
+from good_first_issues.graphql import rank
+from good_first_issues.graphql.cache import MemoryCache, ResponseCache
+from good_first_issues.graphql.models import Issue
+from good_first_issues.graphql.queries import (
+    batch_query,
+    batch_search_field,
+    core_query,
+    issue_fragment,
+    project,
+    search_query,
+)
+from good_first_issues.graphql.replay import (
+    RecordingTransport,
+    ReplayMiss,
+    ReplayTransport,
+)
 
 # Initializations
 console = Console(color_system="auto")
-spinner: Halo = Halo(text="Looking for good first issues...", spinner="dots")
+
+# Consulted by `caller` when set, `gfi search` sets it unless `--no-cache`,
+# `gfi serve` to a `MemoryCache`.
+response_cache: Optional[Union[ResponseCache, MemoryCache]] = None
+
+# Type Aliases
+BaseIssueEdges = Iterator[List[Dict[str, Dict]]]
+ExtractedRepoIssues = Tuple[List[Issue], int]
+
+# Search qualifiers for open good first issues.
+BASE_SEARCH: str = 'label:"good first issue" is:open is:issue'
+
+# GitHub caps the `first` argument of a connection at 100 nodes.
+PAGE_SIZE: int = 100
+
+# GitHub rejects documents that could return more than 500,000 nodes.
+MAX_NODES: int = 500_000
+
+# Nodes requested per issue by `IssueFields`: the issue and `labels(first: 3)`.
+NODES_PER_ISSUE: int = 4
+
+# Upper bound on aliased searches per batched document.
+MAX_BATCH_ALIASES: int = 50
+
+# Good first issues fetched from each repository with `--hacktoberfest`.
+DEFAULT_ISSUES_PER_REPO: int = 2
+
+# Floor on the expected issues per repository when sizing repository pages,
+# most hacktoberfest repositories have no good first issues at all.
+MIN_ISSUES_PER_REPO: float = 0.1
+
+# Requests kept in flight by `fan_out` unless told otherwise.
+DEFAULT_CONCURRENCY: int = 4
+
+GRAPHQL_URL: str = "https://api.github.com/graphql"
+
+# Connections kept alive by the shared transport.
+POOL_SIZE: int = 32
+
+# Longest pause, in seconds, for the rate limit to reset before giving up.
+DEFAULT_MAX_WAIT: float = 5 * 60
+
+# Requests are paced once the remaining budget drops below this share of it.
+THROTTLE_BELOW: float = 0.1
+
+# Seconds to connect and to wait for a response, a page of issues with
+# labels can take GitHub well over ten seconds to resolve.
+CONNECT_TIMEOUT: float = 10
+READ_TIMEOUT: float = 30
+
+# Tries per request before a transient failure is reported.
+MAX_ATTEMPTS: int = 5
+
+# Retry `n` sleeps up to `BACKOFF_BASE * 2**n` seconds, capped at `MAX_BACKOFF`.
+BACKOFF_BASE: float = 1.0
+MAX_BACKOFF: float = 60.0
+
+# Server errors worth retrying, GitHub answers 502 and 504 to timed out queries.
+RETRY_STATUSES: Tuple[int, ...] = (500, 502, 503, 504)
+
+# GitHub asks for at least a minute between secondary rate limit retries.
+SECONDARY_RATE_LIMIT_WAIT: float = 60
+
+# GraphQL error types meaning a query asked for too much at once.
+TOO_LARGE_ERRORS: Tuple[str, ...] = (
+    "MAX_NODE_LIMIT_EXCEEDED",
+    "RESOURCE_LIMITS_EXCEEDED",
+)
 
 # Type Aliases
-BaseIssueEdges = Iterator[Dict[str, Dict[str, str]]]
-ExtractedRepoIssues = Tuple[List[Tuple[Optional[str], Optional[str]]], int]
+BatchDocument = Tuple[str, Dict, List[str]]
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+def fail_spinner():
+    """
+    Mark the step in progress as failed.
+
+    Constructing `Halo` probes for IPython, which is slow to import, so the
+    spinner is only created once a request fails.
+    """
+    Halo(text="Looking for good first issues...", spinner="dots").fail("Error")
 
 
 # Custom Error Class.
@@ -26,22 +138,352 @@ class NoToken(Exception):
     pass
 
 
-def org_user_pipeline(payload: Dict, mode: str) -> Tuple[Iterable, int]:
+class RateLimitExhausted(Exception):
+    def __init__(self, reset_at: float):
+        super().__init__(reset_at)
+        self.reset_at = reset_at
+
+
+class GraphQLError(Exception):
+    def __init__(self, errors: List[Dict]):
+        super().__init__(errors[0].get("message"))
+        self.errors = errors
+
+
+class QueryTooLarge(Exception):
+    """
+    A page timed out or hit GitHub's resource limits, a smaller one may not.
+    """
+
+
+def estimate_cost(query: str, variables: Dict) -> int:
+    """
+    Estimate the rate limit points GitHub charges for a query.
+
+    GitHub charges a point per 100 connection requests: one for every
+    `search` field, plus the `issues` and `labels` requests made for the
+    nodes it returns. Queries cost at least a point.
+    """
+    searches: int = query.count("search(")
+    nodes: int = variables.get("limit") or PAGE_SIZE
+    per_node: int = 0
+
+    if "issues(" in query:
+        # One `issues` request per repository, one `labels` per issue.
+        per_node = 1
+        if "labels(" in query:
+            per_node += variables.get("issueLimit", 0)
+    elif "labels(" in query:
+        per_node = 1
+
+    return max(1, round(searches * (1 + nodes * per_node) / 100))
+
+
+class RateLimitScheduler:
+    """
+    Keep requests within the GraphQL rate limit budget.
+
+    The budget is tracked from the `rateLimit` field of every response.
+    Requests reserve their estimated cost before they are sent, are paced
+    once the budget runs low, and wait for `resetAt` when it is spent.
+    `RateLimitExhausted` is raised instead when the reset is further away
+    than `max_wait` seconds.
+    """
+
+    def __init__(
+        self,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        throttle_below: float = THROTTLE_BELOW,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.max_wait = max_wait
+        self.throttle_below = throttle_below
+        self.clock = clock
+        self.sleep = sleep
+        self.lock = threading.Lock()
+
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.reserved: int = 0
+
+    def update(self, payload: Dict):
+        """
+        Record the budget reported by a response.
+        """
+        rate_limit: Dict = (payload.get("data") or {}).get("rateLimit") or {}
+
+        with self.lock:
+            if rate_limit.get("limit") is not None:
+                self.limit = rate_limit["limit"]
+            if rate_limit.get("remaining") is not None:
+                self.remaining = rate_limit["remaining"]
+            if rate_limit.get("resetAt"):
+                self.reset_at = (
+                    datetime.datetime.strptime(
+                        rate_limit["resetAt"], "%Y-%m-%dT%H:%M:%SZ"
+                    )
+                    .replace(tzinfo=datetime.timezone.utc)
+                    .timestamp()
+                )
+
+    def acquire(self, cost: int) -> int:
+        """
+        Reserve `cost` points, waiting for them if needed.
+
+        Returns the points reserved, hand them back with `release`.
+        """
+        while True:
+            with self.lock:
+                now = self.clock()
+
+                if self.reset_at is not None and now >= self.reset_at:
+                    # Budget replenished, the next response reports it.
+                    self.remaining, self.reset_at = self.limit, None
+
+                reset_in = max(0.0, (self.reset_at or now) - now)
+                available = (self.remaining or 0) - self.reserved
+
+                if self.remaining is None or self.reset_at is None or available >= cost:
+                    self.reserved += cost
+                    break
+
+                if reset_in > self.max_wait:
+                    raise RateLimitExhausted(self.reset_at)
+
+            console.print(
+                f"Rate limit spent, waiting {reset_in:.0f}s for it to reset.:hourglass:",
+                style="bold yellow",
+            )
+            self.sleep(reset_in + 1)
+
+        if (
+            self.limit
+            and self.remaining is not None
+            and self.reset_at is not None
+            and self.remaining < self.limit * self.throttle_below
+        ):
+            # Spread what is left of the budget until the reset.
+            self.sleep(reset_in / max(1, available // cost))
+
+        return cost
+
+    def release(self, cost: int):
+        """
+        Hand back points reserved by `acquire` once the response is in.
+        """
+        with self.lock:
+            self.reserved -= cost
+
+    def exhaust(self, reset_at: float):
+        """
+        Record a budget GitHub reported spent until `reset_at`.
+        """
+        with self.lock:
+            self.remaining, self.reset_at = 0, reset_at
+
+
+# Shared by every `caller`, budget is tracked across the whole process.
+scheduler = RateLimitScheduler()
+
+
+class TokenPool:
+    """
+    Spread requests over several tokens, each with its own budget.
+
+    Every token has a `RateLimitScheduler` fed from its own responses.
+    Requests go to the token with the most points left, so spent tokens
+    are skipped until they reset. Once every token is spent, requests
+    wait for the one resetting first.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[str],
+        max_wait: float = DEFAULT_MAX_WAIT,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.schedulers: Dict[str, RateLimitScheduler] = {
+            token: RateLimitScheduler(max_wait, clock=clock, sleep=sleep)
+            for token in tokens
+        }
+
+    def headroom(self, token: str, now: float) -> Tuple[float, int]:
+        """
+        Points `token` can still spend, then fewest requests in flight.
+
+        Tokens without a response yet, or past their reset, count as full.
+        """
+        budget = self.schedulers[token]
+        if (
+            budget.remaining is None
+            or budget.reset_at is None
+            or now >= budget.reset_at
+        ):
+            return math.inf, -budget.reserved
+
+        return budget.remaining - budget.reserved, -budget.reserved
+
+    def choose(self, cost: int) -> Tuple[str, RateLimitScheduler]:
+        """
+        Token to send a request costing `cost` points with, and its budget.
+        """
+        with self.lock:
+            now = self.clock()
+            token = max(self.schedulers, key=lambda token: self.headroom(token, now))
+
+            if self.headroom(token, now)[0] < cost:
+                # All spent, `acquire` waits for this one to reset.
+                token = min(
+                    self.schedulers,
+                    key=lambda token: self.schedulers[token].reset_at or now,
+                )
+
+        return token, self.schedulers[token]
+
+
+# Set by `use_tokens` when more than one token is configured.
+token_pool: Optional[TokenPool] = None
+
+
+def use_tokens(tokens: Sequence[str]) -> Union[str, bool]:
+    """
+    Spread requests over `tokens` when there are several of them.
+
+    Returns the token to hand to `caller`, `False` when there is none.
+    Call it after setting `scheduler.max_wait`, the pool inherits it.
+    """
+    global token_pool
+
+    token_pool = None
+    if len(tokens) > 1:
+        token_pool = TokenPool(tokens, max_wait=scheduler.max_wait)
+
+    return tokens[0] if tokens else False
+
+
+def current_scheduler() -> RateLimitScheduler:
+    """
+    Budget the next request will be charged to.
+    """
+    if token_pool is None:
+        return scheduler
+
+    return token_pool.choose(1)[1]
+
+
+class Transport:
+    """
+    Long-lived HTTP session for GitHub GraphQL calls.
+
+    Connections are pooled and kept alive, so requests after the first
+    skip the TCP and TLS handshakes. Only failed connections are retried
+    here, `execute` decides what to do with error responses. Safe to
+    share between `fan_out` threads.
+    """
+
+    requires_token: bool = True
+
+    def __init__(
+        self,
+        url: str = GRAPHQL_URL,
+        pool_size: int = POOL_SIZE,
+        timeout: Tuple[float, float] = (CONNECT_TIMEOUT, READ_TIMEOUT),
+    ):
+        self.url = url
+        self.timeout = timeout
+        self.session = requests.Session()
+
+        # Nothing was sent when a connection fails, so it is safe to redo.
+        retries = Retry(total=3, read=False, backoff_factor=0.3)
+        adapter = HTTPAdapter(pool_maxsize=pool_size, max_retries=retries)
+
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def post(
+        self, headers: Dict[str, str], query: str, variables: Dict
+    ) -> Tuple[Response, Dict]:
+        """
+        Send a query, returns the response with its body decoded once.
+
+        Bodies that are not JSON, like HTML error pages, decode to `{}`.
+        """
+        response: Response = self.session.post(
+            self.url,
+            headers=headers,
+            json={
+                "query": query,
+                "variables": variables,
+            },
+            timeout=self.timeout,
+        )
+
+        try:
+            with trace.phase("decode"):
+                payload: Dict = response.json()
+        except ValueError:
+            payload = {}
+
+        return response, payload
+
+
+transport: Optional[Transport] = None
+transport_lock = threading.Lock()
+
+
+def make_transport() -> Union[Transport, RecordingTransport, ReplayTransport]:
+    """
+    Build the transport selected by the environment.
+
+    `GFI_REPLAY=<dir>` answers from exchanges recorded in `dir`, delayed
+    by `GFI_REPLAY_LATENCY` seconds, without a token or network.
+    `GFI_RECORD=<dir>` calls GitHub and records every exchange in `dir`.
+    """
+    replay_dir: Optional[str] = os.environ.get("GFI_REPLAY")
+    if replay_dir:
+        latency = float(os.environ.get("GFI_REPLAY_LATENCY") or 0)
+        return ReplayTransport(replay_dir, latency=latency)
+
+    record_dir: Optional[str] = os.environ.get("GFI_RECORD")
+    if record_dir:
+        return RecordingTransport(record_dir, Transport())
+
+    return Transport()
+
+
+def get_transport() -> Transport:
+    """
+    Return the process-wide transport, created on first use.
+    """
+    global transport
+
+    with transport_lock:
+        if transport is None:
+            transport = make_transport()
+
+    return transport
+
+
+def org_user_pipeline(
+    payload: Dict, mode: str, alias: str = "search"
+) -> Tuple[List[Issue], int]:
     """
     Extract issues related to organization or a user.
+
+    `alias` selects the target's `search` field in a batched payload.
     """
-    base_data: List = payload.get("data").get("search").get("nodes")
+    base_data: List = payload.get("data").get(alias).get("nodes")
 
     # Extract rate limit value.
     rate_limit: int = payload["data"].get("rateLimit").get("remaining")
 
-    spinner.start()
-
-    # Generator pipeline: Extract issue title and url.
-    # pipeline: Iterable = get_issues(get_base_issues(base_data))
-    issues = [(data.get("title"), data.get("url")) for data in base_data]
-
-    spinner.succeed("Search Complete.")
+    with trace.phase("extraction"):
+        issues = [Issue.from_node(node) for node in base_data if node]
 
     return issues, rate_limit
 
@@ -58,14 +500,13 @@ def get_base_issues(data: List) -> BaseIssueEdges:
             yield edges
 
 
-def get_issues(issues: BaseIssueEdges) -> Iterator[Tuple[str, str]]:
+def get_issues(issues: BaseIssueEdges) -> Iterator[Issue]:
     """
-    Extracts issue title and URL from the payload.
+    Extracts issues from the payload.
     """
-    flat_list: List = [item for sublist in issues for item in sublist]
-
-    for issue in flat_list:
-        yield issue.get("node").get("title"), issue.get("node").get("url")
+    for edges in issues:
+        for edge in edges:
+            yield Issue.from_node(edge.get("node"))
 
 
 def extract_repo_issues(
@@ -75,28 +516,19 @@ def extract_repo_issues(
     Extract issues with repo name specified.
     """
     # Type Aliases
-    BaseData = Optional[Iterable[Dict[str, Dict[str, str]]]]
-    IssueData = Tuple[Optional[str], Optional[str]]
+    BaseData = Optional[Iterable[Dict[str, Dict]]]
 
     base_data: BaseData = payload["data"].get("repository").get("issues").get("edges")
 
     rate_limit: int = payload["data"].get("rateLimit").get("remaining")
 
-    issues = []
-
-    if base_data:
-        for issue in base_data:
-            issue_data: IssueData = (
-                issue["node"].get("title"),
-                issue["node"].get("url"),
-            )
-
-            issues.append(issue_data)
+    with trace.phase("extraction"):
+        issues = [Issue.from_node(issue["node"]) for issue in base_data or ()]
 
     return issues, rate_limit
 
 
-def extract_search_results(payload: Dict) -> Tuple[Iterable, int]:
+def extract_search_results(payload: Dict) -> Tuple[List[Issue], int]:
     """
     Extract issues based on search query.
     """
@@ -106,53 +538,89 @@ def extract_search_results(payload: Dict) -> Tuple[Iterable, int]:
     # Extract rate limit value.
     rate_limit: int = payload["data"].get("rateLimit").get("remaining")
 
-    spinner.start()
+    # Generator pipeline: Extract issues.
+    pipeline: Iterable[Issue] = get_issues(get_base_issues(base_data))
+
+    with trace.phase("extraction"):
+        issues = list(pipeline)
+
+    return issues, rate_limit
+
+
+def identify_target(name: str, repo: str, user: bool) -> Tuple[str, str]:
+    """
+    Identify the search qualifier and mode of an organization, user or repo.
+    """
+    if name and repo:
+        # If CLI gets the --repo flag, with or without --user, look into that particular repo.
+        return f"repo:{name}/{repo}", "repo"
+
+    if name and user:
+        # If CLI gets --user flag, looks into user repos.
+        return f"user:{name}", "user"
+
+    # if CLI gets not flag, defaults to looking into org repos.
+    return f"org:{name}", "org"
+
+
+def parse_target(entry: str, repo: Optional[str] = None, user: bool = False) -> str:
+    """
+    Search qualifier of a `--targets-file` entry.
+
+    Entries are `org:name`, `user:name`, `repo:owner/name`, `owner/name`
+    for a repo, or a bare name read like a `gfi search` argument.
+    """
+    entry = entry.strip()
+
+    if entry.startswith(("org:", "user:", "repo:")):
+        return entry
+
+    if "/" in entry:
+        return f"repo:{entry}"
+
+    return identify_target(entry, repo, user)[0]
+
+
+def search_string(
+    target: str, period: Optional[str], sort: Optional[str] = None
+) -> str:
+    """
+    `search` query string for the open good first issues of a qualifier.
+
+    `sort` asks GitHub for the issues in `--sort` order, when it can.
+    """
+    search = f"{target} {BASE_SEARCH}"
 
-    # Generator pipeline: Extract issue title and url.
-    pipeline: Iterable = get_issues(get_base_issues(base_data))
+    if period:
+        search = f"{search} created:>={period}"
 
-    spinner.succeed("Search Complete.")
+    if sort and rank.sorts.get(sort):
+        search = f"{search} {rank.sorts[sort]}"
 
-    return list(pipeline), rate_limit
+    return search
 
 
 def identify_mode(
-    name: str, repo: str, user: bool, hacktoberfest: bool, period: str, limit: int
+    name: str,
+    repo: str,
+    user: bool,
+    hacktoberfest: bool,
+    period: str,
+    limit: int,
+    columns: Optional[Sequence[str]] = None,
+    sort: Optional[str] = None,
 ) -> Tuple[str, Dict, str]:
     """
     Identify the mode based on arguments passed.
 
     Used for selecting:
-    1. query to use
+    1. query to use, selecting only `columns` of each issue when given
     2. variables for the query
     3. function(mode) to pass the above values to
     """
     variables: Dict = {"limit": limit}
 
-    base_variable = 'label:"good first issue" is:open is:issue'
-
-    if period:
-        base_variable = f"{base_variable} created:>={period}"
-
-    if name and user and repo:
-        # If CLI gets the --user flag along with the --repo flag, look into that particular repo.
-        query = core_query
-        variables["searchQuery"] = f"repo:{name}/{repo} {base_variable}"
-        mode: str = "repo"
-
-    elif name and repo:
-        # If CLI gets the --repo flag, looking into that particular repo.
-        query = core_query
-        variables["searchQuery"] = f"repo:{name}/{repo} {base_variable}"
-        mode = "repo"
-
-    elif name and user:
-        # If CLI gets --user flag, looks into user repos.
-        query = core_query
-        variables["searchQuery"] = f"user:{name} {base_variable}"
-        mode = "user"
-
-    elif hacktoberfest:
+    if hacktoberfest and not (name and (repo or user)):
         # If hacktoberfest flag is passed, get the repos with topic hacktoberfest and their issues.
         query = search_query
         search_query_var = "topic:hacktoberfest"
@@ -162,68 +630,468 @@ def identify_mode(
         mode = "search"
 
     else:
-        # if CLI gets not flag, defaults to looking into org repos.
         query = core_query
-        variables["searchQuery"] = f"org:{name} {base_variable}"
-        mode = "org"
+        target, mode = identify_target(name, repo, user)
+        variables["searchQuery"] = search_string(target, period, sort)
 
-    return query, variables, mode
+    return project(query, columns), variables, mode
 
 
-def caller(token: Union[str, bool], query: str, variables: Dict) -> Dict:
+def build_batch_query(
+    aliases: List[str], columns: Optional[Sequence[str]] = None
+) -> str:
     """
-    Call the GitHub GraphQL API.
+    Build a single document with one aliased `search` field per alias.
+    """
+    variables = "".join(f"${alias}: String!, " for alias in aliases)
+    fields = "".join(batch_search_field.format(alias=alias) for alias in aliases)
+    fragment = project(issue_fragment, columns)
+
+    return batch_query.format(variables=variables, fields=fields) + fragment
+
+
+def identify_batch_mode(
+    names: Iterable[str],
+    repo: str,
+    user: bool,
+    period: str,
+    limit: Optional[int],
+    columns: Optional[Sequence[str]] = None,
+    sort: Optional[str] = None,
+) -> Tuple[List[BatchDocument], str]:
+    """
+    Identify the mode for many targets and batch their searches.
 
-    Retries if the status codes on `status_forcelist` is returned
-    from the server.
+    Returns the aliased documents, chunked to stay under GitHub's node
+    limit, along with the mode shared by all the targets.
+    """
+    searches: List[str] = []
+    mode: str = "org"
 
-    > Centralized requests handler, all network exceptions captured here.
+    for name in names:
+        target, mode = identify_target(name, repo, user)
+        searches.append(search_string(target, period, sort))
+
+    return batch_documents(searches, limit, columns), mode
+
+
+def batch_documents(
+    searches: Sequence[str],
+    limit: Optional[int],
+    columns: Optional[Sequence[str]] = None,
+) -> List[BatchDocument]:
     """
-    try:
-        request_headers: Dict[str, str] = dict()
+    Aliased documents running `searches`, chunked to stay under GitHub's
+    node limit. Alias `t<n>` runs `searches[n]`. None for `limit=0`.
+    """
+    if limit == 0:
+        return []
 
-        if not token:
-            raise NoToken()
-        else:
-            request_headers["Authorization"] = f"token {token}"
+    page_size = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit)
 
-        s = requests.Session()
+    # Without labels, an issue is a single node.
+    nodes_per_issue = NODES_PER_ISSUE if columns is None or "labels" in columns else 1
+    chunk_size = max(
+        1, min(MAX_BATCH_ALIASES, MAX_NODES // (page_size * nodes_per_issue))
+    )
+    documents: List[BatchDocument] = []
 
-        # Retry factors
-        retries = Retry(
-            total=5,
-            backoff_factor=0.3,
-            status_forcelist=[500, 502, 503, 504],
-            allowed_methods=(["POST"]),
-        )
+    for start in range(0, len(searches), chunk_size):
+        chunk = searches[start : start + chunk_size]
+        aliases = [f"t{index}" for index in range(start, start + len(chunk))]
+        variables = {"limit": page_size, **dict(zip(aliases, chunk))}
 
-        s.mount("https://", HTTPAdapter(max_retries=retries))
+        documents.append((build_batch_query(aliases, columns), variables, aliases))
 
-        # API Call
-        response: Response = s.post(
-            "https://api.github.com/graphql",
-            headers=request_headers,
-            json={
-                "query": query,
-                "variables": variables,
+    return documents
+
+
+def split_document(
+    document: BatchDocument, columns: Optional[Sequence[str]] = None
+) -> List[BatchDocument]:
+    """
+    Smaller documents running the searches of `document`: its aliases
+    split in two halves, or a lone alias asking for half the page.
+    """
+    query, variables, aliases = document
+
+    if len(aliases) == 1:
+        return [
+            (query, {**variables, "limit": max(1, variables["limit"] // 2)}, aliases)
+        ]
+
+    middle = len(aliases) // 2
+    return [
+        (
+            build_batch_query(half, columns),
+            {
+                "limit": variables["limit"],
+                **{alias: variables[alias] for alias in half},
             },
-            timeout=20,
+            half,
+        )
+        for half in (aliases[:middle], aliases[middle:])
+    ]
+
+
+def fetch_batch(
+    token: Union[str, bool],
+    document: BatchDocument,
+    mode: str,
+    limit: Optional[int],
+    columns: Optional[Sequence[str]] = None,
+) -> Tuple[List[List[Issue]], int]:
+    """
+    Fetch a batched document and split the issues back out per target.
+
+    Targets with more results than the first page are paginated with
+    `core_query`, narrowed to the same `columns`, from the cursor the
+    batch returned.
+
+    A document too large for GitHub to resolve is fetched again as two
+    halves, see `split_document`, until a single search at a single
+    issue a page is left.
+    """
+    query, variables, aliases = document
+    results: List[List[Issue]] = []
+    rate_limit: int = 0
+
+    try:
+        payload: Dict = caller(
+            token,
+            query,
+            variables,
+            shrinkable=len(aliases) > 1 or variables["limit"] > 1,
         )
+    except QueryTooLarge:
+        for smaller in split_document(document, columns):
+            part, rate_limit = fetch_batch(token, smaller, mode, limit, columns)
+            results.extend(part)
+        return results, rate_limit
+
+    for alias in aliases:
+        issues, rate_limit = org_user_pipeline(payload, mode, alias)
+        page_info: Dict = payload["data"].get(alias).get("pageInfo")
+
+        if page_info.get("hasNextPage") and (limit is None or len(issues) < limit):
+            rest = {"searchQuery": variables[alias], "after": page_info["endCursor"]}
+            remaining = None if limit is None else limit - len(issues)
+
+            for page in paginate(token, project(core_query, columns), rest, remaining):
+                page_issues, rate_limit = org_user_pipeline(page, mode)
+                issues.extend(page_issues)
+
+        results.append(issues)
+
+    return results, rate_limit
+
+
+def fan_out(
+    func: Callable[[T], R],
+    items: Iterable[T],
+    concurrency: int = DEFAULT_CONCURRENCY,
+) -> Iterator[R]:
+    """
+    Run `func` over `items` with at most `concurrency` calls in flight.
+
+    Results are yielded in the order of `items`. Errors, including the
+    `SystemExit` raised by `caller`, surface when their result is reached
+    and cancel the calls that have not started yet.
+    """
+    if concurrency <= 1:
+        yield from map(func, items)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    try:
+        yield from executor.map(func, items)
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def paginate(
+    token: Union[str, bool], query: str, variables: Dict, limit: Optional[int]
+) -> Iterator[Dict]:
+    """
+    Walk the `search` connection of `core_query` using `endCursor`.
+
+    Yields the payload of every page until `limit` issues are fetched or
+    GitHub reports no further pages. `limit=None` walks all the pages.
+
+    A page too large for GitHub to resolve is asked for again at half the
+    size, and the pages after it keep the smaller size.
+    """
+    variables = dict(variables)
+    fetched: int = 0
+    max_page: int = PAGE_SIZE
+
+    while limit is None or fetched < limit:
+        page_size = max_page if limit is None else min(max_page, limit - fetched)
+        variables["limit"] = page_size
+
+        try:
+            payload: Dict = caller(token, query, variables, shrinkable=page_size > 1)
+        except QueryTooLarge:
+            # Ask again for half as much, later pages keep the smaller size.
+            max_page = max(1, page_size // 2)
+            continue
+
+        yield payload
 
-        # Check for erros in GraphQL response.
-        if "errors" in response.json():
-            raise Exception()
+        search: Dict = payload["data"].get("search")
+        fetched += len(search.get("nodes"))
+        page_info: Dict = search.get("pageInfo")
 
-        response.raise_for_status()
+        if not page_info.get("hasNextPage"):
+            break
+
+        variables["after"] = page_info.get("endCursor")
+
+
+def paginate_repositories(
+    token: Union[str, bool],
+    query: str,
+    variables: Dict,
+    limit: Optional[int],
+    issues_per_repo: int = DEFAULT_ISSUES_PER_REPO,
+) -> Iterator[Tuple[List[Issue], int]]:
+    """
+    Walk the repositories of `search_query` using `endCursor`.
 
+    Yields the issues of every page with the remaining rate limit, until
+    `limit` issues are found or GitHub reports no further pages.
+
+    Pages are sized to the issues still needed: `issues_per_repo` a repo
+    at first, then the share of repos that turned out to have issues.
+    `limit=None` walks all the pages in full. Pages too large for GitHub
+    are halved like in `paginate`.
+    """
+    variables = dict(variables)
+    variables["issueLimit"] = issues_per_repo
+    fetched: int = 0
+    repos_seen: int = 0
+    max_page: int = PAGE_SIZE
+
+    while limit is None or fetched < limit:
+        if limit is None:
+            page_size = max_page
+        else:
+            per_repo = fetched / repos_seen if repos_seen else issues_per_repo
+            page_size = math.ceil(
+                (limit - fetched) / max(per_repo, MIN_ISSUES_PER_REPO)
+            )
+            page_size = max(1, min(max_page, page_size))
+        variables["limit"] = page_size
+
+        try:
+            payload: Dict = caller(token, query, variables, shrinkable=page_size > 1)
+        except QueryTooLarge:
+            max_page = max(1, page_size // 2)
+            continue
+
+        issues, rate_limit = extract_search_results(payload)
+
+        if limit is not None:
+            issues = issues[: limit - fetched]
+
+        yield issues, rate_limit
+
+        search: Dict = payload["data"].get("search")
+        fetched += len(issues)
+        repos_seen += len(search.get("edges"))
+        page_info: Dict = search.get("pageInfo")
+
+        if not page_info.get("hasNextPage"):
+            break
+
+        variables["after"] = page_info.get("endCursor")
+
+
+def retry_delay(attempt: int) -> float:
+    """
+    Full jitter backoff before retry number `attempt`, counting from 0.
+    """
+    return random.uniform(0, min(MAX_BACKOFF, BACKOFF_BASE * 2**attempt))
+
+
+def too_large(errors: List[Dict]) -> bool:
+    """
+    Whether GraphQL `errors` say the query was too expensive to resolve.
+    """
+    return any(
+        error.get("type") in TOO_LARGE_ERRORS
+        or "timeout" in str(error.get("message", "")).lower()
+        for error in errors
+    )
+
+
+def retry_after(
+    response: Response,
+    payload: Dict,
+    attempt: int,
+    budget: Optional[RateLimitScheduler] = None,
+) -> Optional[float]:
+    """
+    Seconds to wait before retrying a failed request, `None` if it won't help.
+
+    `Retry-After` is honored, a spent primary rate limit waits for
+    `X-RateLimit-Reset`, secondary rate limits and server errors back off.
+    A spent primary rate limit without `X-RateLimit-Reset` backs off like
+    a secondary one.
+    With a `token_pool`, a spent token is marked as such in its `budget`
+    and the request is retried right away with another one.
+    Raises `RateLimitExhausted` when the wait is longer than `max_wait`.
+    """
+    budget = budget or scheduler
+    errors: List[Dict] = payload.get("errors") or []
+    limited: bool = any(error.get("type") == "RATE_LIMITED" for error in errors) or (
+        response.status_code in (403, 429)
+        and "rate limit" in str(payload.get("message", "")).lower()
+    )
+    headers = response.headers
+    wait: Optional[float] = None
+
+    if headers.get("Retry-After", "").isdigit():
+        wait = float(headers["Retry-After"])
+    elif (
+        limited
+        and headers.get("X-RateLimit-Remaining") == "0"
+        and headers.get("X-RateLimit-Reset", "").isdigit()
+    ):
+        reset_at = float(headers["X-RateLimit-Reset"])
+        if token_pool is not None:
+            budget.exhaust(reset_at)
+            wait = 0.0
+        else:
+            wait = reset_at - budget.clock()
+    elif limited:
+        wait = max(SECONDARY_RATE_LIMIT_WAIT, retry_delay(attempt))
+    elif response.status_code in RETRY_STATUSES:
+        wait = retry_delay(attempt)
+
+    if wait is None:
+        return None
+
+    if wait > budget.max_wait:
+        raise RateLimitExhausted(budget.clock() + wait)
+
+    return max(0.0, wait)
+
+
+def execute(
+    token: Union[str, bool], query: str, variables: Dict, shrinkable: bool = False
+) -> Dict:
+    """
+    Send a query, retrying what is worth retrying, and return its payload.
+
+    Failed connections, server errors and rate limits are retried up to
+    `MAX_ATTEMPTS` times, see `retry_after`. With `shrinkable`, a page
+    that times out or exceeds GitHub's resource limits raises
+    `QueryTooLarge` straight away, so the caller can ask for less.
+
+    Every attempt is sent with the token of `token_pool` that has the
+    most headroom, when there is a pool.
+
+    Raises `GraphQLError`, `requests` exceptions and `RateLimitExhausted`
+    for failures that persist.
+    """
+    if not token and get_transport().requires_token:
+        raise NoToken()
+
+    cost: int = estimate_cost(query, variables)
+    attempt: int = 0
+
+    while True:
+        last: bool = attempt == MAX_ATTEMPTS - 1
+        response: Optional[Response] = None
+        payload: Dict = {}
+
+        budget: RateLimitScheduler = scheduler
+        if token_pool is not None:
+            token, budget = token_pool.choose(cost)
+        headers: Dict[str, str] = {"Authorization": f"token {token}"}
+
+        # Wait for budget before spending it.
+        with trace.phase("rate limit"):
+            reserved: int = budget.acquire(cost)
+
+        try:
+            with trace.phase("network"):
+                response, payload = get_transport().post(headers, query, variables)
+        except (
+            requests.exceptions.ConnectionError,
+            requests.exceptions.Timeout,
+        ) as error:
+            if shrinkable and isinstance(error, requests.exceptions.ReadTimeout):
+                raise QueryTooLarge() from error
+            if last:
+                raise
+        finally:
+            budget.release(reserved)
+
+        if response is None:
+            wait: Optional[float] = retry_delay(attempt)
+        else:
+            if trace.tracer is not None:
+                trace.request(payload, len(response.content))
+
+            errors: List[Dict] = payload.get("errors") or []
+            if response.ok and not errors:
+                budget.update(payload)
+                return payload
+
+            if shrinkable and (response.status_code in (502, 504) or too_large(errors)):
+                raise QueryTooLarge()
+
+            wait = None if last else retry_after(response, payload, attempt, budget)
+            if wait is None:
+                if errors:
+                    raise GraphQLError(errors)
+                raise requests.exceptions.HTTPError(
+                    payload.get("message") or response.reason, response=response
+                )
+
+        with trace.phase("retry"):
+            budget.sleep(wait)
+        attempt += 1
+
+
+def caller(
+    token: Union[str, bool], query: str, variables: Dict, shrinkable: bool = False
+) -> Dict:
+    """
+    Call the GitHub GraphQL API through the shared `Transport`.
+
+    Served from `response_cache` when it holds a fresh response. A miss
+    is stored, or released for the threads waiting on it to fetch.
+    `QueryTooLarge` is passed on to paginators, see `execute`.
+
+    > Centralized requests handler, all network exceptions captured here.
+    """
+    if response_cache is not None:
+        with trace.phase("cache"):
+            cached: Optional[Dict] = response_cache.get(query, variables)
+        if cached is not None:
+            trace.request(cached, 0, cached=True)
+            return cached
+
+    try:
+        payload: Dict = execute(token, query, variables, shrinkable=shrinkable)
+
+    except QueryTooLarge:
+        raise
     except requests.exceptions.ReadTimeout:
-        spinner.fail("Error")
+        fail_spinner()
         console.print("Network connection timeout.:construction:", style="bold red")
 
         sys.exit()
-    except requests.exceptions.HTTPError:
-        spinner.fail("Error")
-        error = response.json().get("message")
+    except requests.exceptions.ConnectionError:
+        fail_spinner()
+        console.print("Could not connect to GitHub.:construction:", style="bold red")
+
+        sys.exit()
+    except requests.exceptions.HTTPError as error:
+        fail_spinner()
         console.print(
             f"Error: {error}.:x:",
             style="bold red",
@@ -231,7 +1099,7 @@ def caller(token: Union[str, bool], query: str, variables: Dict) -> Dict:
 
         sys.exit()
     except NoToken:
-        spinner.fail("Error")
+        fail_spinner()
         console.print(
             "No GitHub Token found. Use `gfi config` to enter your token.:key:",
             style="bold red",
@@ -241,24 +1109,46 @@ def caller(token: Union[str, bool], query: str, variables: Dict) -> Dict:
         )
 
         sys.exit()
-    except Exception:
-        spinner.fail("Error")
-        error_base = response.json().get("errors")[0]
+    except ReplayMiss as error:
+        fail_spinner()
+        console.print(
+            f"No recorded response for this request: {error.path}.:x:",
+            style="bold red",
+        )
 
+        sys.exit()
+    except RateLimitExhausted as error:
+        fail_spinner()
+        reset_at = datetime.datetime.fromtimestamp(error.reset_at)
         console.print(
-            f"Error: {error_base.get('message')}:x:",
+            f"Rate limit exhausted, it resets at {reset_at:%H:%M:%S}.:hourglass:",
+            style="bold red",
+        )
+
+        sys.exit()
+    except GraphQLError as error:
+        fail_spinner()
+        console.print(
+            f"Error: {error}:x:",
             style="bold red",
         )
 
         sys.exit()
     # ruff: noqa: E722
     except:
-        spinner.fail("Error")
+        fail_spinner()
         console.print(
             "An error has occcured. Please try again later or open an issue on GitHub.:x:",  # noqa: E501
             style="bold red",
         )
 
         sys.exit()
-
-    return response.json()
+    else:
+        if response_cache is not None:
+            with trace.phase("cache"):
+                response_cache.put(query, variables, payload)
+    finally:
+        if response_cache is not None:
+            response_cache.release(query, variables)
+
+    return payload
@@ -0,0 +1,117 @@
+"""Incremental sync of search results using updated-since watermarks"""
+
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+from good_first_issues.graphql import partition, services
+from good_first_issues.graphql.models import Issue
+from good_first_issues.graphql.queries import core_query
+
+# Global variables
+sync_dir: str = f"{Path.home()}/.gfi/sync"
+
+# GitHub's search index lags behind writes, the watermark is moved back
+# by this much so issues updated during a run are picked up by the next.
+WATERMARK_SKEW = datetime.timedelta(minutes=5)
+
+
+def state_path(target: str) -> str:
+    """
+    Path of the stored state for a search qualifier.
+    """
+    key = hashlib.sha256(target.encode()).hexdigest()
+    return os.path.join(sync_dir, f"{key}.json")
+
+
+def load_state(target: str) -> Optional[Tuple[str, List[Issue]]]:
+    """
+    Load the watermark and issues stored by the previous run.
+    """
+    try:
+        with open(state_path(target)) as file:
+            state: Dict = json.load(file)
+        return state["watermark"], [Issue.from_dict(item) for item in state["issues"]]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def save_state(target: str, watermark: str, issues: List[Issue]):
+    """
+    Store the watermark and merged issues atomically.
+    """
+    os.makedirs(sync_dir, exist_ok=True)
+    state = {
+        "target": target,
+        "watermark": watermark,
+        "issues": [issue._asdict() for issue in issues],
+    }
+
+    fd, tmp_path = tempfile.mkstemp(dir=sync_dir, suffix=".tmp")
+    with os.fdopen(fd, "w") as file:
+        json.dump(state, file)
+    os.replace(tmp_path, state_path(target))
+
+
+def fetch_issues(token: Union[str, bool], search: str) -> Tuple[List[Issue], int]:
+    """
+    Fetch every issue matching the search, page by page.
+
+    Searches matching more than GitHub returns are split into `created:`
+    windows, see `partition.paginate_windows`.
+    """
+    issues: List[Issue] = []
+    rate_limit: int = 0
+
+    for page_issues, rate_limit in partition.paginate_windows(
+        token, core_query, {"searchQuery": search}, None, "sync"
+    ):
+        issues.extend(page_issues)
+
+    return issues, rate_limit
+
+
+def sync_target(token: Union[str, bool], target: str) -> Tuple[List[Issue], int]:
+    """
+    Bring the stored issues of a search qualifier up to date.
+
+    The first run fetches every open good first issue. Later runs only
+    fetch issues updated since the stored watermark: matching ones are
+    merged in, the others were closed or relabeled and are dropped.
+
+    Returns the issues, newest first, with the remaining rate limit.
+    """
+    started = datetime.datetime.now(datetime.timezone.utc) - WATERMARK_SKEW
+    state = load_state(target)
+
+    if state is None:
+        fetched, rate_limit = fetch_issues(token, f"{target} {services.BASE_SEARCH}")
+        issues = {issue.url: issue for issue in fetched}
+    else:
+        watermark, stored = state
+        updated = f"updated:>={watermark}"
+        matching, rate_limit = fetch_issues(
+            token, f"{target} {services.BASE_SEARCH} {updated}"
+        )
+        touched, rate_limit = fetch_issues(token, f"{target} is:issue {updated}")
+
+        issues = {issue.url: issue for issue in stored}
+        matching_urls = {issue.url for issue in matching}
+
+        for issue in touched:
+            if issue.url not in matching_urls:
+                issues.pop(issue.url, None)
+
+        for issue in matching:
+            issues[issue.url] = issue
+
+    merged = sorted(
+        issues.values(), key=lambda issue: issue.created_at or "", reverse=True
+    )
+    save_state(target, started.strftime("%Y-%m-%dT%H:%M:%SZ"), merged)
+
+    return merged, rate_limit
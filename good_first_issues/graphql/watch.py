@@ -0,0 +1,104 @@
+"""Long-running polling of search qualifiers for new issues"""
+
+import heapq
+import random
+import time
+from typing import Callable, Iterator, List, Optional, Sequence, Set, Tuple, Union
+
+from good_first_issues.graphql import services, sync
+from good_first_issues.graphql.models import Issue
+
+# Each poll is moved by up to this fraction of the interval, so targets
+# watched together drift apart instead of hitting the API in bursts.
+JITTER: float = 0.1
+
+
+class Watcher:
+    """
+    Poll search qualifiers on a schedule and yield issues not seen before.
+
+    Every poll is an incremental sync, only issues updated since the
+    previous poll are fetched. The first poll of a target reports its
+    `first_limit` newest issues and remembers all of them.
+
+    Polls are spaced `interval` seconds apart, give or take the jitter,
+    and pushed back to the reset once the rate limit budget runs low.
+    """
+
+    def __init__(
+        self,
+        token: Union[str, bool],
+        targets: Sequence[str],
+        interval: float,
+        first_limit: Optional[int] = None,
+        jitter: float = JITTER,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: Callable[[], float] = random.random,
+    ):
+        self.token = token
+        self.interval = interval
+        self.first_limit = first_limit
+        self.jitter = jitter
+        self.clock = clock
+        self.sleep = sleep
+        self.rng = rng
+
+        self.seen: Set[str] = set()
+        self.polled: Set[str] = set()
+
+        # (due, position, target), position keeps ties in argument order.
+        now = clock()
+        self.due: List[Tuple[float, int, str]] = [
+            (now, position, target) for position, target in enumerate(targets)
+        ]
+
+    def poll(self, target: str) -> List[Issue]:
+        """
+        Sync a target, returns its issues not reported before, newest first.
+        """
+        issues, _ = sync.sync_target(self.token, target)
+        new = [issue for issue in issues if issue.url not in self.seen]
+        self.seen.update(issue.url for issue in new)
+
+        if target not in self.polled:
+            self.polled.add(target)
+            return new[: self.first_limit]
+
+        return new
+
+    def delay(self) -> float:
+        """
+        Seconds until a target is polled again.
+        """
+        delay = self.interval * (1 + self.jitter * (2 * self.rng() - 1))
+        scheduler = services.current_scheduler()
+
+        if (
+            scheduler.limit
+            and scheduler.remaining is not None
+            and scheduler.reset_at is not None
+            and scheduler.remaining < scheduler.limit * scheduler.throttle_below
+        ):
+            # Little budget left, wait for it to be replenished.
+            delay = max(delay, scheduler.reset_at - self.clock())
+
+        return delay
+
+    def run(self, polls: Optional[int] = None) -> Iterator[Issue]:
+        """
+        Poll targets as they come due, forever or for `polls` polls.
+        """
+        count: int = 0
+
+        while self.due and (polls is None or count < polls):
+            due, position, target = heapq.heappop(self.due)
+
+            wait = due - self.clock()
+            if wait > 0:
+                self.sleep(wait)
+
+            yield from self.poll(target)
+            count += 1
+
+            heapq.heappush(self.due, (self.clock() + self.delay(), position, target))
@@ -0,0 +1,154 @@
+"""Per-phase timings and GraphQL cost of a command, for `--timings`"""
+
+import json
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, TextIO
+
+# Imported by the entry point first, startup is measured from here.
+imported_at: float = time.perf_counter()
+
+
+class Tracer:
+    """
+    Collect phase durations and per-request costs.
+
+    Phases can nest, a phase is only charged the time not spent in the
+    phases nested inside it. Phases running on `fan_out` threads are
+    summed, so their total can exceed the wall time.
+    """
+
+    def __init__(self, started: float = imported_at):
+        self.started = started
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.requests: List[Dict] = []
+
+    def add(self, name: str, seconds: float):
+        with self.lock:
+            stats = self.phases.setdefault(name, {"seconds": 0.0, "count": 0})
+            stats["seconds"] += seconds
+            stats["count"] += 1
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        stack: List[float] = self.local.__dict__.setdefault("stack", [])
+        stack.append(0.0)
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            nested = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+
+            self.add(name, elapsed - nested)
+
+    def request(self, payload: Dict, size: int, cached: bool = False):
+        """
+        Record a GraphQL response, `size` bytes long.
+        """
+        rate_limit: Dict = (payload.get("data") or {}).get("rateLimit") or {}
+
+        with self.lock:
+            self.requests.append(
+                {
+                    "bytes": size,
+                    "cost": 0 if cached else rate_limit.get("cost"),
+                    "remaining": rate_limit.get("remaining"),
+                    "cached": cached,
+                }
+            )
+
+    def summary(self) -> Dict:
+        """
+        Everything recorded so far, as JSON-serializable data.
+        """
+        with self.lock:
+            fetched = [item for item in self.requests if not item["cached"]]
+            remaining = [
+                item["remaining"] for item in fetched if item["remaining"] is not None
+            ]
+
+            return {
+                "total_seconds": time.perf_counter() - self.started,
+                "phases": {name: dict(stats) for name, stats in self.phases.items()},
+                "pages": len(fetched),
+                "cached_pages": len(self.requests) - len(fetched),
+                "bytes": sum(item["bytes"] for item in fetched),
+                "cost": sum(item["cost"] or 0 for item in fetched),
+                "remaining": min(remaining) if remaining else None,
+                "requests": list(self.requests),
+            }
+
+    def print_summary(self, file: Optional[TextIO] = None):
+        file = file or sys.stderr
+        summary = self.summary()
+
+        print("Timings:", file=file)
+        for name, stats in sorted(
+            summary["phases"].items(), key=lambda item: -item[1]["seconds"]
+        ):
+            print(
+                f"  {name:<14} {stats['seconds'] * 1000:10.1f} ms"
+                f"  x{stats['count']:.0f}",
+                file=file,
+            )
+        print(f"  {'total':<14} {summary['total_seconds'] * 1000:10.1f} ms", file=file)
+        print(
+            f"Pages: {summary['pages']} fetched, {summary['cached_pages']} cached,"
+            f" {summary['bytes'] / 1024:.1f} KiB",
+            file=file,
+        )
+        print(
+            f"GraphQL cost: {summary['cost']}, remaining: {summary['remaining']}",
+            file=file,
+        )
+
+    def write_json(self, path: str):
+        with open(path, "w") as file:
+            json.dump(self.summary(), file, indent=2)
+            file.write("\n")
+
+
+# Set by `enable`, hooks do nothing while it is `None`.
+tracer: Optional[Tracer] = None
+
+
+def enable() -> Tracer:
+    """
+    Start collecting, the time since the CLI started counts as `startup`.
+    """
+    global tracer
+
+    tracer = Tracer()
+    tracer.add("startup", time.perf_counter() - imported_at)
+
+    return tracer
+
+
+@contextmanager
+def phase(name: str) -> Iterator[None]:
+    """
+    Charge the time spent in the block to phase `name`.
+    """
+    if tracer is None:
+        yield
+        return
+
+    with tracer.phase(name):
+        yield
+
+
+def request(payload: Dict, size: int, cached: bool = False):
+    """
+    Record a GraphQL response of `size` bytes.
+    """
+    if tracer is not None:
+        tracer.request(payload, size, cached)
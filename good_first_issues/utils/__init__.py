@@ -1,26 +1,23 @@
 """Utils for CLI"""
 
 import datetime
-import http.server
+import functools
 import os
 import re
-import shutil
-import socketserver
 import sys
-import webbrowser
 from collections import namedtuple
 from pathlib import Path
-from typing import Dict, Union
+from typing import Dict, List, Union
 
 import click
-from halo import Halo
-from rich.console import Console
-
-from good_first_issues.graphql import services
-from good_first_issues.graphql.queries import rate_limit_query
-
-console = Console(color_system="auto")
 
+from good_first_issues.utils.web import (  # noqa: F401
+    add_anchor_tag,
+    html_template,
+    render_page,
+    render_report,
+    web_server,
+)
 
 # Global variables
 home_dir: str = str(Path.home())
@@ -31,6 +28,9 @@ credential_file: str = f"{credential_dir}/{filename}"
 
 ParsedDuration = namedtuple("ParsedDuration", ["absolute_period", "utc_date_time"])
 
+MINUTES_PER_HOUR: int = 60
+MINUTES_PER_DAY: int = 24 * MINUTES_PER_HOUR
+
 
 def parse_period(duration: str) -> ParsedDuration:
     """Parses a duration string into absolute period and UTC datetime.
@@ -100,6 +100,36 @@ def parse_period(duration: str) -> ParsedDuration:
     )
 
 
+def period_since(duration: str) -> str:
+    """
+    Start of a `--period`, as the timestamp `created:>=` takes.
+
+    Rounded down to the day for periods of a day or more, to the hour for
+    periods of an hour or more, else to the minute. Repeated searches
+    then send the same query, and share cached and recorded responses.
+    """
+    parsed: ParsedDuration = parse_period(duration)
+    since: datetime.datetime = parsed.utc_date_time.replace(second=0, microsecond=0)
+
+    if parsed.absolute_period >= MINUTES_PER_HOUR:
+        since = since.replace(minute=0)
+    if parsed.absolute_period >= MINUTES_PER_DAY:
+        since = since.replace(hour=0)
+
+    return since.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@functools.lru_cache(maxsize=None)
+def get_console():
+    """
+    Shared rich `Console`, made on first use so that commands printing
+    nothing through it, and `--help`, don't import rich.
+    """
+    from rich.console import Console
+
+    return Console(color_system="auto")
+
+
 def print_help_msg(command):
     """
     Prints help message for passed command.
@@ -111,17 +141,14 @@ def print_help_msg(command):
 def add_credential(credential: str):
     """
     Write creds to .gfi/good-first-issue file if credential argument passed.
-    Delete config folder if exists and create a new one.
+    Create the config folder if missing, leaving the cache inside untouched.
     """
-    if os.path.exists(credential_dir):
-        shutil.rmtree(credential_dir)
-
-    os.mkdir(credential_dir)
+    os.makedirs(credential_dir, exist_ok=True)
 
     with open(f"{credential_file}", "w+") as cred:
         cred.write(credential.strip())
 
-    console.print(
+    get_console().print(
         f"Credentials saved to [bold blue]{credential_file}[/bold blue]:white_check_mark:",  # noqa: E501
         style="bold green",
     )
@@ -137,15 +164,38 @@ def check_credential() -> Union[str, bool]:
         return cred
     elif os.path.exists(credential_file):
         with open(credential_file) as cred:
-            return cred.readline()
+            return cred.readline().strip()
 
     return False
 
 
+def check_credentials() -> List[str]:
+    """
+    Check for every GitHub credential configured, to spread requests over.
+
+    `GFITOKENS` holds tokens separated by commas or whitespace, the config
+    file one token per line. Falls back to `check_credential`.
+    """
+    if tokens := os.environ.get("GFITOKENS", "").replace(",", " ").split():
+        return tokens
+    elif os.environ.get("GFITOKEN") is None and os.path.exists(credential_file):
+        with open(credential_file) as cred:
+            return [line.strip() for line in cred if line.strip()]
+
+    cred = check_credential()
+    return [cred] if cred else []
+
+
 def gql_rate_limit() -> int:
     """
     Fetch rate_limit for GraphQL API.
     """
+    # Imported here, requests and halo are only loaded by commands calling the API.
+    from halo import Halo
+
+    from good_first_issues.graphql import services
+    from good_first_issues.graphql.queries import rate_limit_query
+
     token: Union[str, bool] = check_credential()
 
     # Spinner
@@ -157,126 +207,3 @@ def gql_rate_limit() -> int:
     spinner.succeed("rate limit")
 
     return payload["data"].get("rateLimit").get("remaining")
-
-
-def web_server(html_data):
-    """
-    Start web server for obtained issues.
-    """
-    Handler = http.server.SimpleHTTPRequestHandler
-    filename = "index.html"
-
-    url_data = add_anchor_tag(html_data)
-    try:
-        with open(filename, "w+") as file:
-            file.write(html_template.format(table=url_data))
-
-        socketserver.TCPServer.allow_reuse_address = True
-
-        with socketserver.TCPServer(("localhost", 0), Handler) as httpd:
-            port = httpd.server_address[1]
-            print("Serving at port", port)
-            webbrowser.open(f"http://127.0.0.1:{port}/")
-            httpd.serve_forever()
-
-    except KeyboardInterrupt:
-        print("\nServer stopped")
-    finally:
-        os.remove(filename)
-
-
-def add_anchor_tag(html_data):
-    """
-    Use regex to get URL elements inside <td> tag and
-    wrap them inside an anchor tag.
-    """
-    pattern = re.compile(r"<td>(https.+)<\/td>")
-    matches = re.findall(pattern, html_data)
-
-    for item in matches:
-        url = f"<td><a target='_blank' href='{item}'>{item}</a></td>"
-        html_data = re.sub(pattern, url, html_data, 1)
-
-    return html_data
-
-
-# Template for displaying issues on web.
-html_template = """
-<!DOCTYPE html>
-<html lang="en">
-  <head>
-    <meta charset="UTF-8" />
-    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
-<link
-      href="https://fonts.googleapis.com/css2?family=Roboto&display=swap"
-      rel="stylesheet"
-    />
-    <link
-      href="https://fonts.googleapis.com/css2?family=Secular+One&display=swap"
-      rel="stylesheet"
-    />
-    <link rel="icon" href="data:,">
-    <style>
-      body {{
-        background-color: #afd0a9;
-        font-family: "Roboto", sans-serif;
-      }}
-
-      h1 {{
-        text-align: center;
-        font-size: 42px;
-        font-family: "Secular One", sans-serif;
-        color: white;
-      }}
-
-      table {{
-        border-spacing: 0px;
-        width: 80%;
-        margin: auto;
-        border-radius: 10px;
-        overflow: hidden;
-        box-shadow: 5px 5px 10px gray;
-      }}
-
-      th,
-      td {{
-        text-align: left;
-        padding: 12px;
-      }}
-
-      tr:nth-child(even) {{
-        background-color: #f2f2f2;
-      }}
-
-      tr:nth-child(odd) {{
-        background-color: white;
-      }}
-
-      tr:hover {{
-        background-color: #c0c0c0;
-      }}
-
-      th {{
-        background-color: #006e58;
-        color: white;
-        font-size: 18px;
-        font-weight: 900;
-      }}
-
-      a {{
-        color: #006e58;
-      }}
-
-      a:hover {{
-        color: black;
-      }}
-    </style>
-    <title>Good First Issues</title>
-  </head>
-  <body>
-    <h1>Good First Issues</h1>
-    {table}
-  </body>
-</html>
-
-"""
@@ -0,0 +1,244 @@
+"""Long-lived HTTP service answering searches, for `gfi serve`"""
+
+import html
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple, Union
+from urllib.parse import parse_qs, urlsplit
+
+from good_first_issues.graphql import partition, rank, services
+from good_first_issues.graphql.models import Issue
+from good_first_issues.graphql.queries import rate_limit_query
+from good_first_issues.utils import period_since
+from good_first_issues.utils.stream import issue_record
+from good_first_issues.utils.web import html_template, render_table, style
+
+DEFAULT_LIMIT: int = 10
+
+# Upper bounds on what a single request may ask for.
+MAX_LIMIT: int = 100
+MAX_TARGETS: int = 50
+
+# Search parameter: qualifier prefix.
+target_params: Dict[str, str] = {"org": "org", "user": "user", "repo": "repo"}
+
+search_form: str = """
+    <form action="/" method="get">
+      <input name="org" placeholder="Organizations" value="{org}" />
+      <input name="user" placeholder="Users" value="{user}" />
+      <input name="repo" placeholder="owner/repo" value="{repo}" />
+      <input name="limit" type="number" min="1" max="{max_limit}" value="{limit}" />
+      <select name="sort">{sorts}</select>
+      <button type="submit">Search</button>
+    </form>
+"""
+
+
+class BadRequest(Exception):
+    pass
+
+
+def first(params: Dict[str, List[str]], name: str) -> Optional[str]:
+    """
+    First value of a query string parameter.
+    """
+    values = params.get(name)
+    return values[0] if values else None
+
+
+class SearchRequest:
+    """
+    Parameters of a `/search` request, checked.
+
+    `org`, `user` and `repo` take one name each and can be repeated or
+    comma separated. `limit` applies to each name unless `sort` is given,
+    then it keeps the best issues across every name.
+
+    `period` is rounded like `--period`, so requests for the same period
+    share cached responses.
+    """
+
+    def __init__(self, params: Dict[str, List[str]]):
+        self.targets: List[str] = []
+        for param, prefix in target_params.items():
+            for value in params.get(param, []):
+                for name in filter(None, (name.strip() for name in value.split(","))):
+                    if param == "repo" and "/" not in name:
+                        raise BadRequest(f"repo takes owner/name, got {name!r}")
+                    self.targets.append(f"{prefix}:{name}")
+
+        if len(self.targets) > MAX_TARGETS:
+            raise BadRequest(f"Search at most {MAX_TARGETS} names at once")
+
+        self.sort: Optional[str] = first(params, "sort") or None
+        self.label: Optional[str] = first(params, "label")
+        self.period: Optional[str] = None
+        self.limit: int = DEFAULT_LIMIT
+
+        limit: Optional[str] = first(params, "limit")
+        if limit:
+            if not limit.isdigit() or not 1 <= int(limit) <= MAX_LIMIT:
+                raise BadRequest(f"limit takes a number from 1 to {MAX_LIMIT}")
+            self.limit = int(limit)
+
+        period: Optional[str] = first(params, "period")
+        if period:
+            try:
+                self.period = period_since(period)
+            except SystemExit:
+                raise BadRequest("period takes a duration like 30d or 12h")
+
+        if self.sort is not None and self.sort not in rank.sorts:
+            raise BadRequest(f"sort takes one of {', '.join(rank.sorts)}")
+
+
+def search_issues(
+    token: Union[str, bool], request: SearchRequest, concurrency: int
+) -> Tuple[List[Issue], Optional[int]]:
+    """
+    Issues of every name in `request`, batched like many names in `search`.
+    """
+    searches = [
+        services.search_string(target, request.period, request.sort)
+        for target in request.targets
+    ]
+    candidates = partition.candidate_limit(request.sort, request.limit)
+    documents = services.batch_documents(searches, candidates)
+    batches = services.fan_out(
+        lambda document: services.fetch_batch(token, document, "org", candidates),
+        documents,
+        concurrency=concurrency,
+    )
+    pages = (
+        (issues, rate_limit) for results, rate_limit in batches for issues in results
+    )
+
+    if request.sort:
+        labels = request.label.split() if request.label else ()
+        pages = rank.top_k(pages, request.limit, rank.rank_key(request.sort, labels))
+    else:
+        pages = rank.unique(pages)
+
+    issues: List[Issue] = []
+    rate_limit: Optional[int] = None
+    for page_issues, rate_limit in pages:
+        issues.extend(page_issues)
+
+    return issues, rate_limit
+
+
+class Server(ThreadingHTTPServer):
+    """
+    Threaded HTTP server, a request per thread.
+
+    Every thread shares the process-wide transport, rate limit budget and
+    `services.response_cache`, so concurrent requests reuse connections
+    and cached responses.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        token: Union[str, bool],
+        concurrency: int = services.DEFAULT_CONCURRENCY,
+    ):
+        self.token = token
+        self.concurrency = concurrency
+        super().__init__(address, Handler)
+
+
+class Handler(BaseHTTPRequestHandler):
+    """
+    `GET /search` and `GET /rate-limit` answer JSON, `GET /` a page.
+    """
+
+    server: Server
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params: Dict[str, List[str]] = parse_qs(url.query)
+        routes = {
+            "/": self.page,
+            "/search": self.search,
+            "/rate-limit": self.rate_limit,
+        }
+
+        route = routes.get(url.path.rstrip("/") or "/")
+        if route is None:
+            self.send_json(404, {"error": "Not found"})
+            return
+
+        try:
+            route(params)
+        except BadRequest as error:
+            self.send_json(400, {"error": str(error)})
+        except SystemExit:
+            # `caller` has printed what went wrong upstream.
+            self.send_json(502, {"error": "GitHub request failed"})
+        except Exception as error:
+            self.log_error("%r", error)
+            self.send_json(502, {"error": f"GitHub request failed: {error}"})
+
+    def search(self, params: Dict[str, List[str]]):
+        request = SearchRequest(params)
+        if not request.targets:
+            raise BadRequest("Pass at least one org, user or repo")
+
+        issues, rate_limit = search_issues(
+            self.server.token, request, self.server.concurrency
+        )
+        self.send_json(
+            200,
+            {
+                "issues": [issue_record(issue) for issue in issues],
+                "rate_limit": rate_limit,
+            },
+        )
+
+    def rate_limit(self, params: Dict[str, List[str]]):
+        # Straight to GitHub, a cached budget would be stale.
+        payload: Dict = services.execute(self.server.token, rate_limit_query, {})
+        self.send_json(200, payload["data"]["rateLimit"])
+
+    def page(self, params: Dict[str, List[str]]):
+        request = SearchRequest(params)
+        issues: List[Issue] = []
+        if request.targets:
+            issues, _ = search_issues(
+                self.server.token, request, self.server.concurrency
+            )
+
+        sorts = "".join(
+            f'<option value="{name}"{" selected" if name == request.sort else ""}>'
+            f"{name or 'fetch order'}</option>"
+            for name in ["", *rank.sorts]
+        )
+        form = search_form.format(
+            **{
+                param: html.escape(", ".join(params.get(param, [])), quote=True)
+                for param in target_params
+            },
+            limit=request.limit,
+            max_limit=MAX_LIMIT,
+            sorts=sorts,
+        )
+        table = render_table(issues) if request.targets else ""
+
+        self.send_body(
+            200,
+            html_template.format(style=style, table=form + table).encode(),
+            "text/html; charset=utf-8",
+        )
+
+    def send_json(self, status: int, data: Dict):
+        self.send_body(status, json.dumps(data).encode(), "application/json")
+
+    def send_body(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
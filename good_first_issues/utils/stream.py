@@ -0,0 +1,157 @@
+"""Row by row output of issues, as a table or machine-readable records"""
+
+import csv
+import json
+import shutil
+import sys
+from typing import Callable, Dict, Iterable, Optional, Sequence, TextIO
+
+from good_first_issues.graphql.models import Issue
+
+# Width of the row number column.
+INDEX_WIDTH: int = 5
+
+# Titles are cut to at most this many characters, and fewer on narrow
+# terminals, so rows can be printed without seeing the rest of them.
+TITLE_WIDTH: int = 60
+MIN_TITLE_WIDTH: int = 20
+
+# Room left for the URL column, which is never cut.
+URL_WIDTH: int = 50
+
+
+def truncate(text: str, width: int) -> str:
+    """
+    Cut text to `width` characters, marking the cut with an ellipsis.
+    """
+    return text if len(text) <= width else text[: width - 1] + "…"
+
+
+def title_width(columns: Optional[int] = None) -> int:
+    """
+    Width of the title column for a terminal `columns` wide.
+    """
+    if columns is None:
+        columns = shutil.get_terminal_size().columns
+
+    available = columns - INDEX_WIDTH - URL_WIDTH - 4
+
+    return max(MIN_TITLE_WIDTH, min(TITLE_WIDTH, available))
+
+
+def stream_table(
+    issues: Iterable[Issue],
+    file: Optional[TextIO] = None,
+    columns: Optional[int] = None,
+) -> int:
+    """
+    Print each issue as soon as it is produced, returns the number printed.
+
+    Column widths are fixed up front, so nothing is buffered and memory
+    stays flat however many issues there are.
+    """
+    file = file or sys.stdout
+    width = title_width(columns)
+
+    def line(index: str, title: str, url: str):
+        print(f"{index:>{INDEX_WIDTH}}  {title:<{width}}  {url}", file=file, flush=True)
+
+    count: int = 0
+    for count, issue in enumerate(issues, start=1):
+        # Headers wait for the first row, empty results print nothing.
+        if count == 1:
+            line("#", "Title", "Issue URL")
+            line("-" * INDEX_WIDTH, "-" * width, "-" * 9)
+
+        line(str(count), truncate(" ".join(issue.title.split()), width), issue.url)
+
+    return count
+
+
+def issue_record(issue: Issue, fields: Optional[Sequence[str]] = None) -> Dict:
+    """
+    Fields of an issue, all of them on `None`, with labels as a list.
+    """
+    record = {**issue._asdict(), "labels": list(issue.labels)}
+
+    if fields is None:
+        return record
+
+    return {field: record[field] for field in fields}
+
+
+def write_jsonl(
+    issues: Iterable[Issue],
+    file: Optional[TextIO] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Write one JSON object per line, returns the number written.
+
+    Lines are flushed as they are written, like `stream_table` rows, so
+    a pipe reading `gfi watch` gets each issue as it is found.
+    """
+    file = file or sys.stdout
+
+    count: int = 0
+    for count, issue in enumerate(issues, start=1):
+        file.write(json.dumps(issue_record(issue, fields)) + "\n")
+        file.flush()
+
+    return count
+
+
+def write_json(
+    issues: Iterable[Issue],
+    file: Optional[TextIO] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Write a JSON array element by element, returns the number written.
+    """
+    file = file or sys.stdout
+    file.write("[")
+
+    count: int = 0
+    for count, issue in enumerate(issues, start=1):
+        record = json.dumps(issue_record(issue, fields))
+        file.write(("\n" if count == 1 else ",\n") + record)
+        file.flush()
+
+    file.write("\n]\n" if count else "]\n")
+
+    return count
+
+
+def write_csv(
+    issues: Iterable[Issue],
+    file: Optional[TextIO] = None,
+    fields: Optional[Sequence[str]] = None,
+) -> int:
+    """
+    Write a header and one CSV row per issue, returns the number written.
+
+    Labels share a cell, separated by commas.
+    """
+    file = file or sys.stdout
+    fields = fields or Issue._fields
+    writer = csv.writer(file)
+    writer.writerow(fields)
+    file.flush()
+
+    count: int = 0
+    for count, issue in enumerate(issues, start=1):
+        row = issue._replace(labels=", ".join(issue.labels))
+        writer.writerow([getattr(row, field) for field in fields])
+        file.flush()
+
+    return count
+
+
+# Writers for `--format`, by name. All but `table` take the `fields` to write.
+writers: Dict[str, Callable[..., int]] = {
+    "table": stream_table,
+    "jsonl": write_jsonl,
+    "json": write_json,
+    "csv": write_csv,
+}
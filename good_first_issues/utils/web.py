@@ -0,0 +1,333 @@
+"""HTML rendering of issues for the browser"""
+
+import html
+import json
+import re
+from typing import Iterable, List, Sequence
+
+from good_first_issues.graphql.models import Issue
+
+# Matches the URL elements tabulate writes inside <td> tags.
+url_cell_pattern = re.compile(r"<td>(https.+)<\/td>")
+
+
+def render_table(issues: Iterable[Issue]) -> str:
+    """
+    Render issues as an HTML table in one pass, URLs as anchor tags.
+    """
+    parts: List[str] = [
+        "<table>\n<thead>\n<tr><th>#</th><th>Title</th><th>Issue URL</th></tr>\n"
+        "</thead>\n<tbody>\n"
+    ]
+
+    for position, issue in enumerate(issues, start=1):
+        url = html.escape(issue.url)
+        parts.append(
+            f"<tr><td>{position}</td><td>{html.escape(issue.title)}</td>"
+            f"<td><a target='_blank' href='{url}'>{url}</a></td></tr>\n"
+        )
+
+    parts.append("</tbody>\n</table>")
+
+    return "".join(parts)
+
+
+def add_anchor_tag(html_data: str) -> str:
+    """
+    Wrap the URL elements inside <td> tags of a table in anchor tags.
+    """
+    return url_cell_pattern.sub(
+        lambda match: (
+            f"<td><a target='_blank' href='{match.group(1)}'>{match.group(1)}</a></td>"
+        ),
+        html_data,
+    )
+
+
+def render_page(issues: Iterable[Issue]) -> str:
+    """
+    Full page served by `--web`.
+    """
+    return html_template.format(style=style, table=render_table(issues))
+
+
+def render_report(issues: Sequence[Issue]) -> str:
+    """
+    Standalone page written by `--web-export`.
+
+    Issues are embedded as JSON and rendered by the page itself, one page
+    of rows at a time, so reports of thousands of issues stay responsive.
+    """
+    data = json.dumps([issue._asdict() for issue in issues])
+
+    # `<` is escaped so titles can't close the script tag early.
+    return report_template.format(
+        style=style, count=len(issues), issues=data.replace("<", "\\u003c")
+    )
+
+
+def web_server(page: str):
+    """
+    Serve a page from memory until interrupted.
+    """
+    import webbrowser
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    body: bytes = page.encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/":
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        with ThreadingHTTPServer(("127.0.0.1", 0), Handler) as httpd:
+            port = httpd.server_address[1]
+            print("Serving at port", port)
+            webbrowser.open(f"http://127.0.0.1:{port}/")
+            httpd.serve_forever()
+
+    except KeyboardInterrupt:
+        print("\nServer stopped")
+
+
+# Shared by the `--web` page and `--web-export` reports.
+style = """
+      body {
+        background-color: #afd0a9;
+        font-family: "Roboto", sans-serif;
+      }
+
+      h1 {
+        text-align: center;
+        font-size: 42px;
+        font-family: "Secular One", sans-serif;
+        color: white;
+      }
+
+      table {
+        border-spacing: 0px;
+        width: 80%;
+        margin: auto;
+        border-radius: 10px;
+        overflow: hidden;
+        box-shadow: 5px 5px 10px gray;
+      }
+
+      th,
+      td {
+        text-align: left;
+        padding: 12px;
+      }
+
+      tr:nth-child(even) {
+        background-color: #f2f2f2;
+      }
+
+      tr:nth-child(odd) {
+        background-color: white;
+      }
+
+      tr:hover {
+        background-color: #c0c0c0;
+      }
+
+      th {
+        background-color: #006e58;
+        color: white;
+        font-size: 18px;
+        font-weight: 900;
+      }
+
+      a {
+        color: #006e58;
+      }
+
+      a:hover {
+        color: black;
+      }
+"""
+
+# Template for displaying issues on web.
+html_template = """
+<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+<link
+      href="https://fonts.googleapis.com/css2?family=Roboto&display=swap"
+      rel="stylesheet"
+    />
+    <link
+      href="https://fonts.googleapis.com/css2?family=Secular+One&display=swap"
+      rel="stylesheet"
+    />
+    <link rel="icon" href="data:,">
+    <style>{style}    </style>
+    <title>Good First Issues</title>
+  </head>
+  <body>
+    <h1>Good First Issues</h1>
+    {table}
+  </body>
+</html>
+
+"""
+
+# Template for `--web-export`, sorting, filtering and paging happen in the page.
+report_template = """
+<!DOCTYPE html>
+<html lang="en">
+  <head>
+    <meta charset="UTF-8" />
+    <meta name="viewport" content="width=device-width, initial-scale=1.0" />
+    <link rel="icon" href="data:,">
+    <style>{style}
+      th {{
+        cursor: pointer;
+      }}
+
+      .controls {{
+        width: 80%;
+        margin: 0 auto 16px;
+        display: flex;
+        gap: 12px;
+        align-items: center;
+      }}
+
+      .controls input {{
+        flex: 1;
+        padding: 8px;
+      }}
+    </style>
+    <title>Good First Issues</title>
+  </head>
+  <body>
+    <h1>Good First Issues</h1>
+    <div class="controls">
+      <input id="filter" type="search" placeholder="Filter {count} issues by title, repo or label" />
+      <button id="previous">Previous</button>
+      <span id="position"></span>
+      <button id="next">Next</button>
+    </div>
+    <table>
+      <thead>
+        <tr>
+          <th data-key="title">Title</th>
+          <th data-key="repo">Repository</th>
+          <th data-key="labels">Labels</th>
+          <th data-key="created_at">Created</th>
+        </tr>
+      </thead>
+      <tbody id="issues"></tbody>
+    </table>
+    <script>
+      const issues = {issues};
+      const pageSize = 50;
+      let rows = issues;
+      let page = 0;
+      let sortKey = null;
+      let ascending = true;
+
+      const text = (issue, key) =>
+        key === "repo"
+          ? (issue.owner || "") + "/" + (issue.repo || "")
+          : key === "labels"
+            ? issue.labels.join(", ")
+            : String(issue[key] || "");
+
+      function cell(content) {{
+        const td = document.createElement("td");
+        td.append(content);
+        return td;
+      }}
+
+      function render() {{
+        const pages = Math.max(1, Math.ceil(rows.length / pageSize));
+        page = Math.min(page, pages - 1);
+
+        const body = document.getElementById("issues");
+        body.replaceChildren();
+        for (const issue of rows.slice(page * pageSize, (page + 1) * pageSize)) {{
+          const link = document.createElement("a");
+          link.href = issue.url;
+          link.target = "_blank";
+          link.textContent = issue.title;
+
+          const tr = document.createElement("tr");
+          tr.append(
+            cell(link),
+            cell(text(issue, "repo")),
+            cell(text(issue, "labels")),
+            cell(text(issue, "created_at").slice(0, 10))
+          );
+          body.append(tr);
+        }}
+
+        document.getElementById("position").textContent =
+          "Page " + (page + 1) + " of " + pages + " (" + rows.length + " issues)";
+      }}
+
+      function update() {{
+        const words = document
+          .getElementById("filter")
+          .value.toLowerCase()
+          .split(/\\s+/)
+          .filter(Boolean);
+
+        rows = issues.filter((issue) => {{
+          const haystack = ["title", "repo", "labels"]
+            .map((key) => text(issue, key).toLowerCase())
+            .join(" ");
+          return words.every((word) => haystack.includes(word));
+        }});
+
+        if (sortKey) {{
+          const sign = ascending ? 1 : -1;
+          rows.sort(
+            (a, b) => sign * text(a, sortKey).localeCompare(text(b, sortKey))
+          );
+        }}
+
+        render();
+      }}
+
+      document.getElementById("filter").addEventListener("input", () => {{
+        page = 0;
+        update();
+      }});
+
+      for (const th of document.querySelectorAll("th")) {{
+        th.addEventListener("click", () => {{
+          ascending = sortKey === th.dataset.key ? !ascending : true;
+          sortKey = th.dataset.key;
+          update();
+        }});
+      }}
+
+      document.getElementById("previous").addEventListener("click", () => {{
+        page = Math.max(0, page - 1);
+        render();
+      }});
+
+      document.getElementById("next").addEventListener("click", () => {{
+        page += 1;
+        render();
+      }});
+
+      render();
+    </script>
+  </body>
+</html>
+"""
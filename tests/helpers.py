@@ -0,0 +1,40 @@
+from typing import List, Optional, Sequence
+
+from good_first_issues.graphql.models import Issue
+
+
+def make_issue(
+    number: int = 1,
+    title: Optional[str] = None,
+    labels: Sequence[str] = (),
+    created_at: Optional[str] = None,
+    owner: str = "o",
+    repo: str = "r",
+    **fields,
+) -> Issue:
+    """Issue `number` of `owner/repo`, other fields as given."""
+    return Issue(
+        title=title or f"Issue {number}",
+        url=f"https://github.com/{owner}/{repo}/issues/{number}",
+        number=number,
+        repo=repo,
+        owner=owner,
+        labels=tuple(labels),
+        created_at=created_at,
+        **fields,
+    )
+
+
+class FakeClock:
+    """Clock whose `sleep` moves `time` forward, recording each sleep."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+        self.sleeps: List[float] = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float):
+        self.sleeps.append(seconds)
+        self.now += seconds
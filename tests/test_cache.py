@@ -0,0 +1,133 @@
+import os
+import threading
+import time
+
+from good_first_issues.graphql.cache import MemoryCache, ResponseCache, cache_key
+
+QUERY = "query { rateLimit { remaining } }"
+
+
+def test_cache_key_ignores_whitespace_and_variable_order():
+    assert cache_key(QUERY, {"a": 1, "b": 2}) == cache_key(
+        "query {\n  rateLimit {\n    remaining\n  }\n}", {"b": 2, "a": 1}
+    )
+    assert cache_key(QUERY, {"a": 1}) != cache_key(QUERY, {"a": 2})
+
+
+def test_get_returns_fresh_entries(tmp_path):
+    cache = ResponseCache(ttl=60, directory=str(tmp_path))
+
+    assert cache.get(QUERY, {}) is None
+    cache.put(QUERY, {}, {"data": 1})
+    assert cache.get(QUERY, {}) == {"data": 1}
+
+
+def test_get_skips_expired_entries(tmp_path):
+    cache = ResponseCache(ttl=-1, directory=str(tmp_path))
+    cache.put(QUERY, {}, {"data": 1})
+
+    assert cache.get(QUERY, {}) is None
+    assert cache.stats().expired == 1
+
+
+def test_refresh_skips_lookups_but_stores(tmp_path):
+    ResponseCache(ttl=60, directory=str(tmp_path)).put(QUERY, {}, {"data": 1})
+    cache = ResponseCache(ttl=60, directory=str(tmp_path), refresh=True)
+
+    assert cache.get(QUERY, {}) is None
+    cache.put(QUERY, {}, {"data": 2})
+    assert ResponseCache(ttl=60, directory=str(tmp_path)).get(QUERY, {}) == {"data": 2}
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ResponseCache(ttl=60, directory=str(tmp_path))
+    for index in range(3):
+        cache.put(QUERY, {"index": index}, {"data": "x" * 100})
+
+    # Make entry 0 the oldest, then touch it with a hit so entry 1 goes first.
+    past = time.time() - 100
+    for path in tmp_path.iterdir():
+        os.utime(path, (past, past))
+    cache.get(QUERY, {"index": 0})
+
+    cache.max_bytes = cache.stats().size - 1
+    cache.evict()
+
+    assert cache.stats().entries == 2
+    assert cache.get(QUERY, {"index": 0}) is not None
+
+
+def test_put_lists_the_directory_only_to_evict(tmp_path, monkeypatch):
+    cache = ResponseCache(ttl=60, directory=str(tmp_path), max_bytes=2000)
+    listings = []
+    entries = cache._entries
+    monkeypatch.setattr(cache, "_entries", lambda: listings.append(1) or entries())
+
+    for index in range(5):
+        cache.put(QUERY, {"index": index}, {"data": "x" * 100})
+    assert len(listings) == 1
+    assert cache.size == cache.stats().size
+
+    # Past the limit, each eviction makes room for a few writes.
+    listings.clear()
+    for index in range(5, 40):
+        cache.put(QUERY, {"index": index}, {"data": "x" * 100})
+    assert 0 < len(listings) < 20
+    assert cache.size == cache.stats().size <= 2000
+
+
+def test_clear_removes_everything(tmp_path):
+    cache = ResponseCache(ttl=60, directory=str(tmp_path))
+    cache.put(QUERY, {"index": 0}, {})
+    cache.put(QUERY, {"index": 1}, {})
+
+    assert cache.clear() == 2
+    assert cache.stats().entries == 0
+
+
+def test_memory_cache_expires_and_evicts_least_recently_used():
+    now = [0.0]
+    cache = MemoryCache(ttl=60, max_entries=2, clock=lambda: now[0])
+
+    cache.put(QUERY, {"n": 1}, {"data": 1})
+    cache.put(QUERY, {"n": 2}, {"data": 2})
+    assert cache.get(QUERY, {"n": 1}) == {"data": 1}
+    cache.put(QUERY, {"n": 3}, {"data": 3})
+
+    assert cache.get(QUERY, {"n": 2}) is None
+    assert cache.get(QUERY, {"n": 1}) == {"data": 1}
+
+    now[0] = 61
+    assert cache.get(QUERY, {"n": 3}) is None
+    assert len(cache.entries) == 1
+
+
+def test_memory_cache_fetches_concurrent_misses_once():
+    cache = MemoryCache(ttl=60)
+    fetches = []
+    results = []
+
+    def lookup(payload):
+        cached = cache.get(QUERY, {})
+        if cached is None:
+            fetches.append(payload)
+            time.sleep(0.05)
+            if payload is None:
+                # A failed fetch, a waiting thread takes over.
+                cache.release(QUERY, {})
+                return
+            cache.put(QUERY, {}, payload)
+            cached = payload
+        results.append(cached)
+
+    threads = [threading.Thread(target=lookup, args=(None,))] + [
+        threading.Thread(target=lookup, args=({"data": 1},)) for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+        time.sleep(0.01)
+    for thread in threads:
+        thread.join()
+
+    assert fetches == [None, {"data": 1}]
+    assert results == [{"data": 1}] * 4
@@ -0,0 +1,78 @@
+from typing import List
+
+import pytest
+from helpers import make_issue
+
+from good_first_issues.commands.search import fetch_targets, read_targets
+from good_first_issues.graphql import checkpoint, services
+from good_first_issues.graphql.checkpoint import Checkpoint
+
+
+@pytest.fixture(autouse=True)
+def checkpoint_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(checkpoint, "checkpoint_dir", str(tmp_path / "checkpoints"))
+    monkeypatch.setattr(services, "MAX_BATCH_ALIASES", 2)
+
+
+def test_record_and_load_skip_truncated_lines():
+    saved = Checkpoint(["org:a", "org:b"], {"limit": 10})
+    saved.record([("org:a", [make_issue(title="org:a", owner="org:a")])])
+
+    with open(saved.path, "a") as file:
+        file.write('{"target": "org:b", "iss')
+
+    assert Checkpoint(["org:a", "org:b"], {"limit": 10}).load() == {
+        "org:a": [make_issue(title="org:a", owner="org:a")]
+    }
+    assert Checkpoint(["org:a", "org:b"], {"limit": 5}).load() == {}
+
+    saved.remove()
+    assert saved.load() == {}
+
+
+def test_read_targets(tmp_path):
+    path = tmp_path / "targets.txt"
+    path.write_text(
+        "# orgs\nrust-lang\nuser:yankeexe\n\nyankeexe/good-first-issues  # repo\n"
+        "repo:ollama/ollama\nrust-lang\n"
+    )
+
+    assert read_targets(str(path), None, False) == [
+        "org:rust-lang",
+        "user:yankeexe",
+        "repo:yankeexe/good-first-issues",
+        "repo:ollama/ollama",
+    ]
+
+
+def test_interrupted_run_resumes(monkeypatch):
+    targets = [f"org:t{number}" for number in range(5)]
+    fetched: List[List[str]] = []
+    fail_on = {1}
+
+    def fetch_batch(token, document, mode, limit, columns):
+        query, variables, aliases = document
+        searches = [variables[alias].split()[0] for alias in aliases]
+        if len(fetched) in fail_on:
+            fail_on.clear()
+            raise SystemExit()
+        fetched.append(searches)
+        return [[make_issue(title=search, owner=search)] for search in searches], 4000
+
+    monkeypatch.setattr(services, "fetch_batch", fetch_batch)
+
+    def run() -> List[str]:
+        pages = fetch_targets(
+            "token", targets, None, 10, 1, None, Checkpoint(targets, {})
+        )
+        return [issue.title for issues, _ in pages for issue in issues]
+
+    with pytest.raises(SystemExit):
+        run()
+    assert fetched == [["org:t0", "org:t1"]]
+
+    assert run() == targets
+    assert fetched[1:] == [["org:t2", "org:t3"], ["org:t4"]]
+
+    # Finished runs leave no checkpoint behind.
+    assert Checkpoint(targets, {}).load() == {}
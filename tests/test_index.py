@@ -0,0 +1,63 @@
+import functools
+
+import pytest
+from helpers import make_issue
+
+from good_first_issues.graphql.index import IssueIndex
+
+rust_issue = functools.partial(
+    make_issue, owner="rust-lang", repo="rust", author="octocat", state="OPEN"
+)
+
+
+@pytest.fixture
+def issue_index(tmp_path):
+    issue_index = IssueIndex(str(tmp_path / "index.db"))
+    issue_index.replace_target(
+        "org:rust-lang",
+        [
+            rust_issue(
+                1, "Fix parser panic", ["good first issue"], "2024-01-01T00:00:00Z"
+            ),
+            rust_issue(2, "Improve docs", ["help wanted"], "2024-02-01T00:00:00Z"),
+            rust_issue(3, "Docs typo", ["docs"], "2024-03-01T00:00:00Z", repo="cargo"),
+        ],
+    )
+    issue_index.replace_target(
+        "org:facebook",
+        [rust_issue(4, "Docs for hooks", [], "2024-04-01T00:00:00Z", owner="facebook")],
+    )
+    return issue_index
+
+
+def test_search_filters(issue_index):
+    assert [issue.number for issue in issue_index.search(owners=["Rust-Lang"])] == [
+        3,
+        2,
+        1,
+    ]
+    assert [issue.title for issue in issue_index.search(title="doc", limit=2)] == [
+        "Docs for hooks",
+        "Docs typo",
+    ]
+    assert [issue.title for issue in issue_index.search(label="help wanted")] == [
+        "Improve docs"
+    ]
+    assert issue_index.search(repo="cargo") == [
+        rust_issue(3, "Docs typo", ["docs"], "2024-03-01T00:00:00Z", repo="cargo")
+    ]
+    recent = issue_index.search(owners=["rust-lang"], since="2024-01-15T00:00:00Z")
+    assert [issue.title for issue in recent] == ["Docs typo", "Improve docs"]
+
+
+def test_replace_target_drops_stale_issues(issue_index):
+    issue_index.replace_target(
+        "org:rust-lang",
+        [rust_issue(2, "Improve docs", ["help wanted"], "2024-02-01T00:00:00Z")],
+    )
+
+    assert [issue.title for issue in issue_index.search(owners=["rust-lang"])] == [
+        "Improve docs"
+    ]
+    assert issue_index.stats().issues == 2
+    assert issue_index.stats().targets == 2
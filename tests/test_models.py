@@ -0,0 +1,42 @@
+from good_first_issues.graphql.models import Issue
+
+
+def test_from_node_reads_every_field():
+    issue = Issue.from_node(
+        {
+            "title": "Fix typo",
+            "url": "https://github.com/rust-lang/rust/issues/1",
+            "createdAt": "2024-01-01T00:00:00Z",
+            "author": {"login": "octocat"},
+            "repository": {"name": "rust", "owner": {"login": "rust-lang"}},
+            "labels": {"nodes": [{"name": "good first issue"}, {"name": "docs"}]},
+            "number": 1,
+            "state": "OPEN",
+        }
+    )
+
+    assert issue == Issue(
+        title="Fix typo",
+        url="https://github.com/rust-lang/rust/issues/1",
+        number=1,
+        repo="rust",
+        owner="rust-lang",
+        labels=("good first issue", "docs"),
+        created_at="2024-01-01T00:00:00Z",
+        author="octocat",
+        state="OPEN",
+    )
+
+
+def test_from_node_falls_back_to_url():
+    issue = Issue.from_node({"title": "T", "url": "https://github.com/o/r/issues/7"})
+
+    assert (issue.owner, issue.repo, issue.number) == ("o", "r", 7)
+    assert issue.labels == ()
+    assert issue.author is None
+
+
+def test_from_dict_round_trip():
+    issue = Issue("T", "https://github.com/o/r/issues/7", labels=("a", "b"))
+
+    assert Issue.from_dict({**issue._asdict(), "labels": ["a", "b"]}) == issue
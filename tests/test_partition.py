@@ -0,0 +1,191 @@
+import datetime
+import json
+import re
+from typing import List
+
+import pytest
+from click.testing import CliRunner
+
+from good_first_issues.graphql import partition, services, sync
+from good_first_issues.main import cli
+
+start = int(datetime.datetime(2020, 1, 1, tzinfo=datetime.timezone.utc).timestamp())
+
+# 60 issues, the last 30 created within the same day.
+created: List[int] = [start + day * 86_400 for day in range(30)] + [
+    start + 40 * 86_400 + second for second in range(30)
+]
+
+
+def parse_time(value: str) -> int:
+    moment = datetime.datetime.strptime(value, "%Y-%m-%dT%H:%M:%SZ")
+    return int(moment.replace(tzinfo=datetime.timezone.utc).timestamp())
+
+
+@pytest.fixture
+def capped_search(monkeypatch):
+    """Search `created` issues, returning at most `SEARCH_CAP` of them."""
+    monkeypatch.setattr(partition, "SEARCH_CAP", 10)
+    monkeypatch.setattr(partition, "WINDOW_SIZE", 8)
+    queries: List[str] = []
+    dataset: List[int] = list(created)
+
+    def caller(token, query, variables, shrinkable=False):
+        search = variables["searchQuery"]
+        queries.append(search)
+
+        numbers = list(range(len(dataset)))
+        window = re.search(r"created:(\S+)\.\.(\S+)", search)
+        if window:
+            low, high = parse_time(window.group(1)), parse_time(window.group(2))
+            numbers = [n for n in numbers if low <= dataset[n] <= high]
+        since = re.search(r"created:>=(\S+)", search)
+        if since:
+            numbers = [n for n in numbers if parse_time(since.group(1)) <= dataset[n]]
+
+        after = int(variables.get("after") or 0)
+        end = min(len(numbers), partition.SEARCH_CAP, after + variables["limit"])
+        nodes = [
+            {
+                "title": str(n),
+                "url": f"https://github.com/o/r/issues/{n}",
+                "createdAt": partition.timestamp(dataset[n]),
+            }
+            for n in numbers[after:end]
+        ]
+        return {
+            "data": {
+                "rateLimit": {"remaining": 4000},
+                "search": {
+                    "issueCount": len(numbers),
+                    "pageInfo": {
+                        "hasNextPage": end < min(len(numbers), partition.SEARCH_CAP),
+                        "endCursor": str(end),
+                    },
+                    "nodes": nodes,
+                },
+            }
+        }
+
+    monkeypatch.setattr(services, "caller", caller)
+    return queries, dataset
+
+
+def test_split_window_covers_window_without_overlap():
+    windows = partition.split_window((100, 199), 3000)
+
+    assert windows == [(100, 124), (125, 149), (150, 174), (175, 199)]
+    assert partition.split_window((5, 5), 10_000) == [(5, 5)]
+
+
+def test_full_window_is_open_from_period():
+    window = partition.full_window("2024-04-01T00:00:00Z")
+
+    assert window == (parse_time("2024-04-01T00:00:00Z"), None)
+    assert partition.window_qualifier(window) == "created:>=2024-04-01T00:00:00Z"
+    assert partition.full_window(None)[0] == int(partition.GITHUB_EPOCH.timestamp())
+
+
+def test_open_window_queries_stay_the_same_over_time():
+    window = partition.full_window("2024-04-01T00:00:00Z")
+    now = datetime.datetime(2024, 5, 1, 12, 34, tzinfo=datetime.timezone.utc)
+
+    windows = partition.split_window(window, 3000, now)
+    later = partition.split_window(window, 3000, now + datetime.timedelta(hours=5))
+
+    assert windows == later
+    assert windows[0][0] == window[0] and windows[-1][1] is None
+    assert all(
+        windows[part][1] + 1 == windows[part + 1][0] for part in range(len(windows) - 1)
+    )
+
+
+def test_small_search_is_paginated_as_usual(capped_search):
+    queries, dataset = capped_search
+    variables = {"searchQuery": f"org:o {services.BASE_SEARCH}"}
+    del dataset[10:]
+
+    pages = list(partition.paginate_windows("token", "query", variables, None, "org"))
+
+    assert sum(len(issues) for issues, _ in pages) == 10
+    assert all("created:" not in query for query in queries)
+
+
+def test_capped_search_is_split_into_windows(capped_search):
+    queries, _ = capped_search
+    period = "2019-01-01T00:00:00Z"
+    variables = {"searchQuery": f"org:o {services.BASE_SEARCH} created:>={period}"}
+
+    pages = list(
+        partition.paginate_windows("token", "query", variables, None, "org", period)
+    )
+
+    urls = [issue.url for issues, _ in pages for issue in issues]
+    assert len(urls) == len(set(urls)) == len(created)
+    # Window queries replace the period, dense windows were split again.
+    windowed = [query for query in queries if "created:" in query]
+    first_split = partition.split_window(partition.full_window(period), len(created))
+    assert all(query.count("created:") == 1 for query in windowed[1:])
+    assert len(windowed) > len(first_split) + 1
+
+
+def test_capped_search_stops_at_limit(capped_search):
+    variables = {"searchQuery": f"org:o {services.BASE_SEARCH}"}
+
+    pages = list(partition.paginate_windows("token", "query", variables, 25, "org"))
+
+    assert sum(len(issues) for issues, _ in pages) == 25
+
+
+def test_zero_limit_fetches_nothing(capped_search):
+    variables = {"searchQuery": f"org:o {services.BASE_SEARCH}"}
+
+    assert list(partition.paginate_windows("token", "query", variables, 0, "org")) == []
+
+
+def test_zero_limit_search_exits_cleanly(capped_search, monkeypatch):
+    monkeypatch.setenv("GFITOKEN", "token")
+
+    result = CliRunner().invoke(
+        cli, ["search", "o", "--limit", "0", "--no-cache", "--format", "jsonl"]
+    )
+
+    assert result.exit_code == 0, result.output
+    assert result.output == ""
+
+
+def test_sync_fetches_past_the_cap(capped_search):
+    issues, _ = sync.fetch_issues("token", f"org:o {services.BASE_SEARCH}")
+
+    assert len({issue.url for issue in issues}) == len(issues) == len(created)
+
+
+def test_candidate_limit_fetches_all_unless_github_sorts():
+    assert partition.candidate_limit(None, 15) == 15
+    assert partition.candidate_limit("recent", 15) == 15
+    assert partition.candidate_limit("recent", partition.SEARCH_CAP + 1) is None
+    assert partition.candidate_limit("labels", 15) is None
+    assert partition.candidate_limit("repo", None) is None
+
+
+def test_sorted_capped_search_ranks_every_window(capped_search, monkeypatch):
+    monkeypatch.setenv("GFITOKEN", "token")
+
+    result = CliRunner().invoke(
+        cli,
+        [
+            "search",
+            "o",
+            "--sort",
+            "recent",
+            "--limit",
+            "15",
+            "--no-cache",
+            "--format",
+            "jsonl",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    titles = [json.loads(line)["title"] for line in result.output.splitlines()]
+    assert titles == [str(n) for n in range(59, 44, -1)]
@@ -0,0 +1,30 @@
+from good_first_issues.graphql.models import Issue
+from good_first_issues.graphql.queries import (
+    build_issue_fragment,
+    core_query,
+    issue_columns,
+    issue_fragment,
+    project,
+)
+
+
+def test_every_column_builds_the_full_fragment():
+    assert set(issue_columns) == set(Issue._fields)
+    assert build_issue_fragment(Issue._fields) == issue_fragment
+
+
+def test_fragment_always_selects_title_and_url():
+    fragment = build_issue_fragment(["owner"])
+
+    assert " ".join(fragment.split()) == (
+        "fragment IssueFields on Issue { title url repository { owner { login } } }"
+    )
+
+
+def test_project_narrows_the_fragment_only():
+    query = project(core_query, ["number"])
+
+    assert query.startswith(core_query[: -len(issue_fragment)])
+    assert "number" in query
+    assert "labels" not in query
+    assert project(core_query, None) is core_query
@@ -0,0 +1,143 @@
+import json
+from typing import Dict
+
+import pytest
+from click.testing import CliRunner
+from helpers import make_issue
+
+from good_first_issues.graphql import rank, services
+from good_first_issues.main import cli
+
+
+def day(number: int) -> str:
+    return f"2024-01-{number:02d}T00:00:00Z"
+
+
+def test_top_k_keeps_newest_and_holds_only_k():
+    top = rank.TopK(3, rank.rank_key("recent"))
+
+    for number in [5, 1, 9, 3, 7, 2]:
+        top.add(make_issue(number, created_at=day(number)))
+        assert len(top.heap) <= 3
+
+    assert [issue.number for issue in top.result()] == [9, 7, 5]
+
+
+def test_top_k_drops_duplicates():
+    top = rank.TopK(2, rank.rank_key("recent"))
+
+    top.extend(
+        [
+            make_issue(1, created_at=day(1)),
+            make_issue(1, created_at=day(1)),
+            make_issue(2, created_at=day(2)),
+        ]
+    )
+    assert [issue.number for issue in top.result()] == [2, 1]
+
+    # Evicted issues seen again don't come back.
+    top.extend([make_issue(3, created_at=day(3)), make_issue(1, created_at=day(1))])
+    assert [issue.number for issue in top.result()] == [3, 2]
+
+    # Same issue through a differently cased owner.
+    top.add(make_issue(3, created_at=day(3), owner="O"))
+    assert len(top.result()) == 2
+
+
+def test_top_k_without_limit_keeps_every_distinct_issue():
+    top = rank.TopK(None, rank.rank_key("repo"))
+
+    top.extend(
+        make_issue(number, owner=owner) for owner in "ba" for number in (2, 1, 2)
+    )
+
+    assert [(issue.owner, issue.number) for issue in top.result()] == [
+        ("a", 1),
+        ("a", 2),
+        ("b", 1),
+        ("b", 2),
+    ]
+
+
+def test_rank_by_labels():
+    issues = [
+        make_issue(1, created_at=day(1), labels=("good first issue",)),
+        make_issue(
+            2, created_at=day(2), labels=("good first issue", "docs", "help wanted")
+        ),
+        make_issue(3, created_at=day(3), labels=("Documentation",)),
+    ]
+
+    by_match = sorted(issues, key=rank.rank_key("labels", ["doc"]))
+    by_count = sorted(issues, key=rank.rank_key("labels"))
+
+    assert [issue.number for issue in by_match] == [3, 2, 1]
+    assert [issue.number for issue in by_count] == [2, 3, 1]
+
+
+def test_top_k_merges_pages_and_unique_keeps_fetch_order():
+    pages = [
+        ([make_issue(1, created_at=day(1)), make_issue(4, created_at=day(4))], 4000),
+        ([make_issue(4, created_at=day(4)), make_issue(2, created_at=day(2))], 3990),
+    ]
+
+    assert list(rank.top_k(pages, 2, rank.rank_key("recent"))) == [
+        ([make_issue(4, created_at=day(4)), make_issue(2, created_at=day(2))], 3990)
+    ]
+    assert [[issue.number for issue in issues] for issues, _ in rank.unique(pages)] == [
+        [1, 4],
+        [2],
+    ]
+
+
+@pytest.fixture
+def search_page(monkeypatch):
+    """Answer every search with the same three issues."""
+    monkeypatch.setenv("GFITOKEN", "token")
+
+    def caller(token, query, variables, shrinkable=False) -> Dict:
+        nodes = [
+            {
+                "title": f"Issue {number}",
+                "url": f"https://github.com/o/r/issues/{number}",
+                "createdAt": day(number),
+            }
+            for number in (1, 3, 2)
+        ]
+        return {
+            "data": {
+                "rateLimit": {"remaining": 4000},
+                "search": {
+                    "issueCount": len(nodes),
+                    "pageInfo": {"hasNextPage": False, "endCursor": None},
+                    "nodes": nodes,
+                },
+            }
+        }
+
+    monkeypatch.setattr(services, "caller", caller)
+
+
+def test_sort_columns_are_fetched_but_not_written(search_page):
+    result = CliRunner().invoke(
+        cli,
+        ["search", "o", "--sort", "recent", "--no-cache"]
+        + ["--format", "jsonl", "--columns", "title,url"],
+    )
+
+    assert result.exit_code == 0, result.output
+    records = [json.loads(line) for line in result.output.splitlines()]
+    assert [record["title"] for record in records] == ["Issue 3", "Issue 2", "Issue 1"]
+    assert all(set(record) == {"title", "url"} for record in records)
+
+
+def test_single_name_is_not_deduplicated(search_page, monkeypatch):
+    def unique(pages):
+        raise AssertionError("a single search can't repeat an issue")
+
+    monkeypatch.setattr(rank, "unique", unique)
+
+    result = CliRunner().invoke(cli, ["search", "o", "--no-cache", "--format", "jsonl"])
+
+    assert result.exit_code == 0, result.output
+    assert len(result.output.splitlines()) == 3
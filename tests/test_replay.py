@@ -0,0 +1,95 @@
+from typing import Dict
+
+import pytest
+from requests.models import Response
+
+from good_first_issues.graphql import services
+from good_first_issues.graphql.queries import core_query
+from good_first_issues.graphql.replay import (
+    RecordingTransport,
+    ReplayMiss,
+    ReplayTransport,
+)
+
+payload: Dict = {
+    "data": {
+        "rateLimit": {
+            "limit": 5000,
+            "remaining": 4990,
+            "resetAt": "2099-01-01T00:00:00Z",
+        },
+        "search": {"nodes": []},
+    }
+}
+
+
+class FakeTransport:
+    def __init__(self):
+        self.calls = 0
+
+    def post(self, headers, query, variables):
+        self.calls += 1
+        response = Response()
+        response.status_code = 200
+        response.headers["X-RateLimit-Remaining"] = "4990"
+        response.headers["Set-Cookie"] = "secret"
+        return response, payload
+
+
+def test_replay_serves_recorded_exchange(tmp_path):
+    inner = FakeTransport()
+    recorder = RecordingTransport(str(tmp_path), inner)
+    variables = {"searchQuery": "org:o", "limit": 10}
+
+    recorder.post({"Authorization": "token x"}, core_query, variables)
+
+    response, replayed = ReplayTransport(str(tmp_path)).post({}, core_query, variables)
+
+    assert replayed == payload
+    assert response.status_code == 200
+    assert response.json() == payload
+    assert response.headers["X-RateLimit-Remaining"] == "4990"
+    assert response.headers["X-RateLimit-Limit"] == "5000"
+    assert "Set-Cookie" not in response.headers
+
+
+def test_replay_matches_whitespace_normalized_query(tmp_path):
+    RecordingTransport(str(tmp_path), FakeTransport()).post({}, "query { a }", {})
+
+    _, replayed = ReplayTransport(str(tmp_path)).post({}, "query {\n  a\n}", {})
+
+    assert replayed == payload
+
+
+def test_replay_miss(tmp_path):
+    with pytest.raises(ReplayMiss):
+        ReplayTransport(str(tmp_path)).post({}, core_query, {"limit": 1})
+
+
+def test_make_transport_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("GFI_REPLAY", raising=False)
+    monkeypatch.delenv("GFI_RECORD", raising=False)
+    assert isinstance(services.make_transport(), services.Transport)
+
+    monkeypatch.setenv("GFI_RECORD", str(tmp_path))
+    assert isinstance(services.make_transport(), RecordingTransport)
+
+    monkeypatch.setenv("GFI_REPLAY", str(tmp_path))
+    monkeypatch.setenv("GFI_REPLAY_LATENCY", "0.25")
+    transport = services.make_transport()
+    assert isinstance(transport, ReplayTransport)
+    assert transport.latency == 0.25
+
+
+def test_caller_replays_without_token(monkeypatch, tmp_path):
+    variables = {"searchQuery": "org:o", "limit": 10}
+    RecordingTransport(str(tmp_path), FakeTransport()).post({}, core_query, variables)
+
+    monkeypatch.setattr(services, "transport", ReplayTransport(str(tmp_path)))
+    monkeypatch.setattr(services, "scheduler", services.RateLimitScheduler())
+    monkeypatch.setattr(services, "response_cache", None)
+
+    assert services.caller(False, core_query, variables) == payload
+
+    with pytest.raises(SystemExit):
+        services.caller(False, core_query, {"searchQuery": "org:other", "limit": 10})
@@ -0,0 +1,159 @@
+import json
+import math
+import threading
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+import pytest
+from click.testing import CliRunner
+
+from good_first_issues.graphql import services
+from good_first_issues.graphql.cache import MemoryCache
+from good_first_issues.main import cli
+from good_first_issues.utils import server as server_module
+from good_first_issues.utils.server import BadRequest, SearchRequest, Server
+
+
+def issue_node(owner: str, number: int) -> Dict:
+    return {
+        "title": f"{owner} {number}",
+        "url": f"https://github.com/{owner}/repo/issues/{number}",
+        "number": number,
+        "repository": {"name": "repo", "owner": {"login": owner}},
+        "createdAt": f"2024-01-{number:02d}T00:00:00Z",
+        "labels": {"nodes": []},
+    }
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """Server on a free port, answering from a fake GitHub."""
+    calls: List[Dict] = []
+
+    def execute(token, query, variables, shrinkable=False):
+        calls.append(variables)
+        # Slow enough for concurrent requests to miss the cache together.
+        time.sleep(0.05)
+        if "searchQuery" not in variables and "t0" not in variables:
+            return {"data": {"rateLimit": {"limit": 5000, "remaining": 4999}}}
+
+        aliases = sorted(key for key in variables if key.startswith("t"))
+        data: Dict = {"rateLimit": {"remaining": 4000}}
+        for alias in aliases:
+            owner = variables[alias].split()[0].split(":")[1]
+            data[alias] = {
+                "pageInfo": {"hasNextPage": False, "endCursor": None},
+                "nodes": [
+                    issue_node(owner, number)
+                    for number in range(1, variables["limit"] + 1)
+                ],
+            }
+        return {"data": data}
+
+    monkeypatch.setattr(services, "execute", execute)
+    monkeypatch.setattr(services, "response_cache", MemoryCache(ttl=60))
+
+    httpd = Server(("127.0.0.1", 0), "token", concurrency=2)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}", calls
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def get(url: str):
+    try:
+        with urllib.request.urlopen(url) as response:
+            return response.status, response.read().decode()
+    except urllib.error.HTTPError as error:
+        return error.code, error.read().decode()
+
+
+def test_search_request_checks_parameters():
+    request = SearchRequest({"org": ["a, b"], "repo": ["o/r"], "limit": ["5"]})
+
+    assert request.targets == ["org:a", "org:b", "repo:o/r"]
+    assert request.limit == 5
+
+    for params in ({"limit": ["0"]}, {"repo": ["r"]}, {"sort": ["stars"]}):
+        with pytest.raises(BadRequest):
+            SearchRequest(params)
+
+
+def test_search_request_rounds_period():
+    days = SearchRequest({"period": ["30d"]}).period
+    hours = SearchRequest({"period": ["6h"]}).period
+
+    assert days.endswith("T00:00:00Z")
+    assert hours.endswith(":00:00Z")
+
+
+def test_concurrent_searches_share_one_fetch(server):
+    url, calls = server
+    responses: List = []
+
+    def search():
+        responses.append(get(f"{url}/search?org=a&org=b&limit=2&period=30d"))
+
+    # The cache starts cold, every request misses it at once.
+    threads = [threading.Thread(target=search) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(responses) == 5
+    for status, body in responses:
+        assert status == 200
+        issues = json.loads(body)["issues"]
+        assert [issue["title"] for issue in issues] == ["a 1", "a 2", "b 1", "b 2"]
+
+    get(f"{url}/search?org=a&org=b&limit=2&period=30d")
+    assert len(calls) == 1
+
+
+def test_search_ranks_across_names(server):
+    url, _ = server
+
+    status, body = get(f"{url}/search?org=a,b&limit=2&sort=recent")
+
+    assert status == 200
+    assert [issue["title"] for issue in json.loads(body)["issues"]] == ["a 2", "b 2"]
+
+
+def test_errors_and_other_routes(server):
+    url, _ = server
+
+    assert get(f"{url}/search")[0] == 400
+    assert get(f"{url}/search?org=a&limit=x")[0] == 400
+    assert get(f"{url}/missing")[0] == 404
+
+    status, body = get(f"{url}/rate-limit")
+    assert status == 200
+    assert json.loads(body)["remaining"] == 4999
+
+    status, body = get(f"{url}/?org=a")
+    assert status == 200
+    assert "https://github.com/a/repo/issues/1" in body
+
+
+def test_wait_for_reset_applies_to_every_token(monkeypatch):
+    monkeypatch.setenv("GFITOKENS", "a,b")
+    monkeypatch.setattr(services, "scheduler", services.RateLimitScheduler())
+    monkeypatch.setattr(services, "token_pool", None)
+    monkeypatch.setattr(services, "response_cache", None)
+
+    class Stopped(Server):
+        def serve_forever(self, poll_interval=0.5):
+            pass
+
+    monkeypatch.setattr(server_module, "Server", Stopped)
+
+    result = CliRunner().invoke(cli, ["serve", "--port", "0", "--wait-for-reset"])
+
+    assert result.exit_code == 0, result.output
+    budgets = services.token_pool.schedulers.values()
+    assert [budget.max_wait for budget in budgets] == [math.inf, math.inf]
@@ -0,0 +1,642 @@
+import datetime
+import http.server
+import json
+import sys
+import threading
+import time
+from itertools import islice
+from typing import Dict, List
+
+import pytest
+import requests
+from click.testing import CliRunner
+from helpers import FakeClock
+from requests.models import Response
+
+from good_first_issues.graphql import checkpoint, services
+from good_first_issues.main import cli
+
+
+def make_page(titles: List[str], has_next: bool, cursor: str) -> Dict:
+    return {
+        "data": {
+            "rateLimit": {"remaining": 4999},
+            "search": {
+                "issueCount": 250,
+                "pageInfo": {"hasNextPage": has_next, "endCursor": cursor},
+                "nodes": [
+                    {"title": title, "url": f"https://github.com/o/r/issues/{title}"}
+                    for title in titles
+                ],
+            },
+        }
+    }
+
+
+@pytest.fixture
+def fake_caller(monkeypatch):
+    """Serve three pages of 100, 100 and 50 issues and record the variables."""
+    calls: List[Dict] = []
+    pages = {
+        None: make_page([str(i) for i in range(100)], True, "c1"),
+        "c1": make_page([str(i) for i in range(100, 200)], True, "c2"),
+        "c2": make_page([str(i) for i in range(200, 250)], False, "c3"),
+    }
+
+    def caller(token, query, variables, shrinkable=False):
+        calls.append(dict(variables))
+        page = pages[variables.get("after")]
+        search = page["data"]["search"]
+        nodes = search["nodes"][: variables["limit"]]
+        return {"data": {**page["data"], "search": {**search, "nodes": nodes}}}
+
+    monkeypatch.setattr(services, "caller", caller)
+    return calls
+
+
+def test_paginate_walks_all_pages(fake_caller):
+    pages = list(services.paginate("token", "query", {"limit": 10}, None))
+
+    assert len(pages) == 3
+    assert [call.get("after") for call in fake_caller] == [None, "c1", "c2"]
+    assert all(call["limit"] == services.PAGE_SIZE for call in fake_caller)
+
+
+def test_paginate_stops_at_limit(fake_caller):
+    issues = []
+    for page in services.paginate("token", "query", {}, 150):
+        page_issues, _ = services.org_user_pipeline(page, "org")
+        issues.extend(page_issues)
+
+    assert len(issues) == 150
+    assert [call["limit"] for call in fake_caller] == [100, 50]
+
+
+def test_paginate_small_limit_single_request(fake_caller):
+    list(services.paginate("token", "query", {}, 10))
+
+    assert fake_caller == [{"limit": 10}]
+
+
+def test_identify_batch_mode_chunks_aliases():
+    names = [f"org-{i}" for i in range(120)]
+    documents, mode = services.identify_batch_mode(names, None, False, None, 100)
+
+    assert mode == "org"
+    assert [len(aliases) for _, _, aliases in documents] == [50, 50, 20]
+
+    query, variables, aliases = documents[2]
+    assert aliases[0] == "t100"
+    assert variables["t100"].startswith("org:org-100 ")
+    assert "t100: search(query: $t100" in query
+
+
+def test_zero_limit_batches_nothing(monkeypatch, tmp_path):
+    assert services.identify_batch_mode(["a", "b"], None, False, None, 0) == ([], "org")
+
+    def caller(token, query, variables, shrinkable=False):
+        raise AssertionError("nothing to fetch")
+
+    monkeypatch.setattr(services, "caller", caller)
+    monkeypatch.setattr(checkpoint, "checkpoint_dir", str(tmp_path / "checkpoints"))
+    monkeypatch.setenv("GFITOKEN", "token")
+    targets = tmp_path / "targets.txt"
+    targets.write_text("c\nd\n")
+
+    for args in (["a", "b"], ["--targets-file", str(targets)]):
+        result = CliRunner().invoke(
+            cli, ["search", *args, "--limit", "0", "--no-cache", "--format", "jsonl"]
+        )
+        assert result.exit_code == 0, result.output
+        assert result.output == ""
+
+
+def test_fetch_batch_splits_results_per_target(monkeypatch):
+    payload = {
+        "data": {
+            "rateLimit": {"remaining": 4998},
+            "t0": make_page(["a", "b"], False, "x")["data"]["search"],
+            "t1": make_page(["c"], False, "y")["data"]["search"],
+        }
+    }
+    monkeypatch.setattr(
+        services, "caller", lambda token, query, variables, **kwargs: payload
+    )
+
+    document = ("query", {"limit": 10, "t0": "org:a", "t1": "org:b"}, ["t0", "t1"])
+    results, rate_limit = services.fetch_batch("token", document, "org", 10)
+
+    assert [[issue.title for issue in issues] for issues in results] == [
+        ["a", "b"],
+        ["c"],
+    ]
+    assert rate_limit == 4998
+
+
+def test_search_string_adds_period_and_sort():
+    search = services.search_string("org:o", "2024-01-01T00:00:00Z", "recent")
+
+    assert search == (
+        f"org:o {services.BASE_SEARCH} created:>=2024-01-01T00:00:00Z sort:created-desc"
+    )
+    assert services.search_string("org:o", None, "repo").endswith("is:issue")
+
+
+def test_identify_mode_fetches_only_columns():
+    query, _, _ = services.identify_mode(
+        "o", None, False, False, None, 10, ("title", "url", "labels")
+    )
+
+    assert "labels(first: 3)" in query
+    assert "createdAt" not in query
+    assert "repository" not in query
+
+    full_query, _, _ = services.identify_mode("o", None, False, False, None, 10)
+    assert full_query == services.core_query
+
+
+def test_fetch_batch_continues_with_same_columns(monkeypatch):
+    queries: List[str] = []
+    first = {
+        "data": {
+            "rateLimit": {"remaining": 4998},
+            "t0": make_page(["a"], True, "c1")["data"]["search"],
+        }
+    }
+
+    def caller(token, query, variables, shrinkable=False):
+        queries.append(query)
+        return first if len(queries) == 1 else make_page(["b"], False, "c2")
+
+    monkeypatch.setattr(services, "caller", caller)
+
+    documents, _ = services.identify_batch_mode(["a"], None, False, None, 10, ("url",))
+    results, _ = services.fetch_batch("token", documents[0], "org", 10, ("url",))
+
+    assert [issue.title for issue in results[0]] == ["a", "b"]
+    assert all("createdAt" not in query for query in queries)
+    assert "SearchGoodFirstIssues" in queries[1]
+
+
+def test_fan_out_keeps_order_and_caps_concurrency():
+    lock = threading.Lock()
+    in_flight = peak = 0
+
+    def work(item: int) -> int:
+        nonlocal in_flight, peak
+        with lock:
+            in_flight += 1
+            peak = max(peak, in_flight)
+        time.sleep(0.01 * (10 - item))
+        with lock:
+            in_flight -= 1
+        return item * 2
+
+    results = list(services.fan_out(work, range(10), concurrency=3))
+
+    assert results == [item * 2 for item in range(10)]
+    assert peak <= 3
+
+
+def test_fan_out_propagates_caller_exit(monkeypatch):
+    def caller(token, query, variables, shrinkable=False):
+        if variables["fail"]:
+            sys.exit()
+        return {"query": query}
+
+    monkeypatch.setattr(services, "caller", caller)
+    calls = [("q1", {"fail": False}), ("q2", {"fail": True})]
+
+    with pytest.raises(SystemExit):
+        list(
+            services.fan_out(
+                lambda call: services.caller("token", *call), calls, concurrency=2
+            )
+        )
+
+
+def test_estimate_cost():
+    assert services.estimate_cost(services.core_query, {"limit": 100}) == 1
+    assert services.estimate_cost(services.core_query, {"limit": 10}) == 1
+
+    documents, _ = services.identify_batch_mode(
+        [f"org-{i}" for i in range(50)], None, False, None, 100
+    )
+    query, variables, _ = documents[0]
+    assert services.estimate_cost(query, variables) == 50
+
+    # Without labels, each search is a single connection.
+    documents, _ = services.identify_batch_mode(
+        [f"org-{i}" for i in range(50)], None, False, None, 100, ("title", "url")
+    )
+    query, variables, _ = documents[0]
+    assert services.estimate_cost(query, variables) == 1
+
+
+def rate_limit_payload(remaining: int, reset_in: int, now: float) -> Dict:
+    reset_at = datetime.datetime.fromtimestamp(now + reset_in, datetime.timezone.utc)
+    return {
+        "data": {
+            "rateLimit": {
+                "limit": 5000,
+                "remaining": remaining,
+                "resetAt": reset_at.strftime("%Y-%m-%dT%H:%M:%SZ"),
+            }
+        }
+    }
+
+
+def test_scheduler_passes_with_budget():
+    clock = FakeClock()
+    scheduler = services.RateLimitScheduler(clock=clock.time, sleep=clock.sleep)
+
+    # Unknown budget before the first response.
+    assert scheduler.acquire(1) == 1
+    scheduler.release(1)
+
+    scheduler.update(rate_limit_payload(4000, 600, clock.now))
+    scheduler.acquire(10)
+
+    assert clock.sleeps == []
+    assert scheduler.reserved == 10
+
+
+def test_scheduler_paces_low_budget():
+    clock = FakeClock()
+    scheduler = services.RateLimitScheduler(clock=clock.time, sleep=clock.sleep)
+    scheduler.update(rate_limit_payload(100, 1000, clock.now))
+
+    scheduler.acquire(10)
+
+    assert clock.sleeps == [pytest.approx(100.0)]
+
+
+def test_scheduler_waits_for_reset():
+    clock = FakeClock()
+    scheduler = services.RateLimitScheduler(clock=clock.time, sleep=clock.sleep)
+    scheduler.update(rate_limit_payload(5, 60, clock.now))
+
+    scheduler.acquire(10)
+
+    assert clock.sleeps[0] >= 60
+    assert scheduler.remaining == 5000
+
+
+def test_scheduler_stops_when_reset_is_far():
+    clock = FakeClock()
+    scheduler = services.RateLimitScheduler(
+        max_wait=60, clock=clock.time, sleep=clock.sleep
+    )
+    scheduler.update(rate_limit_payload(5, 3600, clock.now))
+
+    with pytest.raises(services.RateLimitExhausted):
+        scheduler.acquire(10)
+    assert clock.sleeps == []
+
+
+@pytest.fixture
+def graphql_stub():
+    """Local GraphQL endpoint recording the client port of every request."""
+    ports: List[int] = []
+
+    class Handler(http.server.BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers["Content-Length"]))
+            ports.append(self.client_address[1])
+            body = json.dumps({"data": {"rateLimit": {"remaining": 42}}}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/graphql", ports
+    server.shutdown()
+    server.server_close()
+
+
+def test_transport_reuses_connections(graphql_stub):
+    url, ports = graphql_stub
+    transport = services.Transport(url=url)
+
+    payloads = [transport.post({}, "query", {})[1] for _ in range(3)]
+
+    assert payloads == [{"data": {"rateLimit": {"remaining": 42}}}] * 3
+    assert len(ports) == 3
+    assert len(set(ports)) == 1
+
+
+def make_repository_page(issue_counts: List[int], has_next: bool) -> Dict:
+    edges = [
+        {
+            "node": {
+                "url": f"https://github.com/o/r{repo}",
+                "issues": {
+                    "edges": [
+                        {"node": {"title": f"{repo}-{number}", "url": "u"}}
+                        for number in range(count)
+                    ]
+                },
+            }
+        }
+        for repo, count in enumerate(issue_counts)
+    ]
+    return {
+        "data": {
+            "rateLimit": {"remaining": 4000},
+            "search": {
+                "pageInfo": {"hasNextPage": has_next, "endCursor": "next"},
+                "edges": edges,
+            },
+        }
+    }
+
+
+def test_paginate_repositories_sizes_pages_to_limit(monkeypatch):
+    calls: List[Dict] = []
+
+    def caller(token, query, variables, shrinkable=False):
+        calls.append(dict(variables))
+        return make_repository_page([2] * variables["limit"], True)
+
+    monkeypatch.setattr(services, "caller", caller)
+
+    pages = list(services.paginate_repositories("token", "query", {}, 3, 2))
+
+    assert [len(issues) for issues, _ in pages] == [3]
+    assert calls == [{"issueLimit": 2, "limit": 2}]
+
+
+def test_paginate_repositories_grows_pages_for_sparse_repos(monkeypatch):
+    calls: List[Dict] = []
+    counts = iter([[0, 0], [1] + [0] * 29])
+
+    def caller(token, query, variables, shrinkable=False):
+        calls.append(dict(variables))
+        return make_repository_page(next(counts), True)
+
+    monkeypatch.setattr(services, "caller", caller)
+
+    pages = services.paginate_repositories("token", "query", {}, 2, 1)
+    issues = [issue for page_issues, _ in islice(pages, 2) for issue in page_issues]
+
+    assert [issue.title for issue in issues] == ["0-0"]
+    assert [call["limit"] for call in calls] == [2, 20]
+    assert calls[1]["after"] == "next"
+
+
+class ScriptedTransport:
+    """Answer requests with `(status, headers, payload)` in order."""
+
+    requires_token = True
+
+    def __init__(self, answers: List):
+        self.answers = list(answers)
+        self.calls = 0
+        self.tokens: List[str] = []
+
+    def post(self, headers, query, variables):
+        self.calls += 1
+        self.tokens.append(headers["Authorization"])
+        answer = self.answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+
+        status, response_headers, payload = answer
+        response = Response()
+        response.status_code = status
+        response.headers.update(response_headers)
+        response._content = json.dumps(payload).encode()
+        return response, payload
+
+
+@pytest.fixture
+def scripted(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(
+        services,
+        "scheduler",
+        services.RateLimitScheduler(clock=clock.time, sleep=clock.sleep),
+    )
+    monkeypatch.setattr(services.random, "uniform", lambda low, high: high)
+
+    def script(*answers) -> ScriptedTransport:
+        transport = ScriptedTransport(answers)
+        monkeypatch.setattr(services, "transport", transport)
+        return transport
+
+    return script, clock
+
+
+ok: Dict = {"data": {"search": {"nodes": []}}}
+
+
+def test_execute_honors_retry_after(scripted):
+    script, clock = scripted
+    transport = script(
+        (
+            403,
+            {"Retry-After": "7"},
+            {"message": "You have exceeded a secondary rate limit"},
+        ),
+        (200, {}, ok),
+    )
+
+    assert services.execute("token", "query", {}) == ok
+    assert transport.calls == 2
+    assert clock.sleeps == [7.0]
+
+
+def test_execute_backs_off_on_server_errors(scripted):
+    script, clock = scripted
+    script(
+        requests.exceptions.ConnectionError(),
+        (502, {}, {}),
+        (200, {}, ok),
+    )
+
+    assert services.execute("token", "query", {}) == ok
+    assert clock.sleeps == [1.0, 2.0]
+
+
+def test_execute_waits_for_primary_rate_limit_reset(scripted):
+    script, clock = scripted
+    reset = str(int(clock.now) + 30)
+    script(
+        (
+            200,
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+            {
+                "errors": [
+                    {"type": "RATE_LIMITED", "message": "API rate limit exceeded"}
+                ]
+            },
+        ),
+        (200, {}, ok),
+    )
+
+    assert services.execute("token", "query", {}) == ok
+    assert clock.sleeps == [30.0]
+
+
+def test_execute_backs_off_without_rate_limit_reset(scripted):
+    script, clock = scripted
+    transport = script(
+        (403, {"X-RateLimit-Remaining": "0"}, {"message": "API rate limit exceeded"}),
+        (200, {}, ok),
+    )
+
+    assert services.execute("token", "query", {}) == ok
+    assert transport.calls == 2
+    assert clock.sleeps == [services.SECONDARY_RATE_LIMIT_WAIT]
+
+
+def test_execute_gives_up(scripted):
+    script, clock = scripted
+    transport = script(*[(503, {}, {"message": "Unavailable"})] * services.MAX_ATTEMPTS)
+
+    with pytest.raises(requests.exceptions.HTTPError):
+        services.execute("token", "query", {})
+    assert transport.calls == services.MAX_ATTEMPTS
+
+    script((200, {}, {"errors": [{"message": "Bad field"}]}))
+    with pytest.raises(services.GraphQLError, match="Bad field"):
+        services.execute("token", "query", {})
+
+    script((429, {"Retry-After": "3600"}, {}))
+    with pytest.raises(services.RateLimitExhausted):
+        services.execute("token", "query", {})
+
+
+@pytest.mark.parametrize(
+    "answer",
+    [
+        requests.exceptions.ReadTimeout(),
+        (504, {}, {}),
+        (200, {}, {"errors": [{"type": "RESOURCE_LIMITS_EXCEEDED", "message": "..."}]}),
+    ],
+)
+def test_execute_shrinkable_page_too_large(scripted, answer):
+    script, clock = scripted
+    transport = script(answer)
+
+    with pytest.raises(services.QueryTooLarge):
+        services.execute("token", "query", {}, shrinkable=True)
+    assert transport.calls == 1
+    assert clock.sleeps == []
+
+
+def test_paginate_halves_pages_too_large(fake_caller, monkeypatch):
+    sizes: List[int] = []
+    serve = services.caller
+
+    def caller(token, query, variables, shrinkable=False):
+        sizes.append(variables["limit"])
+        if variables["limit"] > 25:
+            assert shrinkable
+            raise services.QueryTooLarge()
+        return serve(token, query, variables)
+
+    monkeypatch.setattr(services, "caller", caller)
+
+    pages = list(services.paginate("token", "query", {}, 60))
+
+    # The fake serves three pages, later ones stay at the smaller size.
+    assert sizes == [60, 30, 15, 15, 15]
+    assert [call.get("after") for call in fake_caller] == [None, "c1", "c2"]
+    assert len(pages) == 3
+
+
+def test_fetch_batch_splits_documents_too_large(monkeypatch):
+    calls: List = []
+
+    def caller(token, query, variables, shrinkable=False):
+        aliases = sorted(key for key in variables if key.startswith("t"))
+        calls.append((aliases, variables["limit"]))
+        if len(aliases) * variables["limit"] > 5:
+            assert shrinkable
+            raise services.QueryTooLarge()
+
+        data: Dict = {"rateLimit": {"remaining": 4997}}
+        for alias in aliases:
+            assert f"{alias}: search(query: ${alias}" in query
+            titles = [f"{alias}-{n}" for n in range(variables["limit"])]
+            data[alias] = make_page(titles, False, "x")["data"]["search"]
+        return {"data": data}
+
+    monkeypatch.setattr(services, "caller", caller)
+
+    documents = services.batch_documents(["org:a", "org:b"], 10)
+    results, rate_limit = services.fetch_batch("token", documents[0], "org", 10)
+
+    # Aliases are split in halves first, then a lone search asks for less.
+    assert calls == [
+        (["t0", "t1"], 10),
+        (["t0"], 10),
+        (["t0"], 5),
+        (["t1"], 10),
+        (["t1"], 5),
+    ]
+    assert [len(issues) for issues in results] == [5, 5]
+    assert results[1][0].title == "t1-0"
+    assert rate_limit == 4997
+
+
+def test_caller_exits_on_persistent_failure(scripted, monkeypatch):
+    monkeypatch.setattr(services, "response_cache", None)
+    monkeypatch.setattr(services, "fail_spinner", lambda: None)
+    script, _ = scripted
+    script(*[requests.exceptions.ConnectionError()] * services.MAX_ATTEMPTS)
+
+    with pytest.raises(SystemExit):
+        services.caller("token", "query", {})
+
+
+def test_token_pool_prefers_headroom_and_waits_for_first_reset():
+    clock = FakeClock()
+    pool = services.TokenPool(["a", "b", "c"], clock=clock.time, sleep=clock.sleep)
+    pool.schedulers["a"].update(rate_limit_payload(100, 600, clock.now))
+    pool.schedulers["b"].update(rate_limit_payload(3000, 600, clock.now))
+
+    # Tokens without a response yet are tried first.
+    assert pool.choose(1)[0] == "c"
+
+    pool.schedulers["c"].update(rate_limit_payload(0, 900, clock.now))
+    assert pool.choose(1)[0] == "b"
+
+    pool.schedulers["b"].exhaust(clock.now + 300)
+    pool.schedulers["a"].exhaust(clock.now + 600)
+    token, budget = pool.choose(1)
+    assert token == "b"
+
+    budget.acquire(1)
+    assert clock.sleeps == [301]
+
+
+def test_execute_moves_to_next_token_when_one_is_spent(scripted, monkeypatch):
+    script, clock = scripted
+    pool = services.TokenPool(["a", "b"], clock=clock.time, sleep=clock.sleep)
+    pool.schedulers["b"].update(rate_limit_payload(4000, 600, clock.now))
+    monkeypatch.setattr(services, "token_pool", pool)
+    reset = str(int(clock.now) + 1800)
+    transport = script(
+        (
+            403,
+            {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset},
+            {"message": "API rate limit exceeded"},
+        ),
+        (200, {}, ok),
+    )
+
+    assert services.execute("a", "query", {}) == ok
+    assert transport.tokens == ["token a", "token b"]
+    assert pool.schedulers["a"].remaining == 0
+    assert clock.sleeps == [0.0]
@@ -0,0 +1,53 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# Libraries only commands calling the GitHub API should load.
+HEAVY_MODULES = ["halo", "requests", "rich", "tabulate", "urllib3"]
+
+
+def loaded_modules(*args: str, modules: list = HEAVY_MODULES) -> list:
+    """Run `gfi` in a fresh interpreter, return which of `modules` it loaded."""
+    script = (
+        "import json, sys\n"
+        "from good_first_issues.main import cli\n"
+        "try:\n"
+        f"    cli({list(args)!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        f"print(json.dumps([m for m in {modules!r} if m in sys.modules]))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True, check=True
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("version",),
+        ("config", "--help"),
+        ("cache", "--help"),
+        ("cache", "stats"),
+        ("rate-limit", "--help"),
+    ],
+)
+def test_light_commands_skip_heavy_imports(args):
+    assert loaded_modules(*args) == []
+
+
+def test_search_loads_its_dependencies():
+    assert loaded_modules("search", "--help") == [
+        "halo",
+        "requests",
+        "rich",
+        "tabulate",
+        "urllib3",
+    ]
+
+
+def test_serve_help_skips_http_server():
+    assert loaded_modules("serve", "--help", modules=["http.server"]) == []
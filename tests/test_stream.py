@@ -0,0 +1,156 @@
+import csv
+import io
+import json
+
+import pytest
+from helpers import make_issue
+
+from good_first_issues.graphql.models import Issue
+from good_first_issues.utils.stream import (
+    stream_table,
+    title_width,
+    truncate,
+    write_csv,
+    write_json,
+    write_jsonl,
+)
+
+
+def test_stream_table_prints_rows_as_they_arrive():
+    output = io.StringIO()
+    seen = []
+
+    def issues():
+        for number in range(3):
+            # Every earlier issue is on screen before the next is produced.
+            seen.append(output.getvalue().count("https://"))
+            yield make_issue(number)
+
+    assert stream_table(issues(), file=output, columns=120) == 3
+    assert seen == [0, 1, 2]
+
+
+def test_stream_table_fixes_column_widths():
+    output = io.StringIO()
+    issues = [make_issue(1, "short"), make_issue(2, "x" * 200)]
+
+    stream_table(issues, file=output, columns=120)
+
+    rows = output.getvalue().splitlines()
+    url_columns = {row.index("https://") for row in rows[2:]}
+    assert len(url_columns) == 1
+    assert "x" * 59 + "…" in rows[3]
+
+
+def test_stream_table_prints_nothing_without_issues():
+    output = io.StringIO()
+
+    assert stream_table(iter(()), file=output) == 0
+    assert output.getvalue() == ""
+
+
+def test_title_width_shrinks_on_narrow_terminals():
+    assert title_width(200) == 60
+    assert title_width(100) == 41
+    assert title_width(40) == 20
+
+
+def test_truncate():
+    assert truncate("abc", 3) == "abc"
+    assert truncate("abcd", 3) == "ab…"
+
+
+full_issue = Issue(
+    title="Fix docs",
+    url="https://github.com/octo/repo/issues/7",
+    number=7,
+    repo="repo",
+    owner="octo",
+    labels=("good first issue", "docs"),
+    created_at="2024-01-01T00:00:00Z",
+    author="hubot",
+    state="OPEN",
+)
+
+
+def test_write_jsonl_includes_every_field():
+    output = io.StringIO()
+
+    assert write_jsonl([full_issue, make_issue(8)], file=output) == 2
+
+    lines = output.getvalue().splitlines()
+    assert len(lines) == 2
+    assert json.loads(lines[0]) == {
+        "title": "Fix docs",
+        "url": "https://github.com/octo/repo/issues/7",
+        "number": 7,
+        "repo": "repo",
+        "owner": "octo",
+        "labels": ["good first issue", "docs"],
+        "created_at": "2024-01-01T00:00:00Z",
+        "author": "hubot",
+        "state": "OPEN",
+    }
+
+
+def test_write_json_is_a_valid_array():
+    for issues in ([], [full_issue], [full_issue, make_issue(8)]):
+        output = io.StringIO()
+
+        write_json(issues, file=output)
+
+        assert [item["url"] for item in json.loads(output.getvalue())] == [
+            issue.url for issue in issues
+        ]
+
+
+def test_write_csv_writes_header_and_rows():
+    output = io.StringIO()
+
+    write_csv([full_issue], file=output)
+
+    rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+    assert rows[0]["labels"] == "good first issue, docs"
+    assert rows[0]["number"] == "7"
+    assert list(rows[0]) == list(Issue._fields)
+
+
+def test_writers_keep_only_fields():
+    output = io.StringIO()
+    write_jsonl([full_issue], file=output, fields=("url", "labels"))
+    assert json.loads(output.getvalue()) == {
+        "url": "https://github.com/octo/repo/issues/7",
+        "labels": ["good first issue", "docs"],
+    }
+
+    output = io.StringIO()
+    write_csv([full_issue], file=output, fields=("labels", "number"))
+    assert output.getvalue().splitlines() == [
+        "labels,number",
+        '"good first issue, docs",7',
+    ]
+
+
+class FlushedOutput(io.StringIO):
+    """Output remembering what had been flushed, like a pipe would see."""
+
+    flushed: str = ""
+
+    def flush(self):
+        super().flush()
+        self.flushed = self.getvalue()
+
+
+@pytest.mark.parametrize("writer", [write_jsonl, write_json, write_csv])
+def test_writers_flush_each_record_while_issues_keep_coming(writer):
+    output = FlushedOutput()
+    seen = []
+
+    def issues():
+        for number in range(3):
+            # A long-running source, like `gfi watch`, between two issues.
+            seen.append(output.flushed.count("https://"))
+            yield make_issue(number)
+
+    assert writer(issues(), file=output) == 3
+    assert seen == [0, 1, 2]
@@ -0,0 +1,86 @@
+from typing import Dict, List
+
+import pytest
+
+from good_first_issues.graphql import services, sync
+from good_first_issues.graphql.models import Issue
+
+
+def node(number: int, created_at: str) -> Dict:
+    return {
+        "title": f"Issue {number}",
+        "url": f"https://github.com/o/r/issues/{number}",
+        "createdAt": created_at,
+    }
+
+
+@pytest.fixture
+def fake_search(monkeypatch, tmp_path):
+    """Answer searches from a dict of search string -> nodes."""
+    monkeypatch.setattr(sync, "sync_dir", str(tmp_path))
+    results: Dict[str, List[Dict]] = {}
+    searches: List[str] = []
+
+    def paginate(token, query, variables, limit):
+        search = variables["searchQuery"]
+        searches.append(search)
+        nodes = next(
+            (nodes for prefix, nodes in results.items() if search.startswith(prefix)),
+            [],
+        )
+        yield {
+            "data": {
+                "rateLimit": {"remaining": 4000},
+                "search": {"nodes": nodes},
+            }
+        }
+
+    monkeypatch.setattr(services, "paginate", paginate)
+    return results, searches
+
+
+def test_first_run_fetches_everything(fake_search):
+    results, searches = fake_search
+    results[f"org:o {services.BASE_SEARCH}"] = [
+        node(1, "2024-01-01T00:00:00Z"),
+        node(2, "2024-02-01T00:00:00Z"),
+    ]
+
+    issues, rate_limit = sync.sync_target("token", "org:o")
+
+    assert [issue.title for issue in issues] == ["Issue 2", "Issue 1"]
+    assert rate_limit == 4000
+    assert searches == [f"org:o {services.BASE_SEARCH}"]
+    watermark, stored = sync.load_state("org:o")
+    assert watermark
+    assert stored == issues
+
+
+def test_next_run_merges_delta(fake_search):
+    results, searches = fake_search
+    sync.save_state(
+        "org:o",
+        "2024-03-01T00:00:00Z",
+        [
+            Issue.from_node(node(1, "2024-01-01T00:00:00Z")),
+            Issue.from_node(node(2, "2024-02-01T00:00:00Z")),
+        ],
+    )
+
+    # Issue 3 is new, issue 2 was updated and still matches, issue 1 was closed.
+    updated = "updated:>=2024-03-01T00:00:00Z"
+    results[f"org:o {services.BASE_SEARCH} {updated}"] = [
+        node(3, "2024-03-02T00:00:00Z"),
+        {**node(2, "2024-02-01T00:00:00Z"), "title": "Renamed"},
+    ]
+    results[f"org:o is:issue {updated}"] = [
+        node(1, "2024-01-01T00:00:00Z"),
+        node(2, "2024-02-01T00:00:00Z"),
+        node(3, "2024-03-02T00:00:00Z"),
+    ]
+
+    issues, _ = sync.sync_target("token", "org:o")
+
+    assert [issue.title for issue in issues] == ["Issue 3", "Renamed"]
+    assert all(updated in search for search in searches)
+    assert sync.load_state("org:o")[1] == issues
@@ -0,0 +1,64 @@
+import json
+
+import pytest
+
+from good_first_issues import trace
+
+
+@pytest.fixture
+def tracer(monkeypatch):
+    monkeypatch.setattr(trace, "tracer", None)
+    return trace.enable()
+
+
+def test_nested_phases_are_charged_their_own_time(tracer, monkeypatch):
+    now = [0.0]
+    monkeypatch.setattr(trace.time, "perf_counter", lambda: now[0])
+
+    with trace.phase("render"):
+        now[0] += 1
+        with trace.phase("network"):
+            now[0] += 2
+        now[0] += 3
+
+    assert tracer.phases["network"]["seconds"] == 2
+    assert tracer.phases["render"]["seconds"] == 4
+
+
+def test_phases_are_counted(tracer):
+    for _ in range(3):
+        with trace.phase("extraction"):
+            pass
+
+    assert tracer.phases["extraction"]["count"] == 3
+    assert tracer.phases["startup"]["count"] == 1
+
+
+def test_hooks_do_nothing_when_disabled(monkeypatch):
+    monkeypatch.setattr(trace, "tracer", None)
+
+    with trace.phase("network"):
+        pass
+    trace.request({}, 10)
+
+    assert trace.tracer is None
+
+
+def test_summary_adds_up_requests(tracer, tmp_path):
+    def payload(cost, remaining):
+        return {"data": {"rateLimit": {"cost": cost, "remaining": remaining}}}
+
+    trace.request(payload(1, 4999), 1000)
+    trace.request(payload(2, 4997), 3000)
+    trace.request(payload(1, 4000), 0, cached=True)
+
+    summary = tracer.summary()
+    assert summary["pages"] == 2
+    assert summary["cached_pages"] == 1
+    assert summary["bytes"] == 4000
+    assert summary["cost"] == 3
+    assert summary["remaining"] == 4997
+
+    path = tmp_path / "trace.json"
+    tracer.write_json(str(path))
+    assert json.loads(path.read_text())["cost"] == 3
@@ -2,6 +2,7 @@ import datetime
 
 import pytest
 
+from good_first_issues import utils
 from good_first_issues.utils import parse_period
 
 
@@ -92,3 +93,43 @@ def test_parse_period_error_message(capsys):
         parse_period("10")
     captured = capsys.readouterr()
     assert "Invalid duration" in captured.err
+
+
+@pytest.mark.parametrize(
+    "duration, expected",
+    [
+        ("30m", "2023-10-01T12:04:00Z"),
+        ("2h", "2023-10-01T10:00:00Z"),
+        ("3d", "2023-09-28T00:00:00Z"),
+    ],
+)
+def test_period_since_rounds_to_the_unit(monkeypatch, duration, expected):
+    class MockDateTime(datetime.datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime.datetime(
+                2023, 10, 1, 12, 34, 56, 789, tzinfo=datetime.timezone.utc
+            )
+
+    monkeypatch.setattr(datetime, "datetime", MockDateTime)
+
+    assert utils.period_since(duration) == expected
+
+
+def test_check_credentials(monkeypatch, tmp_path):
+    credential_file = tmp_path / "good-first-issues"
+    monkeypatch.setattr(utils, "credential_file", str(credential_file))
+    monkeypatch.delenv("GFITOKENS", raising=False)
+    monkeypatch.delenv("GFITOKEN", raising=False)
+
+    assert utils.check_credentials() == []
+
+    credential_file.write_text("first\nsecond\n\n")
+    assert utils.check_credentials() == ["first", "second"]
+    assert utils.check_credential() == "first"
+
+    monkeypatch.setenv("GFITOKEN", "env")
+    assert utils.check_credentials() == ["env"]
+
+    monkeypatch.setenv("GFITOKENS", "one, two three")
+    assert utils.check_credentials() == ["one", "two", "three"]
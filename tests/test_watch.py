@@ -0,0 +1,81 @@
+from typing import Dict, List
+
+import pytest
+from helpers import FakeClock, make_issue
+
+from good_first_issues.graphql import services, sync
+from good_first_issues.graphql.models import Issue
+from good_first_issues.graphql.watch import Watcher
+
+
+@pytest.fixture
+def synced(monkeypatch):
+    """Answer syncs from a dict of target -> issues, newest first."""
+    results: Dict[str, List[Issue]] = {}
+    calls: List[str] = []
+
+    def sync_target(token, target):
+        calls.append(target)
+        return list(results.get(target, [])), 4000
+
+    monkeypatch.setattr(sync, "sync_target", sync_target)
+    monkeypatch.setattr(services, "scheduler", services.RateLimitScheduler())
+    return results, calls
+
+
+def test_first_poll_is_limited_and_later_polls_only_report_new(synced):
+    results, _ = synced
+    results["org:a"] = [make_issue(number, owner="a") for number in (3, 2, 1)]
+    watcher = Watcher("token", ["org:a"], interval=60, first_limit=2)
+
+    assert [issue.title for issue in watcher.poll("org:a")] == ["Issue 3", "Issue 2"]
+    assert watcher.poll("org:a") == []
+
+    results["org:a"].insert(0, make_issue(4, owner="a"))
+    assert [issue.title for issue in watcher.poll("org:a")] == ["Issue 4"]
+
+
+def test_run_polls_targets_on_their_schedule(synced):
+    results, calls = synced
+    results["org:a"] = [make_issue(1, owner="a")]
+    results["org:b"] = [make_issue(1, owner="b")]
+    clock = FakeClock()
+    watcher = Watcher(
+        "token",
+        ["org:a", "org:b"],
+        interval=60,
+        clock=clock.time,
+        sleep=clock.sleep,
+        rng=lambda: 0.5,
+    )
+
+    issues = list(watcher.run(polls=4))
+
+    assert calls == ["org:a", "org:b", "org:a", "org:b"]
+    assert [issue.url for issue in issues] == [
+        "https://github.com/a/r/issues/1",
+        "https://github.com/b/r/issues/1",
+    ]
+    assert clock.sleeps == [60]
+
+
+def test_delay_is_jittered(synced):
+    watcher = Watcher("token", [], interval=100, jitter=0.1, rng=lambda: 0.0)
+    assert watcher.delay() == pytest.approx(90)
+
+    watcher.rng = lambda: 1.0
+    assert watcher.delay() == pytest.approx(110)
+
+
+def test_delay_waits_for_reset_when_budget_is_low(synced):
+    clock = FakeClock()
+    scheduler = services.scheduler
+    scheduler.limit, scheduler.remaining = 5000, 100
+    scheduler.reset_at = clock.now + 1800
+
+    watcher = Watcher("token", [], interval=300, clock=clock.time, rng=lambda: 0.5)
+
+    assert watcher.delay() == 1800
+
+    scheduler.remaining = 4000
+    assert watcher.delay() == 300
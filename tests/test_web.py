@@ -0,0 +1,84 @@
+import json
+import re
+
+from helpers import make_issue
+
+from good_first_issues.graphql.models import Issue
+from good_first_issues.utils.web import (
+    add_anchor_tag,
+    render_page,
+    render_report,
+    render_table,
+)
+
+
+def make_issues(count):
+    return [
+        make_issue(
+            number,
+            labels=("good first issue",),
+            created_at=f"2024-01-{number % 28 + 1:02d}T00:00:00Z",
+            owner="octo",
+            repo="repo",
+        )
+        for number in range(count)
+    ]
+
+
+def test_render_table_links_every_url_once():
+    table = render_table(make_issues(3))
+
+    for number in range(3):
+        url = f"https://github.com/octo/repo/issues/{number}"
+        assert table.count(f"href='{url}'") == 1
+    assert table.count("<tr>") == 4
+
+
+def test_render_table_escapes_titles():
+    issue = Issue(
+        title="<script>alert(1)</script>", url="https://github.com/o/r/issues/1"
+    )
+
+    table = render_table([issue])
+
+    assert "<script>" not in table
+    assert "&lt;script&gt;" in table
+
+
+def test_render_page_wraps_table():
+    page = render_page(make_issues(1))
+
+    assert page.count("<table>") == 1
+    assert "background-color: #afd0a9;" in page
+
+
+def test_add_anchor_tag_wraps_each_cell():
+    html_data = (
+        "<tr><td>a</td><td>https://github.com/o/r/issues/1</td></tr>\n"
+        "<tr><td>b</td><td>https://github.com/o/r/issues/2</td></tr>"
+    )
+
+    linked = add_anchor_tag(html_data)
+
+    assert linked.count("<a target='_blank'") == 2
+    assert "href='https://github.com/o/r/issues/2'" in linked
+
+
+def test_render_report_embeds_issues_as_json():
+    issues = make_issues(1500)
+
+    report = render_report(issues)
+
+    embedded = re.search(r"const issues = (.*);\n", report).group(1)
+    assert json.loads(embedded)[1499]["url"] == issues[1499].url
+    assert "Filter 1500 issues" in report
+
+
+def test_render_report_keeps_script_closed():
+    issue = Issue(title="</script><b>", url="https://github.com/o/r/issues/1")
+
+    report = render_report([issue])
+
+    assert report.count("</script>") == 1
+    embedded = re.search(r"const issues = (.*);\n", report).group(1)
+    assert json.loads(embedded)[0]["title"] == "</script><b>"